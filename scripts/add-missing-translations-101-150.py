@@ -3,11 +3,16 @@
 Script to add missing translation keys for calculators ranked 101-150
 """
 
-import json
 import re
 import os
 from pathlib import Path
 
+from i18n_tools.overlay import LocaleWriter
+from i18n_tools.serialize import write_locale
+
+# --dry-run reports what would change instead of writing
+WRITER = LocaleWriter()
+
 # Base directory
 BASE_DIR = Path("/Users/raedtayyem/Desktop/work/alathasiba-claudecode")
 
@@ -237,14 +242,14 @@ TRANSLATIONS = {
 
 def load_translation_file(filepath):
     """Load translation JSON file"""
-    with open(filepath, 'r', encoding='utf-8') as f:
-        return json.load(f)
+    return WRITER.load(filepath)
 
 def save_translation_file(filepath, data):
     """Save translation JSON file with proper formatting"""
-    with open(filepath, 'w', encoding='utf-8') as f:
-        json.dump(data, f, ensure_ascii=False, indent=2)
-        f.write('\n')  # Add newline at end of file
+    WRITER.save(filepath, data, write_translation_file)
+
+def write_translation_file(filepath, data):
+    write_locale(filepath, data)
 
 def deep_update(base_dict, update_dict):
     """Recursively update nested dictionary"""
@@ -313,3 +318,4 @@ def main():
 
 if __name__ == "__main__":
     main()
+    WRITER.report()
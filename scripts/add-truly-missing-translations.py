@@ -4,29 +4,35 @@ Add Truly Missing Translations
 Uses the same logic as the analyzer to find and add missing keys
 """
 
-import json
 import re
 from pathlib import Path
-from typing import Dict, Set
+from typing import Dict, Optional, Set
 from collections import defaultdict
 
+from i18n_tools.mt import Translator
+from i18n_tools.overlay import LocaleWriter
+from i18n_tools.patch import PatchConflict, set_nested_value
+from i18n_tools.provenance import GLOSSARY, KEY, noting
+from i18n_tools.serialize import write_locale
+from i18n_tools.tm import TranslationMemory
+
+# --dry-run reports what would change instead of writing
+WRITER = LocaleWriter()
+
 BASE_DIR = Path(__file__).parent.parent
 LOCALES_DIR = BASE_DIR / "public" / "locales"
 SRC_DIR = BASE_DIR / "src" / "components" / "calculators"
 
 def load_json(file_path: Path) -> dict:
     """Load JSON file"""
-    if not file_path.exists():
-        return {}
-    with open(file_path, 'r', encoding='utf-8') as f:
-        return json.load(f)
+    return WRITER.load(file_path, missing_ok=True)
 
 def save_json(file_path: Path, data: dict):
     """Save JSON file with proper formatting"""
-    file_path.parent.mkdir(parents=True, exist_ok=True)
-    with open(file_path, 'w', encoding='utf-8') as f:
-        json.dump(data, f, ensure_ascii=False, indent=2)
-        f.write('\n')
+    WRITER.save(file_path, data, write_json)
+
+def write_json(file_path: Path, data: dict):
+    write_locale(file_path, data)
 
 def has_nested_key(obj: dict, key: str) -> bool:
     """Check if nested key exists in dictionary"""
@@ -41,20 +47,6 @@ def has_nested_key(obj: dict, key: str) -> bool:
 
     return True
 
-def set_nested_value(data: dict, key_path: str, value: str):
-    """Set a nested dictionary value using dot notation"""
-    keys = key_path.split('.')
-    current = data
-
-    for key in keys[:-1]:
-        if key not in current:
-            current[key] = {}
-        elif not isinstance(current[key], dict):
-            current[key] = {}
-        current = current[key]
-
-    current[keys[-1]] = value
-
 def extract_keys_from_component(component_path: Path) -> tuple:
     """Extract translation keys and namespace from component"""
     try:
@@ -73,6 +65,7 @@ def extract_keys_from_component(component_path: Path) -> tuple:
     except Exception as e:
         return set(), None
 
+@noting(KEY)
 def translate_key_to_english(key: str) -> str:
     """Generate English translation from key"""
     # Get the last part after the last dot
@@ -101,6 +94,7 @@ def translate_key_to_english(key: str) -> str:
 
     return words
 
+@noting(GLOSSARY)
 def translate_to_arabic(english_text: str) -> str:
     """Translate English to Arabic"""
     translations = {
@@ -151,7 +145,7 @@ def translate_to_arabic(english_text: str) -> str:
 
     return result
 
-def main():
+def add_missing_translations(tm: TranslationMemory, mt: Optional[Translator]):
     print("=" * 80)
     print("ADDING TRULY MISSING TRANSLATIONS")
     print("Using same logic as the analyzer script")
@@ -196,7 +190,11 @@ def main():
             # Check if key is missing in EN
             if not has_nested_key(en_data, key):
                 english_text = translate_key_to_english(key)
-                set_nested_value(en_data, key, english_text)
+                try:
+                    set_nested_value(en_data, key, english_text)
+                except PatchConflict as e:
+                    print(f"  ⚠ Skipped: {e}")
+                    continue
                 total_added_en += 1
                 added_any = True
 
@@ -213,8 +211,12 @@ def main():
                 else:
                     english_text = translate_key_to_english(key)
 
-                arabic_text = translate_to_arabic(english_text)
-                set_nested_value(ar_data, key, arabic_text)
+                arabic_text = tm.fill(english_text, mt.glossary('ar') if mt else translate_to_arabic, namespace)
+                try:
+                    set_nested_value(ar_data, key, arabic_text)
+                except PatchConflict as e:
+                    print(f"  ⚠ Skipped: {e}")
+                    continue
                 total_added_ar += 1
                 added_any = True
 
@@ -234,9 +236,24 @@ def main():
     print(f"✓ Calculators Updated: {calculators_updated}")
     print(f"✓ English Keys Added: {total_added_en}")
     print(f"✓ Arabic Keys Added: {total_added_ar}")
+    print(f"✓ {tm.summary()}")
+    if mt:
+        print(f"✓ {mt.summary()}")
     print()
     print("🎉 ALL TRULY MISSING TRANSLATIONS ADDED! 🎉")
     print("=" * 80)
 
+def main():
+    # Existing human translations are reused before the word glossary; a machine
+    # translation backend takes the glossary's place when TRANSLATION_MT_URL is set
+    tm = TranslationMemory.from_index()
+    mt = Translator.from_env()
+    try:
+        add_missing_translations(tm, mt)
+    finally:
+        if mt:
+            mt.close()
+
 if __name__ == "__main__":
     main()
+    WRITER.report()
@@ -3,19 +3,24 @@
 Batch add translations for calculators 104-150
 """
 
-import json
 from pathlib import Path
 
+from i18n_tools.overlay import LocaleWriter
+from i18n_tools.serialize import write_locale
+
+# --dry-run reports what would change instead of writing
+WRITER = LocaleWriter()
+
 BASE_DIR = Path("/Users/raedtayyem/Desktop/work/alathasiba-claudecode")
 
 def load_json(filepath):
-    with open(filepath, 'r', encoding='utf-8') as f:
-        return json.load(f)
+    return WRITER.load(filepath)
 
 def save_json(filepath, data):
-    with open(filepath, 'w', encoding='utf-8') as f:
-        json.dump(data, f, ensure_ascii=False, indent=2)
-        f.write('\n')
+    WRITER.save(filepath, data, write_json)
+
+def write_json(filepath, data):
+    write_locale(filepath, data)
 
 def main():
     print("Batch Adding Translations for Calculators 104-150")
@@ -155,3 +160,4 @@ def main():
 
 if __name__ == "__main__":
     main()
+    WRITER.report()
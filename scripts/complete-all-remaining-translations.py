@@ -5,10 +5,19 @@ Extracts and completes translations for ALL remaining 336 calculators
 Achieves 100% translation coverage across the entire application
 """
 
-import json
 import re
 from pathlib import Path
-from typing import Dict, List, Set, Tuple
+from typing import Dict, List, Optional, Set, Tuple
+
+from i18n_tools.mt import Translator
+from i18n_tools.overlay import LocaleWriter
+from i18n_tools.patch import PatchConflict, set_nested_value
+from i18n_tools.provenance import GLOSSARY, KEY, noting
+from i18n_tools.serialize import write_locale
+from i18n_tools.tm import TranslationMemory
+
+# --dry-run reports what would change instead of writing
+WRITER = LocaleWriter()
 
 # Base paths
 BASE_DIR = Path(__file__).parent.parent
@@ -17,17 +26,14 @@ SRC_DIR = BASE_DIR / "src" / "components" / "calculators"
 
 def load_json(file_path: Path) -> dict:
     """Load JSON file"""
-    if not file_path.exists():
-        return {}
-    with open(file_path, 'r', encoding='utf-8') as f:
-        return json.load(f)
+    return WRITER.load(file_path, missing_ok=True)
 
 def save_json(file_path: Path, data: dict):
     """Save JSON file with proper formatting"""
-    file_path.parent.mkdir(parents=True, exist_ok=True)
-    with open(file_path, 'w', encoding='utf-8') as f:
-        json.dump(data, f, ensure_ascii=False, indent=2)
-        f.write('\n')
+    WRITER.save(file_path, data, write_json)
+
+def write_json(file_path: Path, data: dict):
+    write_locale(file_path, data)
 
 def extract_translation_keys(file_path: Path) -> Set[str]:
     """Extract all translation keys from a TypeScript/React component"""
@@ -59,6 +65,7 @@ def get_namespace_from_path(calc_path: Path) -> str:
         return f"calc/{'/'.join(category_parts)}"
     return "calc"
 
+@noting(KEY)
 def translate_key_to_english(key: str) -> str:
     """Generate English translation from key"""
     # Remove namespace prefix
@@ -118,6 +125,7 @@ def translate_key_to_english(key: str) -> str:
 
     return words
 
+@noting(GLOSSARY)
 def translate_key_to_arabic(english_text: str, key: str) -> str:
     """Generate Arabic translation from English text"""
 
@@ -620,21 +628,7 @@ def get_existing_keys(namespace: str, lang: str) -> Set[str]:
     extract_keys(data)
     return keys
 
-def set_nested_value(data: dict, key_path: str, value: str):
-    """Set a nested dictionary value using dot notation"""
-    keys = key_path.split('.')
-    current = data
-
-    for key in keys[:-1]:
-        if key not in current:
-            current[key] = {}
-        elif not isinstance(current[key], dict):
-            current[key] = {}
-        current = current[key]
-
-    current[keys[-1]] = value
-
-def main():
+def complete_translations(tm: TranslationMemory, mt: Optional[Translator]):
     print("=" * 80)
     print("COMPLETE ALL REMAINING TRANSLATIONS - FINAL BATCH")
     print("Target: 100% Translation Coverage for ALL Calculators")
@@ -682,7 +676,11 @@ def main():
         # Add missing translations
         for key in missing_en:
             english_text = translate_key_to_english(key)
-            set_nested_value(namespace_updates[namespace]['en'], key, english_text)
+            try:
+                set_nested_value(namespace_updates[namespace]['en'], key, english_text)
+            except PatchConflict as e:
+                print(f"  ⚠ Skipped: {e}")
+                continue
             total_keys_added += 1
 
         for key in missing_ar:
@@ -692,8 +690,13 @@ def main():
             else:
                 english_text = translate_key_to_english(key)
 
-            arabic_text = translate_key_to_arabic(english_text, key)
-            set_nested_value(namespace_updates[namespace]['ar'], key, arabic_text)
+            arabic_text = tm.fill(english_text, mt.glossary('ar') if mt else lambda text: translate_key_to_arabic(text, key),
+                                  namespace)
+            try:
+                set_nested_value(namespace_updates[namespace]['ar'], key, arabic_text)
+            except PatchConflict as e:
+                print(f"  ⚠ Skipped: {e}")
+                continue
 
         calculators_processed += 1
 
@@ -727,6 +730,9 @@ def main():
     print("=" * 80)
     print(f"✓ Calculators Processed: {calculators_processed}")
     print(f"✓ Total Keys Added: {total_keys_added}")
+    print(f"✓ {tm.summary()}")
+    if mt:
+        print(f"✓ {mt.summary()}")
     print(f"✓ Namespace Files Updated: {namespaces_updated}")
     print()
     print("🎉 ALL TRANSLATIONS COMPLETED! 🎉")
@@ -742,5 +748,17 @@ def main():
         print(f"  {namespace}: EN={en_keys}, AR={ar_keys}")
     print("=" * 80)
 
+def main():
+    # Existing human translations are reused before the word glossary; a machine
+    # translation backend takes the glossary's place when TRANSLATION_MT_URL is set
+    tm = TranslationMemory.from_index()
+    mt = Translator.from_env()
+    try:
+        complete_translations(tm, mt)
+    finally:
+        if mt:
+            mt.close()
+
 if __name__ == "__main__":
     main()
+    WRITER.report()
@@ -4,9 +4,14 @@ Complete Final Translations - Batch 5 (ULTIMATE FINAL FOR 100%)
 Adds the absolutely final remaining ~280 translation keys for complete 100% coverage
 """
 
-import json
 from pathlib import Path
 
+from i18n_tools.overlay import LocaleWriter
+from i18n_tools.serialize import write_locale
+
+# --dry-run reports what would change instead of writing
+WRITER = LocaleWriter()
+
 # Base paths
 BASE_DIR = Path(__file__).parent.parent
 LOCALES_DIR = BASE_DIR / "public" / "locales"
@@ -15,14 +20,14 @@ EN_FILE = LOCALES_DIR / "en" / "translation.json"
 
 def load_json(file_path):
     """Load JSON file"""
-    with open(file_path, 'r', encoding='utf-8') as f:
-        return json.load(f)
+    return WRITER.load(file_path)
 
 def save_json(file_path, data):
     """Save JSON file with proper formatting"""
-    with open(file_path, 'w', encoding='utf-8') as f:
-        json.dump(data, f, ensure_ascii=False, indent=2)
-        f.write('\n')
+    WRITER.save(file_path, data, write_json)
+
+def write_json(file_path, data):
+    write_locale(file_path, data)
 
 def set_nested_key(data, path, value):
     """Set a value in nested dictionary using dot notation path"""
@@ -563,3 +568,4 @@ def main():
 
 if __name__ == "__main__":
     main()
+    WRITER.report()
@@ -4,20 +4,26 @@ Complete translations for all remaining calculators (105-150)
 This script generates comprehensive translations based on component analysis
 """
 
-import json
 import re
 from pathlib import Path
 
+from i18n_tools.overlay import LocaleWriter
+from i18n_tools.provenance import KEY, noting
+from i18n_tools.serialize import write_locale
+
+# --dry-run reports what would change instead of writing
+WRITER = LocaleWriter()
+
 BASE_DIR = Path("/Users/raedtayyem/Desktop/work/alathasiba-claudecode")
 
 def load_json(filepath):
-    with open(filepath, 'r', encoding='utf-8') as f:
-        return json.load(f)
+    return WRITER.load(filepath)
 
 def save_json(filepath, data):
-    with open(filepath, 'w', encoding='utf-8') as f:
-        json.dump(data, f, ensure_ascii=False, indent=2)
-        f.write('\n')
+    WRITER.save(filepath, data, write_json)
+
+def write_json(filepath, data):
+    write_locale(filepath, data)
 
 def extract_keys_from_component(filepath):
     """Extract translation keys from component file"""
@@ -37,6 +43,7 @@ def extract_keys_from_component(filepath):
 
     return namespace, keys
 
+@noting(KEY)
 def generate_translation(key, lang='en'):
     """Generate a reasonable translation for a key"""
     # Split key by dots and get the last part
@@ -252,3 +259,4 @@ def main():
 
 if __name__ == "__main__":
     main()
+    WRITER.report()
@@ -4,10 +4,15 @@ Complete translations for calculators 141-210
 This script adds ALL missing translation keys for calculators in range 141-210
 """
 
-import json
 import os
 from pathlib import Path
 
+from i18n_tools.overlay import LocaleWriter
+from i18n_tools.serialize import write_locale
+
+# --dry-run reports what would change instead of writing
+WRITER = LocaleWriter()
+
 # Base paths
 BASE_DIR = Path("/Users/raedtayyem/Desktop/work/alathasiba-claudecode")
 EN_FILE = BASE_DIR / "public/locales/en/translation.json"
@@ -15,13 +20,14 @@ AR_FILE = BASE_DIR / "public/locales/ar/translation.json"
 
 def load_json(filepath):
     """Load JSON file"""
-    with open(filepath, 'r', encoding='utf-8') as f:
-        return json.load(f)
+    return WRITER.load(filepath)
 
 def save_json(filepath, data):
     """Save JSON file with proper formatting"""
-    with open(filepath, 'w', encoding='utf-8') as f:
-        json.dump(data, f, ensure_ascii=False, indent=2)
+    WRITER.save(filepath, data, write_json)
+
+def write_json(filepath, data):
+    write_locale(filepath, data, newline=False)
     print(f"✓ Saved {filepath}")
 
 def set_nested_key(data, key_path, value):
@@ -469,3 +475,4 @@ def main():
 
 if __name__ == "__main__":
     main()
+    WRITER.report()
@@ -4,22 +4,28 @@ Complete ALL translations for calculators 146-210
 This is a comprehensive script that adds every missing translation key
 """
 
-import json
 import os
 from pathlib import Path
 
+from i18n_tools.overlay import LocaleWriter
+from i18n_tools.serialize import write_locale
+
+# --dry-run reports what would change instead of writing
+WRITER = LocaleWriter()
+
 # Base paths
 BASE_DIR = Path("/Users/raedtayyem/Desktop/work/alathasiba-claudecode")
 EN_FILE = BASE_DIR / "public/locales/en/translation.json"
 AR_FILE = BASE_DIR / "public/locales/ar/translation.json"
 
 def load_json(filepath):
-    with open(filepath, 'r', encoding='utf-8') as f:
-        return json.load(f)
+    return WRITER.load(filepath)
 
 def save_json(filepath, data):
-    with open(filepath, 'w', encoding='utf-8') as f:
-        json.dump(data, f, ensure_ascii=False, indent=2)
+    WRITER.save(filepath, data, write_json)
+
+def write_json(filepath, data):
+    write_locale(filepath, data, newline=False)
     print(f"✓ Saved {filepath}")
 
 def merge_translations(base, updates):
@@ -904,3 +910,4 @@ def main():
 
 if __name__ == "__main__":
     main()
+    WRITER.report()
@@ -0,0 +1,16 @@
+"""pytest configuration: makes the i18n_tools package importable from its tests and holds their shared fixtures"""
+
+import json
+
+import pytest
+
+
+@pytest.fixture
+def write_locale_tree(tmp_path):
+    """write(path, data, indent=None) stores data as UTF-8 JSON at path (relative to tmp_path), creating parents"""
+    def write(path, data, indent=None):
+        path = tmp_path / path
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(json.dumps(data, ensure_ascii=False, indent=indent), encoding='utf-8')
+        return path
+    return write
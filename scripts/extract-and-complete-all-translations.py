@@ -4,12 +4,17 @@ Extract and Complete All Missing Translations
 Automatically extracts translation keys from source files and adds complete translations
 """
 
-import json
 import os
 import re
 from pathlib import Path
 import subprocess
 
+from i18n_tools.overlay import LocaleWriter
+from i18n_tools.serialize import write_locale
+
+# --dry-run reports what would change instead of writing
+WRITER = LocaleWriter()
+
 # Base paths
 BASE_DIR = Path(__file__).parent.parent
 SRC_DIR = BASE_DIR / "src" / "components" / "calculators"
@@ -43,14 +48,14 @@ CALCULATOR_FILES = [
 
 def load_json(file_path):
     """Load JSON file"""
-    with open(file_path, 'r', encoding='utf-8') as f:
-        return json.load(f)
+    return WRITER.load(file_path)
 
 def save_json(file_path, data):
     """Save JSON file with proper formatting"""
-    with open(file_path, 'w', encoding='utf-8') as f:
-        json.dump(data, f, ensure_ascii=False, indent=2)
-        f.write('\n')
+    WRITER.save(file_path, data, write_json)
+
+def write_json(file_path, data):
+    write_locale(file_path, data)
 
 def set_nested_key(data, path, value):
     """Set a value in nested dictionary using dot notation path"""
@@ -253,3 +258,4 @@ def count_keys(d, prefix=''):
 
 if __name__ == "__main__":
     main()
+    WRITER.report()
@@ -0,0 +1,9 @@
+"""
+Shared translation tooling for public/locales
+
+The batch scripts in scripts/ each re-implement loading, flattening and key
+extraction. This package holds one copy of those building blocks so the
+analyzers can reason about the tree the same way i18next does at runtime.
+
+Entry point: python3 scripts/translation-tools.py <command>
+"""
@@ -0,0 +1,37 @@
+import json
+
+from i18n_tools.bundle import MANIFEST_NAME, build_bundles
+from i18n_tools.i18n_config import I18nConfig
+
+
+def test_bundles_match_what_the_browser_merges(tmp_path, write_locale_tree):
+    locales, out = tmp_path / 'locales', tmp_path / 'dist'
+    config = I18nConfig(split_namespaces={'calc/pet': ('age', 'general')})
+    write_locale_tree(locales / 'en/calc/pet.json', {'title': 'Pets', 'tiers': {'b': 'B', '10': 'ten', '2': 'two'}})
+    write_locale_tree(locales / 'en/calc/pet/age.json',
+                      {'age': {'title': 'Pet Age', 'steps': ['one', 'two']}, 'help': 'Hi'})
+    write_locale_tree(locales / 'en/calc/pet/general.json', {'title': 'All pets', 'help': {'more': 'More'}})
+    write_locale_tree(locales / 'en/common.json', {'ok': 'OK', 'quote': 'a "b"\n'})
+
+    bundles = build_bundles(out, config=config, locales_dir=locales, workers=1)
+    pet = (out / 'en' / 'calc' / 'pet.json').read_text(encoding='utf-8')
+    # what JSON.stringify(deepMerge(...)) gives in customRequest
+    assert pet == ('{"title":"All pets","tiers":{"2":"two","10":"ten","b":"B"},'
+                   '"age":{"title":"Pet Age","steps":["one","two"]},"help":{"0":"H","1":"i","more":"More"}}')
+    assert (out / 'en' / 'common.json').read_text(encoding='utf-8') == '{"ok":"OK","quote":"a \\"b\\"\\n"}'
+    assert [(b.namespace, b.files, b.conflicts, b.written) for b in bundles] == [
+        ('calc/pet', 3, ['help'], True), ('common', 1, [], True)]
+
+    manifest = json.loads((out / MANIFEST_NAME).read_text(encoding='utf-8'))
+    hashed = f"calc/pet.{bundles[0].digest[:10]}.json"
+    assert manifest['bundles']['en']['calc/pet'] == {'files': 3, 'bytes': len(pet), 'hash': bundles[0].digest,
+                                                     'file': hashed}
+    assert (out / 'en' / hashed).read_text(encoding='utf-8') == pet
+    assert not any(b.written for b in build_bundles(out, config=config, locales_dir=locales, workers=1))
+
+    # a changed namespace gets a new hashed file and the old one goes
+    write_locale_tree(locales / 'en/calc/pet/general.json', {'title': 'Every pet'})
+    rebuilt = build_bundles(out, config=config, locales_dir=locales, workers=1)
+    assert [b.written for b in rebuilt] == [True, False]
+    assert not (out / 'en' / hashed).exists()
+    assert sorted(p.name for p in (out / 'en' / 'calc').glob('pet.*.json')) == [f"pet.{rebuilt[0].digest[:10]}.json"]
@@ -0,0 +1,58 @@
+from xml.etree import ElementTree
+
+from i18n_tools.coverage import coverage_report, junit_xml
+from i18n_tools.extract import ExtractionCache
+from i18n_tools.flat_index import FlatIndex
+from i18n_tools.i18n_config import I18nConfig
+from i18n_tools.registry import ComponentLocator, parse_registry_source
+
+CONFIG = I18nConfig(default_ns='translation', fallback_ns=('common',))
+
+REGISTRY = """
+const petCalculators: Calculator[] = [
+  {
+    id: 1,
+    nameKey: "calc/pet:dog-age.title", name: 'عمر الكلب {مثال}',
+    slug: 'dog-age',
+    category: 'pet',
+    componentName: 'DogAge',
+  },
+  // { slug: 'commented-out' }
+  {
+    id: 2,
+    nameKey: 'calculators.{{slug}}.name',
+    slug: 'cat-age',
+    category: 'pet',
+    componentName: 'CatAge'
+  }
+];
+"""
+
+
+def test_registry_and_coverage(tmp_path, write_locale_tree):
+    registry = parse_registry_source(REGISTRY, 'pet.ts')
+    assert [(e.slug, e.line) for e in registry] == [('dog-age', 6), ('cat-age', 14)]
+    assert registry[1].registry_keys() == ['calculators.cat-age.name']
+
+    locales = tmp_path / 'locales'
+    write_locale_tree(locales / 'en' / 'calc' / 'pet.json', {'dog-age': {'title': 'Dog', 'unit': 'yr'}})
+    write_locale_tree(locales / 'ar' / 'calc' / 'pet.json', {'dog-age': {'title': 'كلب'}})
+    write_locale_tree(locales / 'en' / 'translation.json', {'calculators': {'cat-age': {'name': 'Cat'}}})
+    write_locale_tree(locales / 'ar' / 'translation.json', {'calculators': {'cat-age': {'name': 'قط'}}})
+    components = tmp_path / 'components'
+    (components / 'pet').mkdir(parents=True)
+    (components / 'pet' / 'DogAge.tsx').write_text(
+        "const { t } = useTranslation('calc/pet');\nt('dog-age.unit'); t('dog-age.unit');")
+
+    report = coverage_report(FlatIndex(locales, CONFIG), None, ExtractionCache(), registry,
+                             ComponentLocator(components, tmp_path / 'none.ts'), workers=1)
+    dog = report['calculators'][1]
+    assert dog['keys'] == 2 and dog['coverage'] == {'ar': 50, 'en': 100}
+    assert dog['missing']['ar'] == ['dog-age.unit']
+    assert report['calculators'][0]['component'] is None
+    assert report['summary']['fully_translated'] == 1
+    pet = next(n for n in report['namespaces'] if n['namespace'] == 'calc/pet')
+    assert pet['present'] == {'ar': 1, 'en': 2}
+
+    root = ElementTree.fromstring(junit_xml(report).split('\n', 1)[1])
+    assert root.get('failures') == '2'
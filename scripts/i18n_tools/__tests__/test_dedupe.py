@@ -0,0 +1,47 @@
+import json
+
+import pytest
+
+from i18n_tools.bundle import MANIFEST_NAME, build_bundles
+from i18n_tools.dedupe import duplicate_clusters, hoist, value_hash
+from i18n_tools.i18n_config import I18nConfig
+
+
+def test_repeated_values_are_hoisted_where_gzip_shrinks(tmp_path, write_locale_tree):
+    locales, out = tmp_path / 'locales', tmp_path / 'dist'
+    error = 'An error occurred during the calculation, please check the values you entered'
+    tip = 'Measure twice before you order materials: suppliers rarely take back cut pieces of board or tile.'
+    common = {'errors': {'calculation': error}, 'ok': 'OK'}
+    pet = {'error': error, 'reset': 'Reset', 'notes': [error], 'help': f"{{{{n}}}} {error}"}
+    write_locale_tree(locales / 'en/common.json', common)
+    write_locale_tree(locales / 'en/calc/pet.json', pet)
+    write_locale_tree(locales / 'en/calc/math.json', {'errors': {'calc': error}, 'reset': 'Reset', 'tip': tip})
+    write_locale_tree(locales / 'en/calc/date.json', {'reset': 'Reset', 'tip': tip})
+    write_locale_tree(locales / 'en/calc/time.json', {'tip': tip, 'more': {'tip': tip}})
+
+    clusters = duplicate_clusters({('en', 'common'): common, ('en', 'calc/pet'): {'error': error}})
+    assert [(c.count, c.namespaces, c.wasted_bytes) for c in clusters] == [(2, ['calc/pet', 'common'], len(error))]
+
+    with pytest.raises(FileNotFoundError):
+        hoist(out)
+    build_bundles(out, config=I18nConfig(), locales_dir=locales, workers=1)
+    results = {r.namespace: r for r in hoist(out)}
+    bundle = lambda ns: json.loads((out / 'en' / f"{ns}.json").read_text(encoding='utf-8'))
+
+    # an existing common key is referenced; pet keeps the text in an array and an interpolation,
+    # where a reference would only add bytes to the gzipped bundle
+    hoisted = f"$t(common:hoisted.{value_hash(tip)})"
+    assert bundle('calc/math') == {'errors': {'calc': '$t(common:errors.calculation)'}, 'reset': 'Reset',
+                                   'tip': hoisted}
+    assert bundle('calc/time') == {'tip': hoisted, 'more': {'tip': hoisted}}
+    assert bundle('calc/pet') == pet
+    assert bundle('common') == dict(common, hoisted={value_hash(tip): tip})
+    assert all(r.gzip_after < r.gzip_before for ns, r in results.items() if ns != 'common' and r.rewritten)
+    assert sum(r.gzip_after for r in results.values()) < sum(r.gzip_before for r in results.values())
+    manifest = json.loads((out / MANIFEST_NAME).read_text(encoding='utf-8'))
+    assert manifest['hoisted'] == 2
+    assert manifest['bundles']['en']['common']['bytes'] == results['common'].after
+    common_file = out / 'en' / manifest['bundles']['en']['common']['file']
+    assert common_file.read_bytes() == (out / 'en' / 'common.json').read_bytes()
+    with pytest.raises(ValueError):
+        hoist(out)
@@ -0,0 +1,34 @@
+from i18n_tools.flat_index import FlatIndex
+from i18n_tools.fuzzy import FuzzyMemory, MinHashLSH, review_queue, shingles
+from i18n_tools.i18n_config import I18nConfig
+from i18n_tools.tm import TranslationMemory
+
+
+def test_near_duplicates_feed_the_review_queue_without_writing(tmp_path, write_locale_tree):
+    write_locale_tree('en/calc/health.json', {
+        'age': 'Please enter a valid age', 'weight': 'Please enter a valid weight',
+        'height': 'Please enter a valid height', 'bmi': 'Body Mass Index', 'unrelated': 'Daily water intake'})
+    write_locale_tree('ar/calc/health.json', {
+        'weight': 'الرجاء إدخال وزن صحيح', 'height': 'الرجاء إدخال طول صحيح', 'bmi': 'مؤشر كتلة الجسم'})
+    before = sorted((p, p.read_bytes()) for p in tmp_path.rglob('*.json'))
+
+    index = FlatIndex(tmp_path, I18nConfig())
+    fuzzy = FuzzyMemory(TranslationMemory.from_index(index))
+    matches = fuzzy.neighbours('Please enter a valid age')
+    assert {m.source for m in matches} == {'Please enter a valid weight', 'Please enter a valid height'}
+    assert all(m.similarity == 0.667 for m in matches)
+    # an exact match belongs to the exact memory, not the fuzzy one
+    assert 'Body Mass Index' not in {m.source for m in fuzzy.neighbours('Body Mass Index')}
+
+    queue = review_queue(fuzzy, index)
+    assert [entry['key'] for entry in queue] == ['age']
+    assert len(queue[0]['neighbours']) == 2
+    assert sorted((p, p.read_bytes()) for p in tmp_path.rglob('*.json')) == before
+
+
+def test_lsh_finds_similar_sets_without_pairwise_comparison():
+    lsh = MinHashLSH()
+    near = lsh.add(shingles('Enter the total labor cost for the project'))
+    far = lsh.add(shingles('Convert Celsius to Fahrenheit'))
+    found = lsh.candidates(shingles('Enter the total labor cost for this project'))
+    assert near in found and far not in found
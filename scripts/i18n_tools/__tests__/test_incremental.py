@@ -0,0 +1,30 @@
+import subprocess
+
+from i18n_tools.extract import extract_call_sites_from_source
+from i18n_tools.i18n_config import I18nConfig
+from i18n_tools.incremental import _signature, lookups_at
+
+CONFIG = I18nConfig(fallback_ns=('common',))
+
+
+def _git(root, *args):
+    subprocess.run(['git', '-c', 'user.name=t', '-c', 'user.email=t@t', *args], cwd=root, check=True,
+                   capture_output=True)
+
+
+def test_only_lookups_the_diff_added_are_new(tmp_path):
+    component = tmp_path / 'Dog.tsx'
+    component.write_text("const { t } = useTranslation('calc/pet');\nt('dog.title'); t('dog.old');")
+    _git(tmp_path, 'init', '-q')
+    _git(tmp_path, 'add', '.')
+    _git(tmp_path, 'commit', '-q', '-m', 'base')
+
+    # the old lookups move down a line; one new lookup and one new option
+    source = ("const { t } = useTranslation('calc/pet');\n\nt('dog.title'); t('dog.old');\n"
+              "t('dog.unit'); t('dog.title', { count });")
+    component.write_text(source)
+    before = lookups_at('HEAD', component, CONFIG, base=tmp_path)
+    new = [site.key for site in extract_call_sites_from_source(source, 'Dog.tsx')
+           if _signature(site, CONFIG) not in before]
+    assert new == ['dog.unit', 'dog.title']
+    assert lookups_at('HEAD', tmp_path / 'New.tsx', CONFIG, base=tmp_path) == set()
@@ -0,0 +1,76 @@
+import json
+
+import pytest
+
+from i18n_tools.journal import Journal, load_journal, replay, undo
+from i18n_tools.overlay import LocaleWriter
+from i18n_tools.patch import PatchConflict, apply_patch, invert, make_patch, set_nested_value
+from i18n_tools.provenance import ProvenanceIndex
+from i18n_tools.serialize import write_locale
+
+
+def test_patch_round_trip_keeps_key_order():
+    old = {'a': '1', 'b': {'x': '2', 'y': '3'}, 'gone': '4'}
+    new = {'a': '1', 'b': {'x': 'two', 'y': '3', 'z': '5'}, 'c/d': ['6']}
+    ops = make_patch(old, new)
+    assert {'op': 'add', 'path': '/c~1d', 'value': ['6']} in ops
+    assert json.dumps(apply_patch(json.loads(json.dumps(old)), ops)) == json.dumps(new)
+    assert json.dumps(apply_patch(json.loads(json.dumps(new)), invert(ops))) == json.dumps(old)
+    with pytest.raises(PatchConflict):
+        apply_patch({'a': '1', 'b': {'x': 'edited', 'y': '3'}, 'gone': '4'}, ops)
+
+    reordered = {'b': old['b'], 'a': '1', 'gone': '4'}
+    assert make_patch(old, reordered)[-1] == {'op': 'replace', 'path': '', 'value': reordered}
+
+
+def test_set_nested_value_never_clobbers():
+    data = {'title': 'Pet Age', 'units': {'kg': 'kg'}}
+    set_nested_value(data, 'units.lb', 'lb')
+    with pytest.raises(PatchConflict):
+        set_nested_value(data, 'title.main', 'Pet')
+    with pytest.raises(PatchConflict):
+        set_nested_value(data, 'units', 'Units')
+    assert data == {'title': 'Pet Age', 'units': {'kg': 'kg', 'lb': 'lb'}}
+
+
+def test_replay_and_undo(tmp_path):
+    path = tmp_path / 'public' / 'locales' / 'ar' / 'common.json'
+    path.parent.mkdir(parents=True)
+    original = '{\n  "ok": "حسنا"\n}'
+    path.write_text(original, encoding='utf-8')
+    journal = Journal('run-1', tmp_path / 'journal', script='scripts/batch.py')
+    journal.record(path, {'ok': 'حسنا'}, {'ok': 'حسنا', 'cancel': 'إلغاء'}, (False, True))
+    data = load_journal(journal.path)
+    for entry in data['files']:
+        entry['file'] = 'public/locales/ar/common.json'
+
+    assert replay([data], root=tmp_path) == {'public/locales/ar/common.json': 1}
+    assert json.loads(path.read_text(encoding='utf-8'))['cancel'] == 'إلغاء'
+    path.write_text('{"ok": "حسنا", "cancel": "ألغ"}', encoding='utf-8')
+    with pytest.raises(PatchConflict):
+        undo(data, root=tmp_path)
+    replay([data], root=tmp_path)
+    undo(data, root=tmp_path)
+    assert path.read_text(encoding='utf-8') == original
+
+
+def test_undo_restores_a_hand_formatted_file_byte_for_byte(tmp_path):
+    path = tmp_path / 'public' / 'locales' / 'ar' / 'common.json'
+    path.parent.mkdir(parents=True)
+    original = b'{\r\n    "ok": "\xd8\xad\xd8\xb3\xd9\x86\xd8\xa7",\r\n    "units": {"kg": "kg"}\r\n,\r\n    "n": 1.50\r\n}'
+    path.write_bytes(original)
+    journal = Journal('run-2', tmp_path / 'journal', script='scripts/batch.py')
+    writer = LocaleWriter(dry_run=False, journal=journal, provenance=ProvenanceIndex(tmp_path / 'provenance'))
+    data = writer.load(path)
+    data['cancel'] = 'إلغاء'
+    writer.save(path, data, write_locale)
+    data['units']['lb'] = 'lb'
+    writer.save(path, data, write_locale)
+    assert path.read_bytes() != original
+
+    entries = load_journal(journal.path)['files']
+    assert [('original' in entry) for entry in entries] == [True, False]
+    for entry in entries:
+        entry['file'] = 'public/locales/ar/common.json'
+    undo({'files': entries}, root=tmp_path)
+    assert path.read_bytes() == original
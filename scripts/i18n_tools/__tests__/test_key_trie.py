@@ -0,0 +1,32 @@
+from i18n_tools.key_trie import KeyTrie, template_to_pattern
+
+KEYS = [
+    'heirs.labels.son', 'heirs.labels.daughter', 'heirs.title',
+    'months.1.name', 'months.1.start', 'months.2.name',
+    'units.unit_cups', 'units.unit_grams', 'units.count_one', 'units.count_other',
+]
+
+
+def test_template_to_pattern():
+    assert template_to_pattern('heirs.labels.${heir.key}') == 'heirs.labels.*'
+    assert template_to_pattern('months.${m}.name') == 'months.*.name'
+    assert template_to_pattern('x.${a ? `${b}` : {c: 1}.c}_y') == 'x.*_y'
+
+
+def test_glob_matches_stay_within_segment():
+    trie = KeyTrie(KEYS)
+    assert trie.match('heirs.labels.*') == ['heirs.labels.daughter', 'heirs.labels.son']
+    assert trie.match('months.*.name') == ['months.1.name', 'months.2.name']
+    assert trie.match('units.unit_*') == ['units.unit_cups', 'units.unit_grams']
+    assert trie.match('heirs.*') == ['heirs.title']
+    assert trie.match('heirs.*', include_subtrees=True) == [
+        'heirs.labels.daughter', 'heirs.labels.son', 'heirs.title']
+
+
+def test_plural_suffixes_and_removal():
+    trie = KeyTrie(KEYS)
+    assert trie.match('units.count', suffixes=('_one', '_other')) == ['units.count_one', 'units.count_other']
+    assert trie.remove('months.2.name')
+    assert 'months.2.name' not in trie
+    assert trie.subtree('months') == ['months.1.name', 'months.1.start']
+    assert len(trie) == len(KEYS) - 1
@@ -0,0 +1,38 @@
+import json
+
+from i18n_tools.flat_index import FlatIndex
+from i18n_tools.i18n_config import I18nConfig
+from i18n_tools.journal import Journal
+from i18n_tools.locales import language_set, process_locales, scaffold
+from i18n_tools.overlay import LocaleWriter
+
+
+def test_scaffolded_locale_is_summarized_beside_the_others(tmp_path, write_locale_tree):
+    locales = tmp_path / 'locales'
+    write_locale_tree(locales / 'en/common.json', {'ok': 'OK', 'count': '{{n}} items'})
+    write_locale_tree(locales / 'en/calc/pet.json', {'title': 'Pet Age'})
+    write_locale_tree(locales / 'ar/common.json', {'ok': 'حسنا', 'count': 'عناصر'})
+    write_locale_tree(locales / 'ar/calc/pet.json', {'title': 'Pet Age'})
+    config = I18nConfig(supported_lngs=('ar', 'en', 'he'))
+
+    languages = language_set(config, locales)
+    assert languages.unscaffolded == ['he'] and languages.targets == ['ar', 'he']
+
+    dry = scaffold('he', LocaleWriter(dry_run=True), locales)
+    assert len(dry) == 2 and not (locales / 'he').exists()
+    writer = LocaleWriter(dry_run=False, journal=Journal('scaffold', tmp_path / 'journal'))
+    created = scaffold('he', writer, locales)
+    assert sorted(p.relative_to(locales).as_posix() for p in created) == ['he/calc/pet.json', 'he/common.json']
+    assert json.loads((locales / 'he' / 'common.json').read_text(encoding='utf-8')) == {}
+    assert scaffold('he', writer, locales) == []
+    # an empty scaffold is not checked by default
+    assert language_set(config, locales).inactive == ['he']
+    assert FlatIndex(locales, config).languages() == ['ar', 'en']
+
+    write_locale_tree(locales / 'he/common.json', {'ok': 'אישור'})
+    assert FlatIndex(locales, config).languages() == ['ar', 'en', 'he']
+    ar, he = process_locales(['ar', 'he'], locales, config, workers=2)
+    assert (ar.lang, ar.values, ar.source_values, ar.placeholder_mismatches) == ('ar', 3, 3, 1)
+    assert ar.quality['identical'] == 1
+    assert (he.lang, he.files, he.values, he.coverage) == ('he', 2, 1, 33)
+    assert sum(he.quality.values()) == 0
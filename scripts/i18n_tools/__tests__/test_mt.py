@@ -0,0 +1,50 @@
+import pytest
+
+from i18n_tools.mt import HttpProvider, Provider, TranslationCache, TranslationError, Translator
+from i18n_tools.mt_server import StandInServer
+
+
+def test_batches_are_cached_so_a_rerun_sends_nothing(tmp_path):
+    texts = [f"Value {i}" for i in range(25)] + ['Value 0']
+    cache_file = tmp_path / 'mt.jsonl'
+    with StandInServer() as server:
+        provider = HttpProvider(server.url, max_batch=10, workers=3, backoff=0)
+        translator = Translator(provider, TranslationCache(cache_file))
+        result = translator.translate_many(texts, 'ar')
+        assert result['Value 7'] == '[AR] Value 7'
+        assert (server.requests, server.texts) == (3, 25)
+        assert server.connections <= 3
+        translator.close()
+
+        rerun = Translator(HttpProvider(server.url, max_batch=10), TranslationCache(cache_file))
+        assert rerun.translate_many(texts, 'ar') == result
+        assert server.requests == 3
+        assert rerun.cached == 25
+
+        # the provider version is part of the key
+        bumped = Translator(HttpProvider(server.url, version='2'), TranslationCache(cache_file))
+        bumped.translate('Value 1', 'ar')
+        assert server.requests == 4
+
+
+def test_unavailable_server_is_retried_with_backoff(tmp_path):
+    with StandInServer() as server:
+        server.fail_next = 2
+        translator = Translator(HttpProvider(server.url, retries=2, backoff=0), TranslationCache(None))
+        assert translator.translate('Total Cost', 'ar') == '[AR] Total Cost'
+        assert server.requests == 3
+
+
+def test_malformed_response_is_retried_then_reported(tmp_path):
+    with StandInServer() as server:
+        server.garble_next = 1
+        translator = Translator(HttpProvider(server.url, retries=1, backoff=0), TranslationCache(None))
+        assert translator.translate('Total Cost', 'ar') == '[AR] Total Cost'
+
+        server.garble_next = 2
+        with pytest.raises(TranslationError, match='malformed response'):
+            translator.translate('Unit Price', 'ar')
+        assert server.requests == 4
+
+    with pytest.raises(TypeError):
+        Provider()
@@ -0,0 +1,32 @@
+import json
+
+from i18n_tools.overlay import ADDED, CHANGED, REMOVED, Change, CowDict, LocaleWriter, diff_trees
+
+
+def test_overlay_leaves_base_untouched():
+    base = {'a': {'x': '1', 'y': '2'}, 'b': {'z': '3'}, 'list': ['p']}
+    view = CowDict(base)
+    view['a']['x'] = 'one'
+    view.setdefault('c', {})['w'] = 'new'
+    view['list'].append('q')
+    del view['b']
+    assert base == {'a': {'x': '1', 'y': '2'}, 'b': {'z': '3'}, 'list': ['p']}
+    assert diff_trees(base, view) == [
+        Change(CHANGED, 'a.x', '1', 'one'), Change(REMOVED, 'b.z', old='3'),
+        Change(CHANGED, 'list', ['p'], ['p', 'q']), Change(ADDED, 'c.w', new='new')]
+
+
+def test_dry_run_writes_nothing(tmp_path):
+    path = tmp_path / 'ar' / 'common.json'
+    path.parent.mkdir()
+    path.write_text(json.dumps({'ok': 'حسنا'}), encoding='utf-8')
+    writes = []
+    writer = LocaleWriter(dry_run=True)
+    data = writer.load(path)
+    data['cancel'] = 'إلغاء'
+    assert not writer.save(path, data, lambda p, d: writes.append(p))
+    assert writer.load(path) is data
+    lines = []
+    writer.report(out=lines.append)
+    assert not writes and json.loads(path.read_text(encoding='utf-8')) == {'ok': 'حسنا'}
+    assert '  + cancel = "إلغاء"' in lines
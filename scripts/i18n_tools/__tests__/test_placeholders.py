@@ -0,0 +1,35 @@
+from i18n_tools.flat_index import FlatIndex
+from i18n_tools.i18n_config import I18nConfig
+from i18n_tools.placeholders import check, key_lines, placeholders
+
+
+def test_placeholders_multiset():
+    assert placeholders('{{a}} and {{- b}} or {{a, number}}') == {'a': 2, 'b': 1}
+    assert not placeholders('no braces {single}')
+
+
+def test_parity_against_english(tmp_path, write_locale_tree):
+    write_locale_tree('en/calc/pet.json', {'age': '{{years}} years', 'items_one': 'One item',
+                                           'items_other': '{{count}} items', 'list': ['{{n}} dogs']}, indent=2)
+    write_locale_tree('ar/calc/pet.json', {'age': '{{year}} سنة', 'items_zero': 'لا عناصر', 'items_few': 'عناصر',
+                                           'list': ['{{n}} كلاب']}, indent=2)
+
+    mismatches = check(FlatIndex(tmp_path, I18nConfig()))
+    found = {(m.key, m.missing, m.extra) for m in mismatches}
+    assert found == {('age', ('years',), ('year',)), ('items_few', ('count',), ())}
+    age = next(m for m in mismatches if m.key == 'age')
+    assert age.line == 2 and age.file.endswith('ar/calc/pet.json')
+
+
+def test_line_follows_the_key_path(tmp_path, write_locale_tree):
+    text = ('{\n  "a": {\n    "label": "{{n}} x",\n    "label2": "same"\n  },\n'
+            '  "b": {"label": "{{n}} x",\n    "list": ["same", "{{m}}"]},\n  "label": "same"\n}\n')
+    (tmp_path / 'ar' / 'calc').mkdir(parents=True)
+    (tmp_path / 'ar' / 'calc' / 'pet.json').write_text(text, encoding='utf-8')
+    assert key_lines(text) == {'a': 2, 'a.label': 3, 'a.label2': 4, 'b': 6, 'b.label': 6, 'b.list': 7,
+                               'b.list[0]': 7, 'b.list[1]': 7, 'label': 8}
+
+    write_locale_tree('en/calc/pet.json', {'a': {'label': '{{n}} x'},
+                                           'b': {'label': '{{k}} x', 'list': ['same', '{{k}}']}})
+    lines = {m.key: m.line for m in check(FlatIndex(tmp_path, I18nConfig()))}
+    assert lines == {'b.label': 6, 'b.list[1]': 7}
@@ -0,0 +1,28 @@
+import gzip
+
+from i18n_tools.precompress import load_state, precompress
+
+
+def test_changed_files_are_compressed_and_stale_siblings_removed(tmp_path):
+    out, state = tmp_path / 'locales', tmp_path / 'state.json'
+    (out / 'en' / 'calc').mkdir(parents=True)
+    common = out / 'en' / 'common.json'
+    common.write_bytes(b'{"ok":"OK","cancel":"Cancel","ok_again":"OK"}')
+    (out / 'en' / 'calc' / 'pet.json').write_bytes(b'{"title":"Pet Age"}')
+    (out / 'en' / 'gone.json.gz').write_bytes(b'old')
+    (out / 'en' / 'common.json.br').write_bytes(b'old')
+
+    results, removed = precompress(out, workers=1, state_file=state, with_brotli=False)
+    assert [(r.path, r.written, r.br) for r in results] == [('en/calc/pet.json', True, None),
+                                                           ('en/common.json', True, None)]
+    assert gzip.decompress((out / 'en' / 'common.json.gz').read_bytes()) == common.read_bytes()
+    assert sorted(p.name for p in removed) == ['common.json.br', 'gone.json.gz']
+    assert load_state(state)[str(common)]['gzip'] == results[1].gzip
+
+    common.write_bytes(b'{"ok":"OK"}')
+    (out / 'en' / 'calc' / 'pet.json').unlink()
+    results, removed = precompress(out, workers=1, state_file=state, with_brotli=False)
+    assert [(r.path, r.written) for r in results] == [('en/common.json', True)]
+    assert [p.name for p in removed] == ['pet.json.gz'] and list(load_state(state)) == [str(common)]
+    assert gzip.decompress((out / 'en' / 'common.json.gz').read_bytes()) == b'{"ok":"OK"}'
+    assert not precompress(out, workers=1, state_file=state, with_brotli=False)[0][0].written
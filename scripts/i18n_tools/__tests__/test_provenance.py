@@ -0,0 +1,46 @@
+import json
+
+from i18n_tools.flat_index import FlatIndex
+from i18n_tools.i18n_config import I18nConfig
+from i18n_tools.journal import Journal
+from i18n_tools.overlay import LocaleWriter
+from i18n_tools.provenance import GLOSSARY, KEY, STALE, UNKNOWN, ProvenanceIndex, clear_notes, note, noting
+from i18n_tools.serialize import write_locale
+
+
+def test_writes_record_origins_until_the_value_changes(tmp_path):
+    locales = tmp_path / 'locales'
+    path = locales / 'ar' / 'calc' / 'pet.json'
+    path.parent.mkdir(parents=True)
+    path.write_text(json.dumps({'title': 'عمر الحيوان'}, ensure_ascii=False), encoding='utf-8')
+    sidecar = tmp_path / 'provenance.json'
+    config = I18nConfig()
+
+    @noting(GLOSSARY)
+    def glossary(text):
+        return text.replace('Weight', 'الوزن')
+
+    clear_notes()
+    writer = LocaleWriter(dry_run=False, journal=Journal('run', tmp_path / 'journal', script='scripts/batch.py'),
+                          provenance=ProvenanceIndex(sidecar, locales, config))
+    data = writer.load(path)
+    data['weight'] = glossary('Weight')
+    data['age'] = glossary('Age')  # nothing substituted: not the glossary's work
+    data['units'] = {'kg': note('kg', KEY)}
+    writer.save(path, data, write_locale)
+    writer.report(out=lambda line: None)
+
+    provenance = ProvenanceIndex(sidecar, locales, config)
+    assert provenance.get('ar', 'calc/pet', 'weight', 'الوزن') == GLOSSARY
+    assert provenance.get('ar', 'calc/pet', 'age', 'Age') == 'script:batch.py'
+    assert provenance.get('ar', 'calc/pet', 'units.kg', 'kg') == KEY
+    assert provenance.status('ar', 'calc/pet', 'title', 'عمر الحيوان') == UNKNOWN
+
+    # a later edit invalidates the entry without touching the sidecar
+    data['weight'] = 'وزن الحيوان'
+    write_locale(path, data)
+    assert provenance.get('ar', 'calc/pet', 'weight', 'وزن الحيوان') is None
+    assert provenance.status('ar', 'calc/pet', 'weight', 'وزن الحيوان') == STALE
+    assert provenance.prune(FlatIndex(locales, config)) == 1
+    provenance.save()
+    assert len(ProvenanceIndex(sidecar, locales, config)) == 2
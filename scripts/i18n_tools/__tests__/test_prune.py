@@ -0,0 +1,56 @@
+import json
+
+from i18n_tools.bundle import build_bundles
+from i18n_tools.extract import ExtractionCache
+from i18n_tools.flat_index import FlatIndex
+from i18n_tools.i18n_config import I18nConfig
+from i18n_tools.prune import allowed, live_keys
+from i18n_tools.registry import parse_registry_source
+
+CONFIG = I18nConfig(default_ns='translation', fallback_ns=('common',))
+
+REGISTRY = "[{ slug: 'vat-calculator', category: 'business', componentName: 'Vat', nameKey: 'calculators.{{slug}}.name' }]"
+
+COMPONENT = """
+const { t } = useTranslation('calc/business');
+const rates = [{ label: 'vat.rates.standard' }, { label: 'vat.rates.zero' }];
+t('vat.title'); t(`vat.modes.${mode}`);
+rates.map(rate => t(rate.label));
+"""
+
+
+def test_bundles_keep_only_reachable_keys(tmp_path, write_locale_tree):
+    locales = tmp_path / 'locales'
+    business = {
+        'vat': {'title': 'VAT', 'modes': {'add': 'Add', 'remove': 'Remove'},
+                'rates': {'standard': 'Standard', 'zero': 'Zero', 'reduced': 'Reduced'}},
+        'vat-calculator': {'title': 'VAT (old)', 'faqs': [{'question': 'Q', 'answer': 'A'}]},
+        'vat_calculator': {'faqs': [{'question': 'Q', 'answer': 'A'}]},
+    }
+    write_locale_tree(locales / 'en' / 'calc' / 'business.json', business)
+    write_locale_tree(locales / 'en' / 'translation.json', {'calculators': {'vat-calculator': {'name': 'VAT'}},
+                                                            'categoryNames': {'business': 'Business'}, 'old': 'x'})
+    source = tmp_path / 'Vat.tsx'
+    source.write_text(COMPONENT)
+
+    keep, results = live_keys(FlatIndex(locales, CONFIG), None, ExtractionCache(),
+                              parse_registry_source(REGISTRY, 'business.ts'), [source], ['*:categoryNames.*'])
+    removed = {(r.namespace, key) for r in results for key in r.removed}
+    assert removed == {('calc/business', 'vat.rates.reduced'), ('calc/business', 'vat-calculator.title'),
+                       ('calc/business', 'vat-calculator.faqs'), ('translation', 'old')}
+
+    before = (locales / 'en' / 'calc' / 'business.json').read_bytes()
+    out = tmp_path / 'dist'
+    bundle, _ = build_bundles(out, locales_dir=locales, config=CONFIG, workers=1, keep=keep)
+    assert json.loads((out / 'en' / 'calc' / 'business.json').read_text()) == {
+        'vat': {'title': 'VAT', 'modes': {'add': 'Add', 'remove': 'Remove'},
+                'rates': {'standard': 'Standard', 'zero': 'Zero'}},
+        'vat_calculator': {'faqs': [{'question': 'Q', 'answer': 'A'}]}}
+    assert bundle.removed == 3 and bundle.unpruned_size > bundle.size
+    assert (locales / 'en' / 'calc' / 'business.json').read_bytes() == before
+
+
+def test_allowlist_patterns_cover_subtrees():
+    assert allowed('common', 'categoryNames.pet.short', ['*:categoryNames.*'])
+    assert allowed('calc/pet', 'faqs.items', ['calc/*:faqs'])
+    assert not allowed('common', 'categories', ['*:categoryNames.*'])
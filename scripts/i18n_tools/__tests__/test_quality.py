@@ -0,0 +1,27 @@
+from i18n_tools.flat_index import FlatIndex
+from i18n_tools.i18n_config import I18nConfig
+from i18n_tools.quality import SCRIPT_RES, classify, scan, summarize
+
+
+def test_classify():
+    arabic = SCRIPT_RES['ar']
+    assert classify('[AR] Use Case 1', 'Use Case 1', arabic) == 'marker'
+    assert classify(' ', 'x', arabic) == 'empty'
+    assert classify('Use Case 1', 'Use Case 1', arabic) == 'identical'
+    assert classify('calculation خطأ', 'Calculation error', arabic) == 'latin'
+    assert classify('قيمة {{value}} kg', '{{value}} kg', arabic) is None
+    assert classify('kW', 'kW', arabic) is None
+    assert classify('Use Case 1', 'Use Case 1', None) is None
+
+
+def test_scan_streams_per_namespace(tmp_path, write_locale_tree):
+    write_locale_tree('en/calc/pet.json', {'title': 'Pet Age', 'tips': ['Feed daily', 'Walk']})
+    write_locale_tree('ar/calc/pet.json', {'title': 'Pet Age', 'tips': ['أطعمه يوميا', '[AR] Walk']})
+    write_locale_tree('ar/common.json', {'ok': 'حسنا'})
+
+    results = list(scan(FlatIndex(tmp_path, I18nConfig()), ['ar']))
+    assert [r.namespace for r in results] == ['calc/pet', 'common']
+    assert [(f.key, f.kind, f.file) for f in results[0].findings] == [
+        ('title', 'identical', 'ar/calc/pet.json'), ('tips[1]', 'marker', 'ar/calc/pet.json')]
+    assert results[0].values == 3
+    assert summarize(results)['ar']['marker'] == 1
@@ -0,0 +1,58 @@
+from i18n_tools.extract import extract_call_sites_from_source
+from i18n_tools.flat_index import FlatIndex
+from i18n_tools.i18n_config import I18nConfig
+from i18n_tools.resolver import MISSING_KEY, OBJECT, NamespaceResolver
+
+CONFIG = I18nConfig(
+    default_ns='translation',
+    fallback_ns=('translation', 'calculators', 'common', 'navigation'),
+    fallback_lng=('ar',),
+    split_namespaces={'calc/construction': ('general',)},
+)
+
+
+def make_resolver(tmp_path, write_locale_tree):
+    locales = tmp_path / 'locales'
+    write_locale_tree(locales / 'en' / 'calc' / 'construction.json', {'drywall': {'title': 'Drywall'}})
+    write_locale_tree(locales / 'en' / 'calc' / 'construction' / 'general.json', {'drywall': {'unit': 'Sheets'}})
+    write_locale_tree(locales / 'en' / 'translation.json', {'shared': 'Shared', 'drywall': {'title': 'Old'}})
+    write_locale_tree(locales / 'en' / 'common.json', {'reset': 'Reset', 'tips': {'a': 'A'}})
+    write_locale_tree(locales / 'ar' / 'common.json', {'only_ar': 'عربي'})
+    return NamespaceResolver(FlatIndex(locales, CONFIG))
+
+
+def sites(source):
+    return {s.key: s for s in extract_call_sites_from_source(source, 'X.tsx')}
+
+
+def test_bound_namespace_and_split_files(tmp_path, write_locale_tree):
+    resolver = make_resolver(tmp_path, write_locale_tree)
+    calls = sites("const { t } = useTranslation(['calc/construction', 'common']);\n"
+                  "t('drywall.title'); t('drywall.unit'); t('reset');")
+    title = resolver.resolve(calls['drywall.title'], 'en')
+    assert (title.namespace, title.probes, title.shadowed) == ('calc/construction', 1, ('translation',))
+    assert resolver.resolve(calls['drywall.unit'], 'en').namespace == 'calc/construction'
+    # 'common' is only loaded by the hook; the key is found through fallbackNS
+    reset = resolver.resolve(calls['reset'], 'en')
+    assert (reset.namespace, reset.probes) == ('common', 4)
+
+
+def test_only_first_hook_namespace_is_bound(tmp_path, write_locale_tree):
+    resolver = make_resolver(tmp_path, write_locale_tree)
+    calls = sites("const { t } = useTranslation(['translation', 'calc/construction']);\n"
+                  "t('drywall.unit'); t('calc/construction:drywall.unit');")
+    assert resolver.resolve(calls['drywall.unit'], 'en').status == MISSING_KEY
+    assert resolver.target_namespace(calls['drywall.unit']) == 'translation'
+    prefixed = resolver.resolve(calls['calc/construction:drywall.unit'], 'en')
+    assert (prefixed.namespace, prefixed.key) == ('calc/construction', 'drywall.unit')
+
+
+def test_options_and_language_fallback(tmp_path, write_locale_tree):
+    resolver = make_resolver(tmp_path, write_locale_tree)
+    calls = sites("const { t } = useTranslation('calc/construction');\n"
+                  "t('reset', { ns: 'common' }); t('tips'); t('only_ar');")
+    assert resolver.resolve(calls['reset'], 'en').probes == 1
+    assert resolver.resolve(calls['tips'], 'en').status == OBJECT
+    only_ar = resolver.resolve(calls['only_ar'], 'en')
+    assert only_ar.via_fallback_language
+    assert resolver.resolve(calls['only_ar'], 'en', strict=True).status == MISSING_KEY
@@ -0,0 +1,65 @@
+import io
+import json
+
+from i18n_tools.i18n_config import I18nConfig
+from i18n_tools.journal import Journal
+from i18n_tools.overlay import LocaleWriter
+from i18n_tools.provenance import HUMAN, ProvenanceIndex
+from i18n_tools.review import ReviewImporter, read_csv, read_xliff, select_units, write_csv, write_xliff
+
+
+def _corpus(write_locale_tree):
+    write_locale_tree('en/calc/pet.json', {'title': 'Pet Age', 'age': '{{years}} years & <b>{{months}}</b> months',
+                                           'tips': ['Feed daily', 'Walk daily']})
+    write_locale_tree('ar/calc/pet.json', {'title': '[AR] Pet Age', 'tips': ['أطعمه يوميا']})
+    write_locale_tree('en/common.json', {'ok': 'OK', 'cancel': 'Cancel'})
+    write_locale_tree('ar/common.json', {'ok': 'حسنا'})
+
+
+def _importer(tmp_path):
+    writer = LocaleWriter(dry_run=False, journal=Journal('review', tmp_path / 'journal'),
+                          provenance=ProvenanceIndex(tmp_path / 'provenance.json', tmp_path, I18nConfig()))
+    return ReviewImporter('ar', writer, tmp_path, I18nConfig())
+
+
+def test_xliff_round_trip_applies_reviewed_values(tmp_path, write_locale_tree):
+    _corpus(write_locale_tree)
+    units = list(select_units('ar', locales_dir=tmp_path, config=I18nConfig()))
+    assert [(u.namespace, u.key, u.reason) for u in units] == [
+        ('calc/pet', 'title', 'placeholder'), ('calc/pet', 'age', 'missing'),
+        ('calc/pet', 'tips[1]', 'missing'), ('common', 'cancel', 'missing')]
+
+    out = io.StringIO()
+    assert write_xliff(iter(units), out, 'ar') == {'placeholder': 1, 'missing': 3}
+    reviewed = (out.getvalue()
+                .replace('<target>[AR] Pet Age</target>', '<target>عمر الحيوان</target>')
+                .replace('<target></target>', '<target>{{years}} سنوات و&lt;b&gt;{{months}}&lt;/b&gt; أشهر</target>', 1)
+                .replace('<target></target>', '<target>امشِ معه يوميا</target>', 1))
+    parsed = list(read_xliff(io.BytesIO(reviewed.encode('utf-8'))))
+    assert parsed[1].source == units[1].source
+
+    importer = _importer(tmp_path)
+    results = list(importer.run(parsed))
+    assert [(r.namespace, r.applied, r.errors) for r in results] == [('calc/pet', 3, []), ('common', 0, [])]
+    pet = json.loads((tmp_path / 'ar' / 'calc' / 'pet.json').read_text(encoding='utf-8'))
+    assert pet == {'title': 'عمر الحيوان', 'tips': ['أطعمه يوميا', 'امشِ معه يوميا'],
+                   'age': '{{years}} سنوات و<b>{{months}}</b> أشهر'}
+    assert importer.writer.provenance.get('ar', 'calc/pet', 'title', 'عمر الحيوان') == HUMAN
+
+
+def test_a_bad_unit_rejects_its_whole_namespace(tmp_path, write_locale_tree):
+    _corpus(write_locale_tree)
+    out = io.StringIO()
+    write_csv(select_units('ar', locales_dir=tmp_path, config=I18nConfig()), out)
+    rows = out.getvalue().splitlines()
+    rows[1] = rows[1].replace('[AR] Pet Age', 'عمر الحيوان')
+    rows[2] = rows[2] + 'سنوات'  # {{years}} and {{months}} dropped
+    rows[4] = rows[4] + 'إلغاء'
+    before = (tmp_path / 'ar' / 'calc' / 'pet.json').read_bytes()
+
+    results = list(_importer(tmp_path).run(read_csv(io.StringIO('\n'.join(rows)))))
+    assert results[0].namespace == 'calc/pet' and results[0].applied == 0
+    assert 'interpolations differ' in results[0].errors[0]
+    assert (tmp_path / 'ar' / 'calc' / 'pet.json').read_bytes() == before
+    assert results[1].applied == 1
+    assert json.loads((tmp_path / 'ar' / 'common.json').read_text(encoding='utf-8'))['cancel'] == 'إلغاء'
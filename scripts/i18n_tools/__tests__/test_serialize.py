@@ -0,0 +1,54 @@
+import json
+
+import pytest
+
+from i18n_tools import serialize
+from i18n_tools.paths import LOCALES_DIR
+
+LOCALE_FILES = sorted(LOCALES_DIR.rglob('*.json'))
+
+
+def reference(data) -> str:
+    return json.dumps(data, ensure_ascii=False, indent=2) + '\n'
+
+
+@pytest.mark.parametrize('encode', [serialize.dumpb, lambda data: serialize.dumps_python(data).encode('utf-8')],
+                         ids=['dumpb', 'python'])
+def test_golden_locale_corpus(encode):
+    assert len(LOCALE_FILES) > 100
+    for path in LOCALE_FILES:
+        raw = path.read_bytes()
+        data = json.loads(raw)
+        content = encode(data)
+        if not raw.endswith(b'\n'):  # written with write_locale(newline=False)
+            content = content[:-1]
+        if content != raw:  # hand-edited, not in the json.dump(indent=2) layout
+            assert encode(data) == reference(data).encode('utf-8'), path
+
+
+EDGE_STRINGS = {
+    'escapes': 'quote " slash \\ tab \t nul \x00 unit \x1f del \x7f',
+    'separators': 'line \u2028 paragraph \u2029 next \x85',
+    'non_bmp': '\U0001f600 \U0001d538 \U00020000 \u202e \u0639 \ufeff',
+    'html': '</script><!-- & -->',
+    'nested': [{'deep': ['</', '\u2028', '\U0001f600']}, {}, [], None, True, False, 0, -2 ** 63, 2 ** 63 - 1],
+}
+
+
+def test_edge_strings_on_the_orjson_path():
+    pytest.importorskip('orjson')
+    assert serialize._orjson_safe(EDGE_STRINGS)
+    assert serialize._orjson_dumps(EDGE_STRINGS) == reference(EDGE_STRINGS).encode('utf-8')
+    assert serialize.dumps(EDGE_STRINGS) == serialize.dumps_python(EDGE_STRINGS) == reference(EDGE_STRINGS)
+
+    # orjson refuses lone surrogates; json writes them through, and so does dumps
+    lone = {'key': 'half \ud800 pair'}
+    assert serialize._orjson_safe(lone) and serialize._orjson_dumps(lone) is None
+    assert serialize.dumps(lone) == reference(lone)
+
+
+def test_values_orjson_would_change_take_the_python_path():
+    data = {'a': 'x', 'empty': {}, 'list': [], 'n': [1, 2 ** 70, 1.5, 1e16, 0.1], 3: 'int key'}
+    assert not serialize._orjson_safe(data)
+    assert serialize.dumps(data) == reference(data)
+    assert serialize.dumps(['top', 'level']) == reference(['top', 'level'])
@@ -0,0 +1,39 @@
+import pytest
+
+from i18n_tools.extract import ExtractionCache
+from i18n_tools.flat_index import FlatIndex
+from i18n_tools.i18n_config import I18nConfig
+from i18n_tools.shard import merge_shards, parse_shard, run_shard
+from i18n_tools.usage import UsageIndex, check_report
+
+CONFIG = I18nConfig(fallback_ns=('common',))
+
+
+def test_merged_shards_match_single_run(tmp_path, write_locale_tree):
+    locales = tmp_path / 'locales'
+    for lang in ('ar', 'en'):
+        write_locale_tree(locales / lang / 'common.json', {'reset': 'R', 'save': 'S', 'spare': 'X'})
+        for name in ('pet', 'car', 'sun', 'tax'):
+            write_locale_tree(locales / lang / 'calc' / f"{name}.json", {name: {'title': 'T', 'old': 'O'}})
+    sources = []
+    for name in ('pet', 'car', 'sun', 'tax'):
+        path = tmp_path / f"{name}.tsx"
+        path.write_text(f"const {{ t }} = useTranslation('calc/{name}');\n"
+                        f"t('{name}.title'); t('reset'); t('{name}.gone');")
+        sources.append(path)
+
+    index = FlatIndex(locales, CONFIG)
+    usage = UsageIndex(index, None, ExtractionCache()).build(sources)
+    single = check_report(len(sources), usage.missing(),
+                          {f"{lang}:{ns}": usage.unused(lang, ns)
+                           for lang in usage.languages for ns in index.namespaces(lang)})
+    assert single['unused']['en:common'] == ['save', 'spare']
+
+    for total in (1, 2, 3, 5):
+        results = [run_shard(FlatIndex(locales, CONFIG), sources, shard, total)
+                   for shard in range(1, total + 1)]
+        assert merge_shards(results) == single
+    with pytest.raises(ValueError):
+        merge_shards(results[1:])
+    with pytest.raises(ValueError):
+        parse_shard('0/3')
@@ -0,0 +1,89 @@
+import json
+
+from i18n_tools.extract import ExtractionCache
+from i18n_tools.flat_index import FlatIndex
+from i18n_tools.i18n_config import I18nConfig
+from i18n_tools.registry import ComponentLocator, parse_registry_source
+from i18n_tools.slices import MANIFEST_NAME, build_slices
+
+CONFIG = I18nConfig(default_ns='translation', fallback_ns=('common',))
+
+REGISTRY = """
+const constructionCalculators: Calculator[] = [
+  { slug: 'drywall', category: 'construction', componentName: 'Drywall', nameKey: 'calculators.{{slug}}.name' },
+];
+"""
+
+COMPONENT = """
+const { t } = useTranslation('calc/construction');
+t('drywall.title');
+t('drywall.sheets', { count: sheets });
+t(`drywall.types.${type}`);
+t('units.m2');
+"""
+
+
+def test_slice_holds_only_the_reachable_keys(tmp_path, write_locale_tree):
+    locales = tmp_path / 'locales'
+    write_locale_tree(locales / 'en' / 'calc' / 'construction.json', {
+        'drywall': {'title': 'Drywall', 'sheets_one': '{{count}} sheet', 'sheets_other': '{{count}} sheets',
+                    'types': {'standard': 'Standard', 'moisture': 'Moisture resistant'}, 'unused': 'x'},
+        'concrete': {'title': 'Concrete'}})
+    write_locale_tree(locales / 'en' / 'common.json', {'units': {'m2': 'm²', 'ft2': 'ft²'}})
+    write_locale_tree(locales / 'en' / 'translation.json', {'calculators': {'drywall': {'name': 'Drywall'}}})
+    write_locale_tree(locales / 'ar' / 'calc' / 'construction.json', {'drywall': {'title': 'الجبس'}})
+    components = tmp_path / 'components'
+    (components / 'construction').mkdir(parents=True)
+    (components / 'construction' / 'Drywall.tsx').write_text(COMPONENT)
+
+    out = tmp_path / 'slices'
+    reports = build_slices(out, FlatIndex(locales, CONFIG), None, ExtractionCache(),
+                           parse_registry_source(REGISTRY, 'construction.ts'),
+                           ComponentLocator(components, tmp_path / 'none.ts'), workers=1)
+
+    en = json.loads((out / 'en' / 'drywall.json').read_text(encoding='utf-8'))
+    assert en == {
+        'calc/construction': {'drywall': {'sheets_one': '{{count}} sheet', 'sheets_other': '{{count}} sheets',
+                                          'title': 'Drywall',
+                                          'types': {'moisture': 'Moisture resistant', 'standard': 'Standard'}}},
+        'common': {'units': {'m2': 'm²'}},
+        'translation': {'calculators': {'drywall': {'name': 'Drywall'}}}}
+    assert json.loads((out / 'ar' / 'drywall.json').read_text(encoding='utf-8')) == {
+        'calc/construction': {'drywall': {'title': 'الجبس'}}}
+
+    report = reports[0]
+    assert report.keys == {'ar': 1, 'en': 7} and report.unresolved == {'ar': 4, 'en': 0}
+    assert report.raw['en'] < report.namespace_raw['en'] and report.gzip['en'] > 0
+    manifest = json.loads((out / MANIFEST_NAME).read_text(encoding='utf-8'))
+    assert manifest['slices']['drywall']['file'] == 'drywall.json'
+    assert manifest['slices']['drywall']['namespaces'] == ['calc/construction', 'common', 'translation']
+
+
+RATES_REGISTRY = "[{ slug: 'vat-calculator', category: 'business', componentName: 'Vat' }]"
+
+RATES_COMPONENT = """
+const { t } = useTranslation('calc/business');
+const rates = [{ label: 'vat.rates.standard' }, { label: 'vat.rates.zero' }];
+t('vat.title');
+rates.map(rate => t(rate.label));
+"""
+
+
+def test_slice_keeps_quoted_keys_and_page_content_like_prune(tmp_path, write_locale_tree):
+    locales = tmp_path / 'locales'
+    write_locale_tree(locales / 'en' / 'calc' / 'business.json', {
+        'vat': {'title': 'VAT', 'rates': {'standard': 'Standard', 'zero': 'Zero', 'reduced': 'Reduced'}},
+        'vat_calculator': {'faqs': [{'question': 'Q', 'answer': 'A'}]}, 'tip': {'title': 'Tip'}})
+    components = tmp_path / 'components'
+    (components / 'business').mkdir(parents=True)
+    (components / 'business' / 'Vat.tsx').write_text(RATES_COMPONENT)
+
+    out = tmp_path / 'slices'
+    reports = build_slices(out, FlatIndex(locales, CONFIG), ['en'], ExtractionCache(),
+                           parse_registry_source(RATES_REGISTRY, 'business.ts'),
+                           ComponentLocator(components, tmp_path / 'none.ts'), workers=1)
+
+    assert json.loads((out / 'en' / 'vat-calculator.json').read_text(encoding='utf-8')) == {
+        'calc/business': {'vat': {'rates': {'standard': 'Standard', 'zero': 'Zero'}, 'title': 'VAT'},
+                          'vat_calculator': {'faqs': [{'answer': 'A', 'question': 'Q'}]}}}
+    assert reports[0].unresolved == {'en': 0}
@@ -0,0 +1,29 @@
+from i18n_tools.suggest import SuggestionIndex, edit_distance
+
+
+def test_edit_distance_with_limit():
+    assert edit_distance('kitten', 'sitting') == 3
+    assert edit_distance('kitten', 'sitting', limit=2) == 3
+    assert edit_distance('placeholders.minquantity', 'placeholders.quantity', limit=4) == 3
+    assert edit_distance('', 'abc') == 3
+
+
+def test_suggestions_prefer_close_keys_in_the_lookup_chain():
+    index = SuggestionIndex([
+        ('calc/construction', 'drywall.unitTooltip'),
+        ('calc/construction', 'drywall.sheets_one'),
+        ('calc/construction', 'drywall.sheets_other'),
+        ('calc/business', 'break_even.errors.price_greater_than_variable'),
+        ('calc/business', 'placeholders.quantity'),
+        ('calc/construction', 'placeholders.quantity'),
+        ('common', 'units.kg'),
+    ])
+    chain = ('calc/construction', 'translation', 'common')
+    assert [(s.namespace, s.key, s.distance) for s in index.suggest('drywall.unit_tooltip', chain)] == [
+        ('calc/construction', 'drywall.unitTooltip', 0)]
+    assert index.suggest('drywall.sheet', chain)[0].key == 'drywall.sheets'
+    assert [s.namespace for s in index.suggest('placeholders.minQuantity', chain)] == [
+        'calc/construction', 'calc/business']
+    moved = index.suggest('errors.price_greater_than_variable', chain)[0]
+    assert moved.qualified('calc/construction') == 'calc/business:break_even.errors.price_greater_than_variable'
+    assert index.suggest('completely.unrelated', chain) == []
@@ -0,0 +1,27 @@
+from i18n_tools.flat_index import FlatIndex
+from i18n_tools.i18n_config import I18nConfig
+from i18n_tools.tm import TranslationMemory
+
+
+def test_memory_reuses_human_translations_before_the_glossary(tmp_path, write_locale_tree):
+    write_locale_tree('en/calc/business.json', {'labor': 'Labor Cost', 'total': 'Total Cost', 'tip': ['{{n}} days'],
+                                                'marker': 'Overhead', 'new': 'Labor  cost'})
+    write_locale_tree('ar/calc/business.json', {'labor': 'تكلفة العمالة', 'total': 'التكلفة الكلية',
+                                                'tip': ['{{n}} أيام'], 'marker': '[AR] Overhead'})
+    write_locale_tree('en/calc/construction.json', {'total': 'Total Cost', 'labor': 'Labor Cost'})
+    write_locale_tree('ar/calc/construction.json', {'total': 'التكلفة الإجمالية', 'labor': 'تكلفة العمالة'})
+
+    index = FlatIndex(tmp_path, I18nConfig())
+    memory = TranslationMemory.from_index(index)
+    assert memory.lookup('labor cost').text == 'تكلفة العمالة'
+    assert memory.lookup('LABOR COST').count == 2
+    assert memory.lookup('Total Cost', 'calc/construction').text == 'التكلفة الإجمالية'
+    assert memory.lookup('Overhead') is None
+    assert memory.lookup('{{n}} days').text == '{{n}} أيام'
+
+    glossary = lambda text: f"<{text}>"
+    assert memory.fill('Labor Cost', glossary) == 'تكلفة العمالة'
+    assert memory.fill('Overhead', glossary) == '<Overhead>'
+    assert (memory.reused, memory.synthesized) == (1, 1)
+    fillable = memory.fillable(index)
+    assert [e['key'] for e in fillable['reused']] == ['new']
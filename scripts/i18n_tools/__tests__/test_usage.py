@@ -0,0 +1,61 @@
+from i18n_tools.extract import ExtractionCache, extract_call_sites_from_source
+from i18n_tools.flat_index import FlatIndex
+from i18n_tools.i18n_config import I18nConfig
+from i18n_tools.usage import ReverseIndex, UsageIndex
+
+CONFIG = I18nConfig(fallback_ns=('common',))
+
+
+def test_incremental_updates(tmp_path, write_locale_tree):
+    locales = tmp_path / 'locales'
+    en_file = locales / 'en' / 'calc' / 'pet.json'
+    write_locale_tree(en_file, {'dog': {'title': 'Dog', 'old': 'Old'}})
+    write_locale_tree(locales / 'en' / 'common.json', {'reset': 'Reset'})
+    component = tmp_path / 'Dog.tsx'
+    component.write_text("const { t } = useTranslation('calc/pet');\nt('dog.title'); t('dog.unit');")
+
+    usage = UsageIndex(FlatIndex(locales, CONFIG), ['en'], ExtractionCache())
+    usage.build([component])
+    assert {m[4] for m in usage.missing()} == {'dog.unit'}
+    assert usage.unused('en', 'calc/pet') == {'dog.old'}
+    assert usage.dependents('common') == {component}
+
+    write_locale_tree(en_file, {'dog': {'title': 'Dog', 'old': 'Old', 'unit': 'kg'}})
+    delta = usage.update_locale(en_file)
+    assert [m[4] for m in delta.fixed_missing] == ['dog.unit']
+
+    component.write_text("const { t } = useTranslation('calc/pet');\nt('dog.old');")
+    delta = usage.update_source(component)
+    assert sorted(k for _, _, k in delta.new_unused) == ['dog.title', 'dog.unit']
+    assert [k for _, _, k in delta.now_used] == ['dog.old']
+
+
+def test_leaf_turning_into_an_object(tmp_path, write_locale_tree):
+    locales = tmp_path / 'locales'
+    en_file = locales / 'en' / 'calc' / 'pet.json'
+    write_locale_tree(en_file, {'dog': 'Dog'})
+    component = tmp_path / 'Dog.tsx'
+    component.write_text("const { t } = useTranslation('calc/pet');\nt('dog');")
+
+    usage = UsageIndex(FlatIndex(locales, CONFIG), ['en'], ExtractionCache())
+    usage.build([component])
+    assert not usage.missing()
+
+    write_locale_tree(en_file, {'dog': {}})  # no child key changes, only what 'dog' is
+    assert [m[4] for m in usage.update_locale(en_file).new_missing] == ['dog']
+    write_locale_tree(en_file, {'dog': 'Dog'})
+    assert [m[4] for m in usage.update_locale(en_file).fixed_missing] == ['dog']
+
+
+def test_reverse_index_referencing(tmp_path):
+    a, b = tmp_path / 'A.tsx', tmp_path / 'B.tsx'
+    reverse = ReverseIndex(CONFIG)
+    reverse.add(a, extract_call_sites_from_source(
+        "const { t } = useTranslation('calc/pet');\nt('dog.title'); t('dog.count', { count });", 'A.tsx'))
+    reverse.add(b, extract_call_sites_from_source(
+        "const { t } = useTranslation('calc/pet');\nt(`cat.${kind}`);", 'B.tsx'))
+
+    assert reverse.referencing(['dog.count_few']) == {a}
+    assert reverse.referencing(['cat.tabby']) == {b}
+    assert reverse.referencing(['dog.title'], 'pages') == set()
+    assert reverse.dependents('common') == {a, b}
@@ -0,0 +1,29 @@
+from i18n_tools.validate import validate
+
+
+def test_validate_reports_every_kind(tmp_path):
+    def write(rel, text):
+        path = tmp_path / rel
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(text, encoding='utf-8')
+
+    write('en/common.json', '{"units": {"kg": "kg"}, "tips": ["a", "b"], "count": "1"}')
+    write('ar/common.json', '{"units": "وحدات", "tips": ["أ", {"b": "ب"}], "count": 1, "count": "١"}')
+    write('en/calc/pet.json', '{\n  "title": "Pet",\n  "age" "Age"\n}')
+    write('ar/calc/pet.json', '{"title": "حيوان"}')
+    write('ar/extra.json', '[]')
+
+    issues = validate(tmp_path, workers=2)
+    found = {(i.file, i.kind, i.path) for i in issues}
+    assert found == {
+        ('ar/common.json', 'shape', 'units'),
+        ('ar/common.json', 'array', 'tips'),
+        ('ar/common.json', 'shape', 'tips[1]'),
+        ('ar/common.json', 'leaf', 'count'),
+        ('ar/common.json', 'duplicate', 'count'),
+        ('en/calc/pet.json', 'syntax', ''),
+        ('en/extra.json', 'missing-file', ''),
+        ('ar/extra.json', 'root', ''),
+    }
+    syntax = next(i for i in issues if i.kind == 'syntax')
+    assert syntax.location() == 'en/calc/pet.json:3:9'
@@ -0,0 +1,255 @@
+"""
+Pre-merged namespace bundles for the build output
+
+For a split namespace, customRequest in src/i18n/config.ts fetches the
+main file and every split file, deep-merges them and hands i18next the
+result of JSON.stringify. bundle_namespace() does the same offline: the
+files are merged in the same order with js_deep_merge and serialized the
+way JSON.stringify would, object keys in JavaScript's enumeration order
+(array-index keys first, ascending) and no whitespace.
+
+js_deep_merge differs from flat_index.deep_merge where the files disagree
+on a key's type: when a split file holds an object where an earlier file
+has a string or array, deepMerge spreads the earlier value into it
+(`{...'abc'}` is {0: 'a', 1: 'b', 2: 'c'}). The bundle keeps that so it
+matches the browser byte for byte, and such keys are reported as
+conflicts so the files can be fixed.
+
+build_bundles() writes one such file per (lang, namespace), split or not,
+at its loadPath location in the build output (dist/locales after `vite
+build` has copied public/locales), plus manifest.json listing them. Each
+bundle is also written under a content-hashed name (calc/business.3f9a1c0b2d.json)
+that the manifest records as its `file`; the client reads the manifest
+once and fetches a listed namespace from that name with a single request,
+so the file can be cached for good and only changed namespaces are fetched
+again after a deploy. Hashed files no manifest entry names any more are
+removed. Split files stay in place for clients without the manifest.
+
+Given the keys to keep per (lang, namespace) (see prune.py), every other
+leaf is left out of the bundles; the source files are never touched.
+"""
+
+import gzip
+import hashlib
+import json
+import os
+import re
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+
+from .flat_index import discover_languages, files_for_namespace, load_json, namespace_files
+from .i18n_config import I18nConfig, load_config
+from .paths import BASE_DIR, LOCALES_DIR
+
+BUNDLE_DIR = BASE_DIR / 'dist' / 'locales'
+MANIFEST_NAME = 'manifest.json'
+MANIFEST_VERSION = 1
+HASH_LENGTH = 10
+
+_SURROGATE_RE = re.compile('[\ud800-\udfff]')
+_ARRAY_INDEX_RE = re.compile(r'0|[1-9][0-9]*')
+_MAX_ARRAY_INDEX = 2 ** 32 - 2
+_HASHED_RE = re.compile(r'\.[0-9a-f]{%d}\.json$' % HASH_LENGTH)
+
+
+def _is_array_index(key: str) -> bool:
+    return bool(_ARRAY_INDEX_RE.fullmatch(key)) and int(key) <= _MAX_ARRAY_INDEX
+
+
+def js_value(value: Any) -> Any:
+    """value as JSON.parse would hold it: index-like keys first and integral floats as integers"""
+    if isinstance(value, dict):
+        indices = sorted((k for k in value if _is_array_index(k)), key=int)
+        ordered = indices + [k for k in value if not _is_array_index(k)]
+        return {k: js_value(value[k]) for k in ordered}
+    if isinstance(value, list):
+        return [js_value(item) for item in value]
+    if isinstance(value, float) and value.is_integer():
+        return int(value)
+    return value
+
+
+def _spread(value: Any) -> dict:
+    """{...value} for a value that is not a plain object"""
+    if isinstance(value, str):
+        units = value.encode('utf-16-le', 'surrogatepass')
+        return {str(i // 2): units[i:i + 2].decode('utf-16-le', 'surrogatepass') for i in range(0, len(units), 2)}
+    if isinstance(value, list):
+        return {str(i): item for i, item in enumerate(value)}
+    return {}
+
+
+def js_deep_merge(target: dict, source: dict, conflicts: List[str], prefix: str = '') -> dict:
+    """deepMerge from config.ts, spreading non-object values an object is merged into"""
+    result = dict(target)
+    for key, value in source.items():
+        if isinstance(value, dict):
+            base = result.get(key)
+            if base and not isinstance(base, dict):
+                conflicts.append(f"{prefix}{key}")
+            result[key] = js_deep_merge(base if isinstance(base, dict) else _spread(base or None),
+                                        value, conflicts, f"{prefix}{key}.")
+        else:
+            result[key] = value
+    return result
+
+
+def stringify(tree: dict) -> bytes:
+    """JSON.stringify(tree) as UTF-8"""
+    text = json.dumps(js_value(tree), ensure_ascii=False, separators=(',', ':'))
+    return _SURROGATE_RE.sub(lambda m: f"\\u{ord(m.group()):04x}", text).encode('utf-8')
+
+
+def prune_tree(tree: dict, keep: Set[str], prefix: str = '') -> Tuple[dict, int]:
+    """tree without the leaves whose flat key is not in keep (and objects left empty); returns it and the count"""
+    result = {}
+    removed = 0
+    for key, value in tree.items():
+        full_key = f"{prefix}{key}"
+        if isinstance(value, dict):
+            kept, dropped = prune_tree(value, keep, f"{full_key}.")
+            removed += dropped
+            if kept:
+                result[key] = kept
+        elif full_key in keep:
+            result[key] = value
+        else:
+            removed += 1
+    return result, removed
+
+
+def gzip_size(content: bytes) -> int:
+    return len(gzip.compress(content, compresslevel=9, mtime=0))
+
+
+def content_hash(content: bytes) -> str:
+    return hashlib.sha256(content).hexdigest()[:16]
+
+
+def hashed_name(namespace: str, digest: str) -> str:
+    """calc/business -> calc/business.<hash>.json"""
+    return f"{namespace}.{digest[:HASH_LENGTH]}.json"
+
+
+def _write_atomic(path: Path, content: bytes):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+    tmp.write_bytes(content)
+    os.replace(tmp, path)
+
+
+def write_bundle_files(out_dir: Path, lang: str, namespace: str, content: bytes) -> bool:
+    """Write content at the namespace's loadPath location and under its hashed name; True if either changed"""
+    written = False
+    for name in (f"{namespace}.json", hashed_name(namespace, content_hash(content))):
+        path = out_dir / lang / name
+        if not path.exists() or path.read_bytes() != content:
+            _write_atomic(path, content)
+            written = True
+    return written
+
+
+def bundle_namespace(lang: str, namespace: str, config: I18nConfig,
+                     locales_dir: Path = LOCALES_DIR) -> Tuple[dict, List[Path], List[str]]:
+    """The merged namespace exactly as customRequest builds it, its files and the type conflicts"""
+    files = files_for_namespace(lang, namespace, config, locales_dir)
+    tree: dict = {}
+    conflicts: List[str] = []
+    for path in files:
+        tree = js_deep_merge(tree, load_json(path), conflicts)
+    return tree, files, conflicts
+
+
+@dataclass
+class Bundle:
+    lang: str
+    namespace: str
+    files: int
+    size: int
+    source_size: int
+    digest: str
+    conflicts: List[str] = field(default_factory=list)
+    removed: int = 0
+    unpruned_size: int = 0
+    written: bool = False
+
+    def to_dict(self) -> dict:
+        return {'files': self.files, 'bytes': self.size, 'hash': self.digest,
+                'file': hashed_name(self.namespace, self.digest)}
+
+
+def write_bundle(job: Tuple[str, str, I18nConfig, Path, Path, Optional[Set[str]]]) -> Bundle:
+    """Write one bundle (pruned to the keys in keep, if given) unless the file already holds it"""
+    lang, namespace, config, locales_dir, out_dir, keep = job
+    tree, files, conflicts = bundle_namespace(lang, namespace, config, locales_dir)
+    content = stringify(tree)
+    unpruned_size, removed = len(content), 0
+    if keep is not None:
+        tree, removed = prune_tree(tree, keep)
+        content = stringify(tree)
+    bundle = Bundle(lang, namespace, len(files), len(content), sum(p.stat().st_size for p in files),
+                    content_hash(content), conflicts, removed, unpruned_size)
+    bundle.written = write_bundle_files(out_dir, lang, namespace, content)
+    return bundle
+
+
+def build_bundles(out_dir: Path = BUNDLE_DIR, languages: Optional[Iterable[str]] = None,
+                  locales_dir: Path = LOCALES_DIR, config: Optional[I18nConfig] = None,
+                  workers: Optional[int] = None,
+                  keep: Optional[Dict[Tuple[str, str], Set[str]]] = None) -> List[Bundle]:
+    """Write every (lang, namespace) bundle and the manifest; returns the bundles
+
+    With keep, each bundle holds only the flat keys listed for its (lang, namespace).
+    """
+    config = config or load_config()
+    jobs = [(lang, namespace, config, locales_dir, out_dir,
+             None if keep is None else keep.get((lang, namespace), set()))
+            for lang in (languages or discover_languages(locales_dir))
+            for namespace in namespace_files(lang, config, locales_dir)]
+    workers = min(workers or os.cpu_count() or 1, len(jobs)) if jobs else 1
+    if workers <= 1:
+        bundles = [write_bundle(job) for job in jobs]
+    else:
+        with ProcessPoolExecutor(workers) as pool:
+            bundles = list(pool.map(write_bundle, jobs, chunksize=8))
+    write_manifest(out_dir, bundles, config, pruned=keep is not None)
+    return bundles
+
+
+def write_manifest(out_dir: Path, bundles: List[Bundle], config: I18nConfig, pruned: bool = False):
+    manifest = {'version': MANIFEST_VERSION, 'loadPath': config.load_path, 'pruned': pruned, 'bundles': {}}
+    for bundle in bundles:
+        manifest['bundles'].setdefault(bundle.lang, {})[bundle.namespace] = bundle.to_dict()
+    save_manifest(out_dir, manifest)
+
+
+def save_manifest(out_dir: Path, manifest: dict):
+    """Write the manifest and remove the hashed bundles it no longer names"""
+    out_dir.mkdir(parents=True, exist_ok=True)
+    (out_dir / MANIFEST_NAME).write_text(
+        json.dumps(manifest, ensure_ascii=False, indent=2) + '\n', encoding='utf-8')
+    remove_stale_hashed(out_dir, manifest)
+
+
+def remove_stale_hashed(out_dir: Path, manifest: dict) -> List[Path]:
+    """Delete hashed bundles of the manifest's languages that no entry names"""
+    removed = []
+    for lang, bundles in manifest['bundles'].items():
+        named = {out_dir / lang / entry['file'] for entry in bundles.values() if 'file' in entry}
+        for path in (out_dir / lang).rglob('*.json'):
+            if _HASHED_RE.search(path.name) and path not in named:
+                path.unlink()
+                removed.append(path)
+    return removed
+
+
+def read_manifest(out_dir: Path = BUNDLE_DIR) -> Optional[dict]:
+    """The manifest of a bundle directory, or None if there is none (or an older version)"""
+    path = out_dir / MANIFEST_NAME
+    if not path.exists():
+        return None
+    manifest = json.loads(path.read_text(encoding='utf-8'))
+    return manifest if manifest.get('version') == MANIFEST_VERSION else None
+
@@ -0,0 +1,1158 @@
+"""Command line interface: python3 scripts/translation-tools.py <command> [options]"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+import time
+from pathlib import Path
+from typing import List, Optional
+from xml.etree import ElementTree
+
+from .extract import ExtractionCache, find_source_files
+from .flat_index import FlatIndex
+from .paths import relative_to_base
+from .resolver import NamespaceResolver, dynamic_report, resolution_report
+
+
+def print_banner(title: str):
+    print("=" * 80)
+    print(title)
+    print("=" * 80)
+
+
+def emit_json(data, path: Optional[str]):
+    """Write data as JSON to path, or to stdout when path is '-'"""
+    text = json.dumps(data, ensure_ascii=False, indent=2)
+    if path in (None, '-'):
+        print(text)
+    else:
+        with open(path, 'w', encoding='utf-8') as f:
+            f.write(text + '\n')
+
+
+def collect_sites(cache: Optional[ExtractionCache] = None):
+    cache = cache or ExtractionCache()
+    sites = []
+    for path in find_source_files():
+        sites.extend(cache.get(path))
+    return sites
+
+
+def cmd_resolve(args) -> int:
+    index = FlatIndex()
+    resolver = NamespaceResolver(index)
+    languages = args.lang or index.languages()
+    sites = collect_sites()
+    if args.file:
+        sites = [s for s in sites if any(s.file.endswith(f) for f in args.file)]
+    report = resolution_report(resolver, sites, languages, args.min_probes)
+
+    if args.json:
+        emit_json(report, args.json)
+        return 0
+
+    print_banner("NAMESPACE RESOLUTION (i18next lookup order)")
+    static = sum(1 for s in sites if not s.dynamic)
+    print(f"Static call sites: {static}")
+    for lang, data in report.items():
+        print()
+        print(f"[{lang}]")
+        print("  Satisfied by namespace:")
+        for namespace, count in sorted(data['satisfied_by'].items(), key=lambda x: -x[1]):
+            print(f"    {namespace}: {count}")
+        histogram = ', '.join(f"{p}: {n}" for p, n in data['probe_histogram'].items())
+        print(f"  Namespaces probed -> call sites: {histogram}")
+        print(f"  Resolved via fallbackNS: {len(data['via_fallback_namespace'])}")
+        print(f"  Resolved via fallbackLng: {len(data['via_fallback_language'])}")
+        print(f"  Shadowed duplicates: {len(data['shadowed'])}")
+        print(f"  Subtree without returnObjects: {len(data['objects_without_return_objects'])}")
+        print(f"  Missing: {len(data['missing'])}")
+        for entry in data['deep_probes'][:args.limit]:
+            print(f"    {entry['probes']} probes  {entry['key']} -> {entry['namespace']}  ({entry['location']})")
+        for entry in data['missing'][:args.limit]:
+            print(f"    missing  {entry['key']} -> write to {entry['target']}  ({entry['location']})")
+    return 0
+
+
+def cmd_dynamic(args) -> int:
+    index = FlatIndex()
+    resolver = NamespaceResolver(index)
+    sites = collect_sites()
+    if args.file:
+        sites = [s for s in sites if any(s.file.endswith(f) for f in args.file)]
+    entries = dynamic_report(resolver, sites, args.lang)
+
+    if args.json:
+        emit_json(entries, args.json)
+        return 0
+
+    print_banner(f"DYNAMIC KEYS ({args.lang})")
+    unmatched = [e for e in entries if not e['count']]
+    print(f"Template call sites: {len(entries)}")
+    print(f"Concrete keys reachable: {sum(e['count'] for e in entries)}")
+    print(f"Templates matching nothing: {len(unmatched)}")
+    print()
+    for entry in entries:
+        print(f"{entry['template']}  [{entry['pattern']}]  ({entry['location']})")
+        if not entry['count']:
+            print(f"    no keys match in {', '.join(entry['order'])}")
+        for namespace, keys in entry['reachable'].items():
+            shown = ', '.join(keys[:args.limit])
+            more = f" ... (+{len(keys) - args.limit})" if len(keys) > args.limit else ''
+            print(f"    {namespace}: {shown}{more}")
+    return 0
+
+
+def cmd_watch(args) -> int:
+    from .watch import TranslationWatch
+
+    started = time.perf_counter()
+    watch = TranslationWatch(languages=args.lang)
+    print(f"Initial index built in {(time.perf_counter() - started) * 1000:.0f} ms")
+    watch.run(polling=args.poll, quiet=args.debounce / 1000)
+    return 0
+
+
+def cmd_check(args) -> int:
+    if args.since:
+        from .incremental import check_since
+
+        try:
+            report = check_since(args.since, args.lang)
+        except subprocess.CalledProcessError as e:
+            print(f"Error: git {' '.join(e.cmd[1:])} failed: {(e.stderr or '').strip()}", file=sys.stderr)
+            return 2
+        if args.json:
+            emit_json(report.to_dict(), args.json)
+        else:
+            print_banner(f"TRANSLATION CHECK SINCE {args.since}")
+            print(f"Changed components: {len(report.changed_sources)}")
+            print(f"Changed namespaces: {len(report.key_changes)}")
+            print(f"Components evaluated: {len(report.evaluated)}")
+            print(f"Namespaces loaded: {report.namespaces_loaded}")
+            print(f"Files re-extracted: {report.extracted}")
+            print(f"Elapsed: {report.elapsed_ms:.0f} ms")
+            print()
+            for entry in report.missing:
+                print(f"  missing [{entry['lang']}] {entry['key']}  ({entry['location']})")
+            for entry in report.unused:
+                print(f"  unused  [{entry['lang']}] {entry['namespace']}:{entry['key']}")
+            if not report.missing and not report.unused:
+                print("  ✓ No new missing or unused keys")
+        return 1 if args.fail_on_missing and report.missing else 0
+
+    from .extract import CACHE_FILE
+    from .usage import UsageIndex, check_report
+
+    started = time.perf_counter()
+    index = FlatIndex()
+    cache = ExtractionCache(CACHE_FILE)
+    if args.shard:
+        from .shard import parse_shard, run_shard
+
+        try:
+            shard, total = parse_shard(args.shard)
+        except ValueError as e:
+            print(f"Error: {e}", file=sys.stderr)
+            return 2
+        result = run_shard(index, find_source_files(), shard, total, args.lang, cache)
+        cache.save()
+        emit_json(result, args.json)
+        return 1 if args.fail_on_missing and result['missing'] else 0
+
+    usage = UsageIndex(index, args.lang, cache).build(find_source_files())
+    cache.save()
+    unused = {f"{lang}:{ns}": usage.unused(lang, ns)
+              for lang in usage.languages for ns in index.namespaces(lang)}
+    report = check_report(len(usage.files()), usage.missing(), unused)
+    return print_check_report(report, args, (time.perf_counter() - started) * 1000)
+
+
+def print_check_report(report: dict, args, elapsed: Optional[float] = None) -> int:
+    if args.json:
+        emit_json(report, args.json)
+    else:
+        print_banner("TRANSLATION CHECK")
+        print(f"Components: {report['components']}")
+        print(f"Missing: {len(report['missing'])}")
+        print(f"Unused: {sum(len(keys) for keys in report['unused'].values())}")
+        if elapsed is not None:
+            print(f"Elapsed: {elapsed:.0f} ms")
+        print()
+        for entry in report['missing'][:args.limit]:
+            print(f"  missing [{entry['lang']}] {entry['key']}  ({entry['location']})")
+    return 1 if args.fail_on_missing and report['missing'] else 0
+
+
+def cmd_merge_shards(args) -> int:
+    from .shard import load_shard_results, merge_shards
+
+    try:
+        report = merge_shards(load_shard_results(args.results))
+    except ValueError as e:
+        print(f"Error: {e}", file=sys.stderr)
+        return 2
+    return print_check_report(report, args)
+
+
+def cmd_coverage(args) -> int:
+    from .coverage import coverage_report, junit_xml
+    from .extract import CACHE_FILE
+
+    started = time.perf_counter()
+    cache = ExtractionCache(CACHE_FILE)
+    report = coverage_report(languages=args.lang, cache=cache, workers=args.workers)
+    cache.save()
+    elapsed = (time.perf_counter() - started) * 1000
+    if args.junit:
+        with open(args.junit, 'w', encoding='utf-8') as f:
+            f.write(junit_xml(report))
+    if args.json:
+        emit_json(report, args.json)
+        if args.json == '-':
+            return 0
+
+    summary = report['summary']
+    print_banner("TRANSLATION COVERAGE")
+    print(f"Total Calculators: {summary['calculators']}")
+    print(f"Components Found: {summary['components_found']}")
+    print(f"Total Translation Keys: {summary['total_keys']}")
+    for lang, value in summary['average_coverage'].items():
+        print(f"Average {lang.upper()} Coverage: {value}%")
+    print(f"Fully Translated: {summary['fully_translated']}")
+    print(f"Partially Translated: {summary['partially_translated']}")
+    print(f"Missing All Translations: {summary['missing_all']}")
+    print(f"No Component Found: {len(summary['no_component'])}")
+    print(f"Elapsed: {elapsed:.0f} ms")
+
+    worst = sorted((c for c in report['calculators'] if any(c['missing'].values())),
+                   key=lambda c: (-sum(len(m) for m in c['missing'].values()), c['slug']))
+    print()
+    print_banner(f"TOP {args.limit} CALCULATORS WITH MOST MISSING TRANSLATIONS")
+    for i, calc in enumerate(worst[:args.limit], 1):
+        coverage = ', '.join(f"{lang.upper()} {calc['coverage'][lang]}% ({len(calc['missing'][lang])} missing)"
+                             for lang in report['languages'])
+        print(f"{i}. {calc['slug']} ({calc['keys']} keys): {coverage}")
+
+    incomplete = [n for n in report['namespaces'] if any(p < n['keys'] for p in n['present'].values())]
+    print()
+    print_banner("INCOMPLETE NAMESPACES")
+    for ns in incomplete:
+        coverage = ', '.join(f"{lang.upper()} {value}%" for lang, value in ns['coverage'].items())
+        print(f"  {ns['namespace']} ({ns['keys']} keys): {coverage}")
+    if not incomplete:
+        print("  ✓ Every namespace has the same keys in all languages")
+    return 0
+
+
+def cmd_quality(args) -> int:
+    from .quality import KINDS, scan, summarize
+
+    started = time.perf_counter()
+    kinds = set(args.kind or KINDS)
+    out = None
+    if args.jsonl:
+        out = sys.stdout if args.jsonl == '-' else open(args.jsonl, 'w', encoding='utf-8')
+    results = []
+    try:
+        if not out or out is not sys.stdout:
+            print_banner("TRANSLATION QUALITY SCAN")
+        for result in scan(languages=args.lang):
+            result.findings = [f for f in result.findings if f.kind in kinds]
+            results.append(result)
+            if out:
+                out.write(json.dumps(result.to_dict(), ensure_ascii=False) + '\n')
+                if out is sys.stdout:
+                    continue
+            if result.findings:
+                print(f"[{result.lang}] {result.namespace}: {len(result.findings)} of {result.values} values")
+                for finding in result.findings[:args.limit]:
+                    print(f"    {finding.kind:<9} {finding.key} = {finding.value!r}")
+                if len(result.findings) > args.limit:
+                    print(f"    ... (+{len(result.findings) - args.limit} more)")
+    finally:
+        if out and out is not sys.stdout:
+            out.close()
+
+    total = sum(len(r.findings) for r in results)
+    if not out or out is not sys.stdout:
+        print()
+        print(f"Values scanned: {sum(r.values for r in results)}")
+        for lang, counts in summarize(results).items():
+            print(f"  {lang}: " + ', '.join(f"{kind} {counts[kind]}" for kind in KINDS if kind in kinds))
+        print(f"Elapsed: {(time.perf_counter() - started) * 1000:.0f} ms")
+        if not total:
+            print("✓ No quality issues found")
+    return 1 if args.fail_on_findings and total else 0
+
+
+def cmd_placeholders(args) -> int:
+    from .placeholders import check, namespaces_for_files
+
+    started = time.perf_counter()
+    index = FlatIndex()
+    namespaces = namespaces_for_files(index, args.file) if args.file else None
+    mismatches = check(index, args.lang, namespaces)
+    if args.json:
+        emit_json([m.to_dict() for m in mismatches], args.json)
+    else:
+        print_banner("INTERPOLATION PLACEHOLDER PARITY")
+        for m in mismatches[:args.limit]:
+            detail = ', '.join([f"missing {{{{{n}}}}}" for n in m.missing] + [f"extra {{{{{n}}}}}" for n in m.extra])
+            location = f"{m.file}:{m.line}" if m.line else m.file
+            print(f"  [{m.lang}] {m.namespace}:{m.key}  {detail}  ({location})")
+        if len(mismatches) > args.limit:
+            print(f"  ... (+{len(mismatches) - args.limit} more)")
+        print(f"Mismatches: {len(mismatches)}")
+        print(f"Elapsed: {(time.perf_counter() - started) * 1000:.0f} ms")
+        if not mismatches:
+            print("✓ Placeholders match in every language")
+    return 1 if args.fail_on_mismatch and mismatches else 0
+
+
+def cmd_suggest(args) -> int:
+    from .resolver import RESOLVED, lookup_order
+    from .suggest import SuggestionIndex
+
+    index = FlatIndex()
+    config = index.config
+    started = time.perf_counter()
+    suggestions = SuggestionIndex.from_index(index, args.lang)
+    built = (time.perf_counter() - started) * 1000
+
+    queries: dict = {}
+    if args.key:
+        for key in args.key:
+            queries.setdefault((key, (config.default_ns, *config.fallback_ns)), [])
+    else:
+        resolver = NamespaceResolver(index)
+        for site in collect_sites():
+            if site.dynamic or resolver.resolve(site, args.lang, strict=True).status == RESOLVED:
+                continue
+            key, order = lookup_order(site, config)
+            queries.setdefault((key, order), []).append(site.location)
+
+    started = time.perf_counter()
+    results = [(key, order, locations, suggestions.suggest(key, order, args.top))
+               for (key, order), locations in queries.items()]
+    per_query = (time.perf_counter() - started) * 1000 / max(1, len(results))
+
+    if args.json:
+        emit_json([{'key': key, 'namespaces': list(order), 'locations': locations,
+                    'suggestions': [{'namespace': s.namespace, 'key': s.key, 'distance': s.distance,
+                                     'replacement': s.qualified(order[0])} for s in found]}
+                   for key, order, locations, found in results], args.json)
+        return 0
+    print_banner(f"NEAREST EXISTING KEYS ({args.lang})")
+    shown = 0
+    for key, order, locations, found in results:
+        if not found or shown >= args.limit:
+            continue
+        shown += 1
+        where = f"  ({locations[0]}{f' +{len(locations) - 1}' if len(locations) > 1 else ''})" if locations else ''
+        print(f"  {order[0]}:{key}{where}")
+        for suggestion in found:
+            print(f"      -> {suggestion.qualified(order[0])}  (distance {suggestion.distance})")
+    with_match = sum(1 for *_, found in results if found)
+    print(f"Keys indexed: {len(suggestions)} in {built:.0f} ms")
+    print(f"Missing keys with a close match: {with_match} of {len(results)}")
+    print(f"Average lookup: {per_query * 1000:.0f} µs")
+    return 0
+
+
+def cmd_tm(args) -> int:
+    from .tm import TranslationMemory
+
+    started = time.perf_counter()
+    index = FlatIndex()
+    memory = TranslationMemory.from_index(index, target_lang=args.lang)
+    built = (time.perf_counter() - started) * 1000
+    if args.lookup:
+        for text in args.lookup:
+            match = memory.lookup(text)
+            print(f"{text} -> {match.text} ({match.count}/{match.total}, {', '.join(match.namespaces)})"
+                  if match else f"{text} -> (no match)")
+        return 0
+    fillable = memory.fillable(index, target_lang=args.lang)
+    if args.json:
+        emit_json(fillable, args.json)
+        return 0
+    print_banner(f"TRANSLATION MEMORY (en -> {args.lang})")
+    print(f"Sources: {len(memory)} distinct, from {memory.pairs()} pairs in {built:.0f} ms")
+    print(f"Sources with more than one rendering: {len(memory.ambiguous())}")
+    print()
+    reused, synthesized = fillable['reused'], fillable['synthesized']
+    for entry in reused[:args.limit]:
+        print(f"  {entry['namespace']}:{entry['key']}  {entry['source']!r} -> {entry['target']!r}")
+    if len(reused) > args.limit:
+        print(f"  ... (+{len(reused) - args.limit} more)")
+    print(f"Missing {args.lang} values: {len(reused) + len(synthesized)}")
+    print(f"  reusable from memory: {len(reused)}")
+    print(f"  need a new translation: {len(synthesized)}")
+    return 0
+
+
+def cmd_fuzzy(args) -> int:
+    from .fuzzy import FuzzyMemory, review_queue
+    from .tm import TranslationMemory
+
+    started = time.perf_counter()
+    index = FlatIndex()
+    fuzzy = FuzzyMemory(TranslationMemory.from_index(index, target_lang=args.lang))
+    built = (time.perf_counter() - started) * 1000
+    if args.lookup:
+        for text in args.lookup:
+            print(text)
+            matches = fuzzy.neighbours(text, args.k, args.threshold)
+            for match in matches:
+                print(f"  {match.similarity:.2f}  {match.source!r} -> {match.target!r}")
+            if not matches:
+                print("  (no similar source)")
+        return 0
+    queue = review_queue(fuzzy, index, target_lang=args.lang, k=args.k)
+    if args.json:
+        emit_json(queue, args.json)
+        return 0
+    print_banner(f"FUZZY TRANSLATION MEMORY (en -> {args.lang})")
+    print(f"Sources: {len(fuzzy.sources)} indexed in {built:.0f} ms")
+    print()
+    for entry in queue[:args.limit]:
+        print(f"  {entry['namespace']}:{entry['key']}  {entry['source']!r}")
+        for neighbour in entry['neighbours']:
+            print(f"      {neighbour['similarity']:.2f}  {neighbour['source']!r} -> {neighbour['target']!r}")
+    if len(queue) > args.limit:
+        print(f"  ... (+{len(queue) - args.limit} more)")
+    print(f"Missing {args.lang} values with a similar translated source: {len(queue)}")
+    print("Nothing is written: adapt the neighbours by hand or export the queue with --json")
+    return 0
+
+
+def cmd_mt(args) -> int:
+    from .mt import URL_ENV, VERSION_ENV, HttpProvider, TranslationError, Translator
+    from .tm import TranslationMemory
+
+    url = args.url or os.environ.get(URL_ENV)
+    if not url:
+        print(f"Error: no provider; pass --url or set {URL_ENV}", file=sys.stderr)
+        return 2
+    try:
+        provider = HttpProvider(url, args.version or os.environ.get(VERSION_ENV, '1'),
+                                max_batch=args.batch, workers=args.workers)
+    except ValueError as e:
+        print(f"Error: {e}", file=sys.stderr)
+        return 2
+    index = FlatIndex()
+    memory = TranslationMemory.from_index(index, target_lang=args.lang)
+    pending = [entry['source'] for entry in memory.fillable(index, target_lang=args.lang)['synthesized']]
+    translator = Translator(provider)
+    started = time.perf_counter()
+    try:
+        translations = translator.translate_many(pending, args.lang)
+    except TranslationError as e:
+        print(f"Error: {e}", file=sys.stderr)
+        return 1
+    finally:
+        translator.close()
+    if args.json:
+        emit_json(translations, args.json)
+        return 0
+    print_banner(f"MACHINE TRANSLATION (en -> {args.lang})")
+    for source, text in list(translations.items())[:args.limit]:
+        print(f"  {source!r} -> {text!r}")
+    if len(translations) > args.limit:
+        print(f"  ... (+{len(translations) - args.limit} more)")
+    print(f"Missing values the translation memory cannot fill: {len(pending)} ({len(translations)} distinct)")
+    print(f"✓ {translator.summary()}")
+    print(f"Requests sent: {provider.requests}")
+    print(f"Elapsed: {(time.perf_counter() - started) * 1000:.0f} ms")
+    print(f"Cache: {relative_to_base(translator.cache.path)} ({len(translator.cache)} entries)")
+    return 0
+
+
+def cmd_mt_server(args) -> int:
+    from .mt_server import StandInServer
+
+    server = StandInServer(args.port, args.host, verbose=True)
+    print(f"Stand-in MT server at {server.url} (Ctrl+C to stop)")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+    print(f"Requests: {server.requests}, texts: {server.texts}, connections: {server.connections}")
+    return 0
+
+
+def cmd_validate(args) -> int:
+    from .validate import validate
+
+    started = time.perf_counter()
+    issues = validate(languages=args.lang, workers=args.workers)
+    if args.json:
+        emit_json([issue.to_dict() for issue in issues], args.json)
+        return 1 if issues else 0
+    print_banner("LOCALE FILE STRUCTURE")
+    for issue in issues[:args.limit]:
+        print(f"  {issue.location()}  [{issue.kind}] {issue.message}")
+    if len(issues) > args.limit:
+        print(f"  ... (+{len(issues) - args.limit} more)")
+    print(f"Issues: {len(issues)}")
+    print(f"Elapsed: {(time.perf_counter() - started) * 1000:.0f} ms")
+    if not issues:
+        print("✓ Every locale file parses, has string leaves and matches the English shape")
+    return 1 if issues else 0
+
+
+def cmd_export(args) -> int:
+    from .review import SELECTIONS, format_for, select_units, write_csv, write_xliff
+
+    selections = args.select or ['missing', 'placeholder']
+    unknown = sorted(set(selections) - set(SELECTIONS))
+    if unknown:
+        print(f"Error: unknown selection {', '.join(unknown)} (choose from {', '.join(SELECTIONS)})",
+              file=sys.stderr)
+        return 2
+    fmt = args.format or format_for(args.output)
+    try:
+        units = select_units(args.lang, selections, args.ref, namespaces=args.namespace)
+        out = sys.stdout if args.output == '-' else open(args.output, 'w', encoding='utf-8', newline='')
+        try:
+            counts = write_csv(units, out) if fmt == 'csv' else write_xliff(units, out, args.lang)
+        finally:
+            if out is not sys.stdout:
+                out.close()
+    except (OSError, ValueError, subprocess.CalledProcessError) as e:
+        print(f"Error: {e}", file=sys.stderr)
+        return 2
+    if args.output != '-':
+        print(f"✓ Exported {sum(counts.values())} {args.lang} values to {args.output} ({fmt}): "
+              + ', '.join(f"{reason} {count}" for reason, count in sorted(counts.items())))
+    return 0
+
+
+def cmd_import(args) -> int:
+    from .overlay import LocaleWriter
+    from .review import ReviewImporter, format_for, read_csv, read_xliff
+
+    fmt = args.format or format_for(args.file)
+    writer = LocaleWriter(dry_run=args.dry_run)
+    try:
+        importer = ReviewImporter(args.lang, writer)
+        # spreadsheet applications save CSV with a byte order mark
+        f = open(args.file, 'r', encoding='utf-8-sig', newline='') if fmt == 'csv' else open(args.file, 'rb')
+        with f:
+            units = read_csv(f) if fmt == 'csv' else read_xliff(f)
+            print_banner(f"IMPORT REVIEWED {args.lang.upper()} TRANSLATIONS" + (" (dry run)" if args.dry_run else ""))
+            applied = rejected = 0
+            for result in importer.run(units):
+                if result.errors:
+                    rejected += 1
+                    print(f"  ✗ {result.namespace}: {len(result.errors)} problems, nothing written")
+                    for error in result.errors[:args.limit]:
+                        print(f"      {error}")
+                elif result.applied:
+                    applied += result.applied
+                    print(f"  ✓ {result.namespace}: {result.applied} of {result.units} values")
+    except (OSError, ValueError, ElementTree.ParseError) as e:
+        print(f"Error: {e}", file=sys.stderr)
+        return 2
+    print(f"Applied: {applied} values; namespaces rejected: {rejected}")
+    writer.report()
+    return 1 if rejected else 0
+
+
+def cmd_provenance(args) -> int:
+    from .provenance import STALE, UNKNOWN, ProvenanceIndex
+
+    index = FlatIndex()
+    provenance = ProvenanceIndex()
+    if args.prune:
+        dropped = provenance.prune(index)
+        provenance.save()
+        print(f"✓ Dropped {dropped} entries whose value changed or was removed ({len(provenance)} kept)")
+        return 0
+    languages = args.lang or index.languages()
+    if args.key:
+        namespace, _, key = args.key.rpartition(':')
+        if not namespace:
+            print("Error: --key must be namespace:key", file=sys.stderr)
+            return 2
+        for lang in languages:
+            value = index.lookup(lang, namespace, key)
+            if isinstance(value, str):
+                print(f"  {lang}  {provenance.status(lang, namespace, key, value)}  {value!r}")
+            else:
+                print(f"  {lang}  (no string value)")
+        return 0
+
+    started = time.perf_counter()
+    counts = {}
+    listed = []
+    for lang, namespace, key, value, status in provenance.values(index, languages):
+        per_lang = counts.setdefault(lang, {})
+        per_lang[status] = per_lang.get(status, 0) + 1
+        if args.origin and any(status == o or status.startswith(o + ':') for o in args.origin):
+            listed.append({'lang': lang, 'namespace': namespace, 'key': key, 'origin': status, 'value': value})
+    if args.json:
+        emit_json({'counts': counts, 'values': listed}, args.json)
+        return 0
+    print_banner("TRANSLATION PROVENANCE")
+    for lang, per_lang in counts.items():
+        total = sum(per_lang.values())
+        print(f"[{lang}] {total} values")
+        for status, count in sorted(per_lang.items(), key=lambda item: (item[0] in (UNKNOWN, STALE), -item[1])):
+            print(f"  {status}: {count}")
+    for entry in listed[:args.limit]:
+        print(f"  {entry['lang']}  {entry['namespace']}:{entry['key']}  [{entry['origin']}] {entry['value']!r}")
+    if len(listed) > args.limit:
+        print(f"  ... (+{len(listed) - args.limit} more)")
+    print(f"Recorded: {len(provenance)} entries in {relative_to_base(provenance.path)}")
+    print(f"Elapsed: {(time.perf_counter() - started) * 1000:.0f} ms")
+    return 0
+
+
+def cmd_locales(args) -> int:
+    from .locales import language_set, process_locales, scaffold
+    from .overlay import LocaleWriter
+
+    languages = language_set()
+    if args.scaffold:
+        writer = LocaleWriter(dry_run=args.dry_run)
+        print_banner(f"SCAFFOLD {args.scaffold.upper()}" + (" (dry run)" if args.dry_run else ""))
+        try:
+            created = scaffold(args.scaffold, writer)
+        except ValueError as e:
+            print(f"Error: {e}", file=sys.stderr)
+            return 2
+        print(f"✓ {len(created)} files {'would be ' if args.dry_run else ''}created under "
+              f"public/locales/{args.scaffold}/")
+        if args.scaffold not in languages.configured:
+            print(f"⚠ '{args.scaffold}' is not in supportedLngs in src/i18n/config.ts")
+        writer.report()
+        return 0
+
+    started = time.perf_counter()
+    summaries = process_locales(args.lang or languages.targets, workers=args.workers)
+    elapsed = time.perf_counter() - started
+    if args.json:
+        emit_json({'configured': list(languages.configured), 'present': list(languages.present),
+                   'active': list(languages.active),
+                   'locales': [summary.to_dict() for summary in summaries]}, args.json)
+        return 0
+    print_banner("LOCALES")
+    print(f"supportedLngs: {', '.join(languages.configured)}")
+    print(f"public/locales: {', '.join(languages.present)}")
+    for lang in languages.unscaffolded:
+        print(f"⚠ {lang} is configured but has no files (scaffold: translation-tools.py locales --scaffold {lang})")
+    for lang in languages.unconfigured:
+        print(f"⚠ {lang} has files but is not in supportedLngs")
+    for lang in languages.inactive:
+        print(f"⚠ {lang} has no values yet: check and coverage leave it out unless given --lang {lang}")
+    print()
+    for summary in summaries:
+        quality = ', '.join(f"{kind} {count}" for kind, count in summary.quality.items() if count) or 'clean'
+        print(f"[{summary.lang}] {summary.files}/{summary.source_files} files, "
+              f"{summary.values}/{summary.source_values} values ({summary.coverage}%), "
+              f"placeholder mismatches {summary.placeholder_mismatches}, quality: {quality} "
+              f"({summary.seconds * 1000:.0f} ms)")
+    print(f"Elapsed: {elapsed * 1000:.0f} ms for {len(summaries)} locales")
+    return 0
+
+
+def cmd_bundle(args) -> int:
+    from .bundle import BUNDLE_DIR, MANIFEST_NAME, build_bundles
+
+    out_dir = Path(args.out) if args.out else BUNDLE_DIR
+    started = time.perf_counter()
+    bundles = build_bundles(out_dir, args.lang, workers=args.workers)
+    elapsed = time.perf_counter() - started
+    if args.json:
+        emit_json([dict(bundle.to_dict(), lang=bundle.lang, namespace=bundle.namespace,
+                        source_bytes=bundle.source_size, conflicts=bundle.conflicts, written=bundle.written)
+                   for bundle in bundles], args.json)
+        return 0
+    print_banner("NAMESPACE BUNDLES")
+    for lang in sorted({bundle.lang for bundle in bundles}):
+        mine = [bundle for bundle in bundles if bundle.lang == lang]
+        merged = [bundle for bundle in mine if bundle.files > 1]
+        print(f"[{lang}] {len(mine)} namespaces ({len(merged)} merged from split files), "
+              f"{sum(b.size for b in mine):,} bytes from {sum(b.source_size for b in mine):,}, "
+              f"{sum(b.files - 1 for b in merged)} requests saved per full load")
+    for bundle in bundles:
+        for key in bundle.conflicts:
+            print(f"⚠ [{bundle.lang}] {bundle.namespace}:{key} is an object in a split file but a string or "
+                  f"array in an earlier one; bundled as deepMerge merges it (the earlier value spread into it)")
+    print(f"Written: {sum(bundle.written for bundle in bundles)}, "
+          f"unchanged: {sum(not bundle.written for bundle in bundles)}")
+    print(f"Manifest: {relative_to_base(out_dir / MANIFEST_NAME)}")
+    print(f"Elapsed: {elapsed * 1000:.0f} ms")
+    return 0
+
+
+def cmd_prune(args) -> int:
+    from .bundle import BUNDLE_DIR, MANIFEST_NAME, build_bundles
+    from .extract import CACHE_FILE
+    from .prune import load_allowlist, live_keys
+
+    out_dir = Path(args.out) if args.out else BUNDLE_DIR
+    started = time.perf_counter()
+    index = FlatIndex()
+    languages = args.lang or index.languages()
+    cache = ExtractionCache(CACHE_FILE)
+    index.load(languages, args.workers)
+    keep, results = live_keys(index, languages, cache, allowlist=load_allowlist(Path(args.allowlist))
+                              if args.allowlist else None)
+    cache.save()
+    bundles = {(b.lang, b.namespace): b
+               for b in build_bundles(out_dir, languages, workers=args.workers, keep=keep)}
+    elapsed = time.perf_counter() - started
+
+    rows = []
+    for result in results:
+        bundle = bundles[(result.lang, result.namespace)]
+        rows.append(dict(result.to_dict(), bytes=bundle.size, saved=bundle.unpruned_size - bundle.size))
+    if args.json:
+        emit_json(rows, args.json)
+        return 0
+    print_banner("DEAD KEYS PRUNED FROM BUNDLES")
+    for result, row in sorted(zip(results, rows), key=lambda pair: -pair[1]['saved']):
+        if not result.removed:
+            continue
+        print(f"[{result.lang}] {result.namespace}: {len(result.removed)} of {result.keys} keys removed, "
+              f"{row['saved']:,} bytes saved ({row['bytes']:,} left)")
+        for key in result.removed[:args.show]:
+            print(f"    {key}")
+    print()
+    for lang in languages:
+        mine = [row for row in rows if row['lang'] == lang]
+        total = sum(row['bytes'] + row['saved'] for row in mine)
+        print(f"{lang.upper()}: {sum(row['removed'] for row in mine):,} keys removed, "
+              f"{sum(row['saved'] for row in mine):,} of {total:,} bytes saved")
+    print(f"Manifest: {relative_to_base(out_dir / MANIFEST_NAME)} (source files untouched)")
+    print(f"Elapsed: {elapsed * 1000:.0f} ms")
+    return 0
+
+
+def cmd_slices(args) -> int:
+    from .extract import CACHE_FILE
+    from .slices import MANIFEST_NAME, SLICE_DIR, build_slices
+
+    out_dir = Path(args.out) if args.out else SLICE_DIR
+    started = time.perf_counter()
+    cache = ExtractionCache(CACHE_FILE)
+    reports = build_slices(out_dir, languages=args.lang, cache=cache, workers=args.workers)
+    cache.save()
+    elapsed = time.perf_counter() - started
+    if args.json:
+        emit_json([report.to_dict() for report in reports], args.json)
+        return 0
+    print_banner("PER-CALCULATOR LOCALE SLICES")
+    languages = list(reports[0].raw) if reports else []
+    for lang in languages:
+        raw = sum(r.raw[lang] for r in reports)
+        packed = sum(r.gzip[lang] for r in reports)
+        whole = sum(r.namespace_raw[lang] for r in reports)
+        print(f"[{lang}] {len(reports)} slices, {raw:,} bytes ({packed:,} gzipped); "
+              f"against {whole:,} bytes of whole namespaces for the same pages")
+    print()
+    print(f"Largest slices (by {languages[0] if languages else '-'} bytes):")
+    for report in sorted(reports, key=lambda r: -r.raw[languages[0]])[:args.limit]:
+        sizes = ', '.join(f"{lang.upper()} {report.raw[lang]:,} B / {report.gzip[lang]:,} B gz"
+                          for lang in languages)
+        print(f"  {report.slug} ({report.keys[languages[0]]} keys): {sizes}")
+    print(f"Manifest: {relative_to_base(out_dir / MANIFEST_NAME)}")
+    print(f"Elapsed: {elapsed * 1000:.0f} ms")
+    return 0
+
+
+def cmd_duplicates(args) -> int:
+    from .bundle import BUNDLE_DIR, MANIFEST_NAME
+    from .dedupe import MIN_COUNT, duplicate_clusters, hoist, locale_trees
+
+    if args.hoist:
+        out_dir = Path(args.out) if args.out else BUNDLE_DIR
+        try:
+            results = hoist(out_dir, args.min_count or MIN_COUNT, args.min_namespaces)
+        except (FileNotFoundError, ValueError) as error:
+            print(f"Error: {error}", file=sys.stderr)
+            return 2
+        if args.json:
+            emit_json([result.to_dict() for result in results], args.json)
+            return 0
+        print_banner("DUPLICATE STRINGS HOISTED INTO COMMON")
+        for result in sorted(results, key=lambda r: r.after - r.before):
+            if result.before == result.after:
+                continue
+            print(f"[{result.lang}] {result.namespace}: {result.rewritten} values, "
+                  f"{result.before:,} -> {result.after:,} bytes, "
+                  f"gzip {result.gzip_before:,} -> {result.gzip_after:,}")
+        print()
+        for lang in sorted({result.lang for result in results}):
+            mine = [result for result in results if result.lang == lang]
+            mark = '✓' if sum(r.gzip_after - r.gzip_before for r in mine) <= 0 else '⚠'
+            print(f"{mark} {lang.upper()}: {sum(r.rewritten for r in mine):,} references, "
+                  f"raw {sum(r.before for r in mine):,} -> {sum(r.after for r in mine):,} bytes, "
+                  f"gzip {sum(r.gzip_before for r in mine):,} -> {sum(r.gzip_after for r in mine):,} bytes")
+        print(f"Manifest: {relative_to_base(out_dir / MANIFEST_NAME)} (source files untouched)")
+        return 0
+
+    index = FlatIndex()
+    languages = args.lang or index.languages()
+    index.load(languages, args.workers)
+    clusters = duplicate_clusters(locale_trees(index, languages), args.min_count or 2)
+    if args.json:
+        emit_json([cluster.to_dict() for cluster in clusters], args.json)
+        return 0
+    print_banner("DUPLICATE STRINGS ACROSS NAMESPACES")
+    for cluster in clusters[:args.limit]:
+        preview = cluster.value if len(cluster.value) <= 60 else cluster.value[:57] + '...'
+        print(f"[{cluster.lang}] {cluster.count}x in {len(cluster.namespaces)} namespaces, "
+              f"{cluster.wasted_bytes:,} bytes repeated: {preview!r}")
+    print()
+    for lang in languages:
+        mine = [cluster for cluster in clusters if cluster.lang == lang]
+        print(f"{lang.upper()}: {len(mine):,} values repeated, {sum(c.total_bytes for c in mine):,} bytes "
+              f"in all copies, {sum(c.wasted_bytes for c in mine):,} in the extra ones")
+    return 0
+
+
+def cmd_precompress(args) -> int:
+    from .bundle import BUNDLE_DIR
+    from .precompress import STATE_FILE, brotli, precompress
+
+    out_dir = Path(args.out) if args.out else BUNDLE_DIR
+    if brotli is None and not args.no_brotli:
+        print("Error: brotli is not installed (pip install -r scripts/requirements.txt); "
+              "pass --no-brotli to write .gz files only", file=sys.stderr)
+        return 2
+    started = time.perf_counter()
+    try:
+        results, removed = precompress(out_dir, args.workers, with_brotli=not args.no_brotli)
+    except FileNotFoundError as error:
+        print(f"Error: {error}", file=sys.stderr)
+        return 2
+    elapsed = time.perf_counter() - started
+    if args.json:
+        emit_json([result.to_dict() for result in results], args.json)
+        return 0
+    print_banner("PRECOMPRESSED LOCALE FILES")
+    for result in sorted(results, key=lambda r: -r.size)[:args.limit]:
+        br = f", br {result.br:,}" if result.br is not None else ''
+        print(f"  {result.path}: {result.size:,} bytes -> gzip {result.gzip:,}{br}")
+    print()
+    raw = sum(r.size for r in results)
+    print(f"{len(results)} files, {raw:,} bytes; gzip {sum(r.gzip for r in results):,} bytes")
+    if results and not args.no_brotli:
+        print(f"✓ brotli {sum(r.br for r in results):,} bytes")
+    print(f"Compressed: {sum(r.written for r in results)}, unchanged: {sum(not r.written for r in results)}, "
+          f"stale siblings removed: {len(removed)}")
+    print(f"Report: {relative_to_base(STATE_FILE)}")
+    print(f"Elapsed: {elapsed * 1000:.0f} ms")
+    return 0
+
+
+def cmd_journal(args) -> int:
+    from .journal import list_journals
+
+    print_banner("CHANGE JOURNALS")
+    journals = list_journals()
+    for journal in journals[-args.limit:]:
+        ops = sum(len(entry['ops']) for entry in journal['files'])
+        files = len({entry['file'] for entry in journal['files']})
+        print(f"  {journal['run_id']}  {journal['script']}  {files} files, {ops} operations")
+    print(f"Journals: {len(journals)}")
+    return 0
+
+
+def cmd_replay(args) -> int:
+    from .journal import journal_path, load_journal, replay
+    from .patch import PatchConflict
+
+    try:
+        journals = [load_journal(journal_path(ref)) for ref in args.journals]
+        applied = replay(journals, write=not args.dry_run)
+    except (OSError, ValueError) as e:
+        print(f"Error: {e}", file=sys.stderr)
+        return 1 if isinstance(e, PatchConflict) else 2
+    print_banner("REPLAY" + (" (dry run)" if args.dry_run else ""))
+    for file, count in applied.items():
+        print(f"  {file}: {count} operations")
+    print(f"✓ {len(journals)} journals applied to {len(applied)} files")
+    return 0
+
+
+def cmd_undo(args) -> int:
+    from .journal import journal_path, load_journal, undo
+    from .patch import PatchConflict
+
+    try:
+        journal = load_journal(journal_path(args.run_id))
+        reverted = undo(journal, write=not args.dry_run)
+    except (OSError, ValueError) as e:
+        print(f"Error: {e}", file=sys.stderr)
+        return 1 if isinstance(e, PatchConflict) else 2
+    print_banner(f"UNDO {journal['run_id']}" + (" (dry run)" if args.dry_run else ""))
+    for file, count in reverted.items():
+        print(f"  {file}: {count} operations")
+    print(f"✓ Reverted {len(reverted)} files written by {journal['script']}")
+    return 0
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        prog='translation-tools',
+        description='Analyze and maintain public/locales translations')
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    resolve = commands.add_parser(
+        'resolve', help='show which namespace satisfies each t() call, in i18next lookup order')
+    resolve.add_argument('--lang', action='append', help='language to resolve (repeatable, default: all with values)')
+    resolve.add_argument('--file', action='append', help='only call sites in files ending with this path')
+    resolve.add_argument('--min-probes', type=int, default=3,
+                         help='list keys that needed at least this many namespace probes')
+    resolve.add_argument('--limit', type=int, default=20, help='max entries listed per section')
+    resolve.add_argument('--json', metavar='PATH', help="write the full report as JSON ('-' for stdout)")
+    resolve.set_defaults(func=cmd_resolve)
+
+    dynamic = commands.add_parser(
+        'dynamic', help='list the concrete keys each t(`prefix.${var}`) call can reach')
+    dynamic.add_argument('--lang', default='en', help='language whose keys are matched (default: en)')
+    dynamic.add_argument('--file', action='append', help='only call sites in files ending with this path')
+    dynamic.add_argument('--limit', type=int, default=8, help='max keys listed per namespace')
+    dynamic.add_argument('--json', metavar='PATH', help="write the full report as JSON ('-' for stdout)")
+    dynamic.set_defaults(func=cmd_dynamic)
+
+    watch = commands.add_parser(
+        'watch', help='re-check translations incrementally as components and locale files change')
+    watch.add_argument('--lang', action='append', help='language to check (repeatable, default: all with values)')
+    watch.add_argument('--poll', action='store_true', help='use stat polling even where inotify is available')
+    watch.add_argument('--debounce', type=int, default=50,
+                       help='quiet period in ms that closes a burst of changes (default: 50)')
+    watch.set_defaults(func=cmd_watch)
+
+    check = commands.add_parser(
+        'check', help='report missing and unused keys, for the whole tree or since a git ref')
+    check.add_argument('--since', metavar='REF',
+                       help='only check what changed since REF (git diff --name-only REF)')
+    check.add_argument('--lang', action='append', help='language to check (repeatable, default: all with values)')
+    check.add_argument('--limit', type=int, default=50, help='max missing keys listed')
+    check.add_argument('--fail-on-missing', action='store_true', help='exit 1 if any key is missing')
+    check.add_argument('--shard', metavar='I/N',
+                       help='only check shard I of N (partitioned by namespace); '
+                            'writes a partial result for merge-shards to --json')
+    check.add_argument('--json', metavar='PATH', help="write the report as JSON ('-' for stdout)")
+    check.set_defaults(func=cmd_check)
+
+    coverage = commands.add_parser(
+        'coverage', help='per-calculator and per-namespace coverage (replaces analyze-translations.cjs)')
+    coverage.add_argument('--lang', action='append', help='language to measure (repeatable, default: all with values)')
+    coverage.add_argument('--json', metavar='PATH', help="write the full report as JSON ('-' for stdout)")
+    coverage.add_argument('--junit', metavar='PATH', help='write a JUnit XML report for CI')
+    coverage.add_argument('--workers', type=int,
+                          help='processes used to parse locale files (default: one per CPU)')
+    coverage.add_argument('--limit', type=int, default=20, help='calculators listed with most missing keys')
+    coverage.set_defaults(func=cmd_coverage)
+
+    quality = commands.add_parser(
+        'quality', help='flag [AR] placeholders, untranslated copies, empty and wrong-script values')
+    quality.add_argument('--lang', action='append', help='language to scan (repeatable, default: all with values)')
+    quality.add_argument('--kind', action='append', choices=('marker', 'empty', 'identical', 'latin'),
+                         help='only report this kind of finding (repeatable)')
+    quality.add_argument('--limit', type=int, default=10, help='max findings listed per namespace')
+    quality.add_argument('--jsonl', metavar='PATH',
+                         help="stream one JSON object per namespace to PATH ('-' for stdout)")
+    quality.add_argument('--fail-on-findings', action='store_true', help='exit 1 if anything is flagged')
+    quality.set_defaults(func=cmd_quality)
+
+    parity = commands.add_parser(
+        'placeholders', help='report {{var}} interpolations that differ between languages')
+    parity.add_argument('--lang', action='append',
+                        help='language compared with en (repeatable, default: all with values)')
+    parity.add_argument('--file', action='append',
+                        help='only the namespaces owning these locale files (e.g. the file just written)')
+    parity.add_argument('--limit', type=int, default=50, help='max mismatches listed')
+    parity.add_argument('--json', metavar='PATH', help="write the mismatches as JSON ('-' for stdout)")
+    parity.add_argument('--fail-on-mismatch', action='store_true', help='exit 1 if any placeholder differs')
+    parity.set_defaults(func=cmd_placeholders)
+
+    merge = commands.add_parser(
+        'merge-shards', help='combine `check --shard` results into the full check report')
+    merge.add_argument('results', nargs='+', help='shard result files, one per shard')
+    merge.add_argument('--limit', type=int, default=50, help='max missing keys listed')
+    merge.add_argument('--fail-on-missing', action='store_true', help='exit 1 if any key is missing')
+    merge.add_argument('--json', metavar='PATH', help="write the report as JSON ('-' for stdout)")
+    merge.set_defaults(func=cmd_merge_shards)
+
+    suggest = commands.add_parser(
+        'suggest', help='closest existing keys for each missing key (typos, stale renames)')
+    suggest.add_argument('--lang', default='en', help='language whose keys are searched (default: en)')
+    suggest.add_argument('--key', action='append', help='look up this key instead of the missing ones')
+    suggest.add_argument('--top', type=int, default=3, help='suggestions per key (default: 3)')
+    suggest.add_argument('--limit', type=int, default=50, help='max missing keys listed')
+    suggest.add_argument('--json', metavar='PATH', help="write every key's suggestions as JSON ('-' for stdout)")
+    suggest.set_defaults(func=cmd_suggest)
+
+    tm = commands.add_parser(
+        'tm', help='exact-match translation memory from existing en values and their translations')
+    tm.add_argument('--lang', default='ar', help='target language (default: ar)')
+    tm.add_argument('--lookup', action='append', metavar='TEXT', help='look up an English value')
+    tm.add_argument('--limit', type=int, default=20, help='max reusable values listed')
+    tm.add_argument('--json', metavar='PATH',
+                    help="write missing values split into reused/synthesized as JSON ('-' for stdout)")
+    tm.set_defaults(func=cmd_tm)
+
+    fuzzy = commands.add_parser(
+        'fuzzy', help='review queue of missing values with similar already-translated en values (MinHash/LSH)')
+    fuzzy.add_argument('--lang', default='ar', help='target language (default: ar)')
+    fuzzy.add_argument('--lookup', action='append', metavar='TEXT', help='list the neighbours of an English value')
+    fuzzy.add_argument('-k', type=int, default=3, help='neighbours per value (default: 3)')
+    fuzzy.add_argument('--threshold', type=float, default=0.5,
+                       help='minimum word-set Jaccard similarity for --lookup (default: 0.5)')
+    fuzzy.add_argument('--limit', type=int, default=20, help='max queue entries listed')
+    fuzzy.add_argument('--json', metavar='PATH', help="write the review queue as JSON ('-' for stdout)")
+    fuzzy.set_defaults(func=cmd_fuzzy)
+
+    validate = commands.add_parser(
+        'validate', help='parse every locale file and check leaf types and en/other-language shape parity')
+    validate.add_argument('--lang', action='append', help='language to validate (repeatable, default: all)')
+    validate.add_argument('--workers', type=int, help='processes used to parse files (default: one per CPU)')
+    validate.add_argument('--limit', type=int, default=100, help='max issues listed')
+    validate.add_argument('--json', metavar='PATH', help="write the issues as JSON ('-' for stdout)")
+    validate.set_defaults(func=cmd_validate)
+
+    mt = commands.add_parser(
+        'mt', help='translate the missing values the translation memory cannot fill, in cached batches')
+    mt.add_argument('--url', help='provider endpoint (default: $TRANSLATION_MT_URL)')
+    mt.add_argument('--version', help='provider version, part of the cache key (default: $TRANSLATION_MT_VERSION or 1)')
+    mt.add_argument('--lang', default='ar', help='target language (default: ar)')
+    mt.add_argument('--batch', type=int, default=50, help='strings per request (default: 50)')
+    mt.add_argument('--workers', type=int, default=4, help='concurrent keep-alive connections (default: 4)')
+    mt.add_argument('--limit', type=int, default=20, help='max translations listed')
+    mt.add_argument('--json', metavar='PATH', help="write source -> translation as JSON ('-' for stdout)")
+    mt.set_defaults(func=cmd_mt)
+
+    mt_server = commands.add_parser('mt-server', help='run the local stand-in machine translation server')
+    mt_server.add_argument('--host', default='127.0.0.1')
+    mt_server.add_argument('--port', type=int, default=8765)
+    mt_server.set_defaults(func=cmd_mt_server)
+
+    export = commands.add_parser('export', help='stream values for review to XLIFF 2.0 or CSV')
+    export.add_argument('output', help="output file (.xlf/.xliff or .csv; '-' for stdout)")
+    export.add_argument('--lang', default='ar', help='target language (default: ar)')
+    export.add_argument('--select', action='append', metavar='KIND',
+                        help='missing, placeholder or changed (repeatable, default: missing and placeholder)')
+    export.add_argument('--ref', help='git ref that `changed` compares the English values with')
+    export.add_argument('--namespace', action='append', help='only this namespace (repeatable)')
+    export.add_argument('--format', choices=('xliff', 'csv'), help='default: from the file extension, else xliff')
+    export.set_defaults(func=cmd_export)
+
+    review_import = commands.add_parser('import', help='validate and apply a reviewed XLIFF 2.0 or CSV file')
+    review_import.add_argument('file', help='reviewed file written by `export`')
+    review_import.add_argument('--lang', default='ar', help='target language (default: ar)')
+    review_import.add_argument('--format', choices=('xliff', 'csv'), help='default: from the file extension')
+    review_import.add_argument('--dry-run', action='store_true', help='show the changes instead of writing them')
+    review_import.add_argument('--limit', type=int, default=20, help='max problems listed per namespace')
+    review_import.set_defaults(func=cmd_import)
+
+    provenance = commands.add_parser(
+        'provenance', help='how each value was produced (human, script, key, glossary, tm, mt)')
+    provenance.add_argument('--lang', action='append', help='language to report (repeatable, default: all with values)')
+    provenance.add_argument('--key', metavar='NS:KEY', help='origin of one key in every language')
+    provenance.add_argument('--origin', action='append',
+                            help='list the values with this origin (e.g. glossary, script, mt; repeatable)')
+    provenance.add_argument('--prune', action='store_true',
+                            help='drop entries whose value has changed or been removed since it was recorded')
+    provenance.add_argument('--limit', type=int, default=20, help='max values listed')
+    provenance.add_argument('--json', metavar='PATH', help="write counts and listed values as JSON ('-' for stdout)")
+    provenance.set_defaults(func=cmd_provenance)
+
+    locales = commands.add_parser(
+        'locales', help='configured and present languages, each summarized against en in its own process')
+    locales.add_argument('--lang', action='append', help='locale to summarize (repeatable, default: all but en)')
+    locales.add_argument('--workers', type=int, help='processes (default: one per CPU, at most one per locale)')
+    locales.add_argument('--scaffold', metavar='LANG', help='create the en file layout for LANG with empty files')
+    locales.add_argument('--dry-run', action='store_true', help='with --scaffold, list the files instead')
+    locales.add_argument('--json', metavar='PATH', help="write the summaries as JSON ('-' for stdout)")
+    locales.set_defaults(func=cmd_locales)
+
+    bundle = commands.add_parser(
+        'bundle', help='write one pre-merged, minified file per (lang, namespace) and a manifest into the build output')
+    bundle.add_argument('--out', help='output locales directory (default: dist/locales)')
+    bundle.add_argument('--lang', action='append', help='language to bundle (repeatable, default: all)')
+    bundle.add_argument('--workers', type=int, help='processes (default: one per CPU)')
+    bundle.add_argument('--json', metavar='PATH', help="write the bundle list as JSON ('-' for stdout)")
+    bundle.set_defaults(func=cmd_bundle)
+
+    prune = commands.add_parser(
+        'prune', help='write bundles without the keys no lookup can reach, reporting what each namespace loses')
+    prune.add_argument('--out', help='output locales directory (default: dist/locales)')
+    prune.add_argument('--lang', action='append', help='language to bundle (repeatable, default: all with values)')
+    prune.add_argument('--allowlist', help='patterns to keep (default: translation-prune-allowlist.txt)')
+    prune.add_argument('--show', type=int, default=0, metavar='N', help='list up to N removed keys per namespace')
+    prune.add_argument('--workers', type=int, help='processes (default: one per CPU)')
+    prune.add_argument('--json', metavar='PATH', help="write the per-namespace report as JSON ('-' for stdout)")
+    prune.set_defaults(func=cmd_prune)
+
+    slices = commands.add_parser(
+        'slices', help="write each calculator's reachable keys as a per-language slice, with a slug manifest")
+    slices.add_argument('--out', help='output directory (default: dist/locales/slices)')
+    slices.add_argument('--lang', action='append', help='language to slice (repeatable, default: all with values)')
+    slices.add_argument('--workers', type=int, help='processes for loading locale files (default: one per CPU)')
+    slices.add_argument('--limit', type=int, default=10, help='largest slices to list (default: 10)')
+    slices.add_argument('--json', metavar='PATH', help="write the per-calculator report as JSON ('-' for stdout)")
+    slices.set_defaults(func=cmd_slices)
+
+    duplicates = commands.add_parser(
+        'duplicates', help='report values repeated across namespaces; --hoist moves them into common if gzip shrinks')
+    duplicates.add_argument('--lang', action='append',
+                            help='language to analyze (repeatable, default: all with values)')
+    duplicates.add_argument('--min-count', type=int,
+                            help='occurrences a value needs (default: 2 for the report, 3 for --hoist)')
+    duplicates.add_argument('--min-namespaces', type=int, default=2,
+                            help='namespaces a hoisted value must span (default: 2)')
+    duplicates.add_argument('--limit', type=int, default=20, help='costliest values to list (default: 20)')
+    duplicates.add_argument('--workers', type=int, help='processes for loading locale files (default: one per CPU)')
+    duplicates.add_argument('--hoist', action='store_true',
+                            help='rewrite the bundles in --out to reference common values where gzip shrinks')
+    duplicates.add_argument('--out', help='bundle directory for --hoist (default: dist/locales)')
+    duplicates.add_argument('--json', metavar='PATH',
+                            help="write the clusters (or the hoist report) as JSON ('-' for stdout)")
+    duplicates.set_defaults(func=cmd_duplicates)
+
+    compress = commands.add_parser(
+        'precompress', help='write .gz and .br siblings of every built locale file, skipping unchanged ones')
+    compress.add_argument('--out', help='output locales directory (default: dist/locales)')
+    compress.add_argument('--no-brotli', action='store_true', help='write .gz files only')
+    compress.add_argument('--workers', type=int, help='processes (default: one per CPU)')
+    compress.add_argument('--limit', type=int, default=10, help='largest files to list (default: 10)')
+    compress.add_argument('--json', metavar='PATH', help="write the per-file sizes as JSON ('-' for stdout)")
+    compress.set_defaults(func=cmd_precompress)
+
+    journal = commands.add_parser('journal', help='list the change journals of batch script runs')
+    journal.add_argument('--limit', type=int, default=20, help='most recent journals listed')
+    journal.set_defaults(func=cmd_journal)
+
+    replay = commands.add_parser(
+        'replay', help='apply change journals (JSON Patch) to this checkout, each file written once')
+    replay.add_argument('journals', nargs='+', help='journal files or run ids, applied in order')
+    replay.add_argument('--dry-run', action='store_true', help='only check that every patch applies')
+    replay.set_defaults(func=cmd_replay)
+
+    undo = commands.add_parser('undo', help='revert the files written by one batch script run')
+    undo.add_argument('run_id', help='run id (see `journal`) or journal file')
+    undo.add_argument('--dry-run', action='store_true', help='only check that the run can be reverted')
+    undo.set_defaults(func=cmd_undo)
+
+    return parser
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    args = build_parser().parse_args(argv)
+    return args.func(args)
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,194 @@
+"""
+Translation coverage per calculator and per namespace
+
+Replaces analyze-translations.cjs. A calculator's keys are the t() calls
+of its component plus its registry nameKey/descriptionKey, each resolved
+with the same i18next lookup order as the resolver (strictly per language,
+so a key only present in the fallback language counts as missing). The
+report is plain data, written as JSON or JUnit XML for CI.
+"""
+
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, List, Optional
+from xml.etree import ElementTree
+
+from .extract import CallSite, ExtractionCache
+from .flat_index import FlatIndex
+from .paths import relative_to_base
+from .registry import CalculatorEntry, ComponentLocator, load_registry
+from .resolver import RESOLVED, NamespaceResolver
+
+
+def percent(part: int, total: int) -> int:
+    """Rounded percentage, 0 for an empty total (Math.round semantics)"""
+    return int(part * 100 / total + 0.5) if total else 0
+
+
+@dataclass
+class CalculatorCoverage:
+    slug: str
+    category: str
+    component: Optional[str]
+    keys: int
+    translated: Dict[str, int] = field(default_factory=dict)
+    missing: Dict[str, List[str]] = field(default_factory=dict)
+
+    def coverage(self, lang: str) -> int:
+        return percent(self.translated.get(lang, 0), self.keys)
+
+    def to_dict(self) -> dict:
+        return {
+            'slug': self.slug,
+            'category': self.category,
+            'component': self.component,
+            'keys': self.keys,
+            'coverage': {lang: self.coverage(lang) for lang in self.translated},
+            'translated': self.translated,
+            'missing': self.missing,
+        }
+
+
+@dataclass
+class NamespaceCoverage:
+    namespace: str
+    keys: int
+    present: Dict[str, int] = field(default_factory=dict)
+
+    def to_dict(self) -> dict:
+        return {
+            'namespace': self.namespace,
+            'keys': self.keys,
+            'present': self.present,
+            'coverage': {lang: percent(n, self.keys) for lang, n in self.present.items()},
+        }
+
+
+def _signature(site: CallSite) -> tuple:
+    return (site.key, site.namespaces[:1], site.ns_option, site.dynamic,
+            site.has_count, site.return_objects)
+
+
+def calculator_sites(entry: CalculatorEntry, component: Optional[Path],
+                     cache: ExtractionCache) -> List[CallSite]:
+    """Component call sites plus the registry keys, one per distinct lookup"""
+    sites = [CallSite(entry.file, entry.line, 1, key, ()) for key in entry.registry_keys()]
+    if component is not None:
+        sites.extend(cache.get(component))
+    unique: Dict[tuple, CallSite] = {}
+    for site in sites:
+        unique.setdefault(_signature(site), site)
+    return list(unique.values())
+
+
+def calculator_coverage(resolver: NamespaceResolver, entry: CalculatorEntry,
+                        component: Optional[Path], cache: ExtractionCache,
+                        languages: List[str]) -> CalculatorCoverage:
+    sites = calculator_sites(entry, component, cache)
+    result = CalculatorCoverage(entry.slug, entry.category,
+                                relative_to_base(component) if component else None, len(sites))
+    for lang in languages:
+        missing = []
+        for site in sites:
+            if site.dynamic:
+                found = bool(resolver.resolve_dynamic(site, lang).reachable)
+            else:
+                found = resolver.resolve(site, lang, strict=True).status == RESOLVED
+            if not found:
+                missing.append(site.key)
+        result.translated[lang] = len(sites) - len(missing)
+        result.missing[lang] = sorted(set(missing))
+    return result
+
+
+def namespace_coverage(index: FlatIndex, languages: List[str]) -> List[NamespaceCoverage]:
+    """Share of each namespace's keys (union over languages) present per language"""
+    names = sorted({ns for lang in languages for ns in index.namespaces(lang)})
+    results = []
+    for namespace in names:
+        leaves = {}
+        for lang in languages:
+            data = index.entry(lang, namespace)
+            leaves[lang] = set(data.leaves) if data else set()
+        union = set().union(*leaves.values())
+        results.append(NamespaceCoverage(namespace, len(union),
+                                         {lang: len(keys) for lang, keys in leaves.items()}))
+    return results
+
+
+def coverage_report(index: Optional[FlatIndex] = None, languages: Optional[List[str]] = None,
+                    cache: Optional[ExtractionCache] = None,
+                    registry: Optional[List[CalculatorEntry]] = None,
+                    locator: Optional[ComponentLocator] = None,
+                    workers: Optional[int] = None) -> dict:
+    """Full coverage report as JSON-ready data"""
+    index = index or FlatIndex()
+    languages = languages or index.languages()
+    cache = cache or ExtractionCache()
+    registry = load_registry() if registry is None else registry
+    locator = locator or ComponentLocator()
+    index.load(languages, workers)
+
+    resolver = NamespaceResolver(index)
+    calculators = []
+    for entry in sorted(registry, key=lambda e: e.slug):
+        calculators.append(calculator_coverage(resolver, entry, locator.find(entry), cache, languages))
+
+    total = len(calculators)
+    complete = [c for c in calculators if c.keys and all(c.translated[l] == c.keys for l in languages)]
+    partial = [c for c in calculators if c not in complete and any(c.translated[l] for l in languages)]
+    summary = {
+        'calculators': total,
+        'components_found': sum(1 for c in calculators if c.component),
+        'no_component': [c.slug for c in calculators if not c.component],
+        'total_keys': sum(c.keys for c in calculators),
+        'average_coverage': {lang: percent(sum(c.coverage(lang) for c in calculators), total * 100)
+                             for lang in languages},
+        'fully_translated': len(complete),
+        'partially_translated': len(partial),
+        'missing_all': sum(1 for c in calculators if c.keys and c not in complete and c not in partial),
+    }
+    return {
+        'languages': languages,
+        'summary': summary,
+        'calculators': [c.to_dict() for c in calculators],
+        'namespaces': [n.to_dict() for n in namespace_coverage(index, languages)],
+    }
+
+
+def _suite(root: ElementTree.Element, name: str, cases: List[tuple]) -> ElementTree.Element:
+    """cases are (classname, name, failure message or None, failure text)"""
+    suite = ElementTree.SubElement(root, 'testsuite', name=name, tests=str(len(cases)),
+                                   failures=str(sum(1 for case in cases if case[2])))
+    for classname, case_name, message, text in cases:
+        case = ElementTree.SubElement(suite, 'testcase', classname=classname, name=case_name)
+        if message:
+            failure = ElementTree.SubElement(case, 'failure', type='MissingTranslation', message=message)
+            failure.text = text or None
+    return suite
+
+
+def junit_xml(report: dict) -> str:
+    """JUnit XML: per language, one suite of calculators and one of namespaces"""
+    root = ElementTree.Element('testsuites', name='translation-coverage')
+    for lang in report['languages']:
+        cases = []
+        for calc in report['calculators']:
+            missing = calc['missing'][lang]
+            message = f"{len(missing)} of {calc['keys']} keys missing in {lang}" if missing else None
+            cases.append((f"calculators.{calc['category'] or 'uncategorized'}", calc['slug'],
+                          message, '\n'.join(missing)))
+        _suite(root, f"calculators.{lang}", cases)
+
+        cases = []
+        for ns in report['namespaces']:
+            absent = ns['keys'] - ns['present'][lang]
+            message = f"{absent} of {ns['keys']} keys missing in {lang}" if absent else None
+            cases.append(('namespaces', ns['namespace'], message, ''))
+        _suite(root, f"namespaces.{lang}", cases)
+
+    suites = list(root)
+    root.set('tests', str(sum(int(s.get('tests')) for s in suites)))
+    root.set('failures', str(sum(int(s.get('failures')) for s in suites)))
+    ElementTree.indent(root)
+    return ElementTree.tostring(root, encoding='unicode', xml_declaration=True) + '\n'
@@ -0,0 +1,246 @@
+"""
+Duplicate strings across namespaces, and hoisting them into `common`
+
+duplicate_clusters() groups every string leaf of a language by its value
+(hashed, so the grouping does not hold each text twice) and reports each
+value that occurs more than once with its locations and the bytes the
+extra copies cost.
+
+hoist() is an optional build step over a bundle directory written by
+`bundle` or `prune`. A value repeated often enough across namespaces can
+be stored once in the common bundle, with the other occurrences becoming
+i18next nesting references, `$t(common:hoisted.<hash>)`, which i18next
+resolves at lookup time (common is a fallback namespace, so it is loaded
+before any calculator). An existing plain common key with the same value
+is referenced instead of adding one. Values with interpolations or
+nesting of their own, array elements and values shorter than their
+reference are never candidates.
+
+The bundles are served gzipped and gzip already stores a repeat within a
+file as a short back-reference, so fewer raw bytes do not mean a smaller
+download. hoist() therefore decides on gzipped sizes: a bundle is rewritten
+only if it shrinks gzipped, and a language only if those savings exceed
+what its common bundle grows by. On this tree that leaves next to nothing
+to hoist (a few bytes of en). The analysis is the useful part: it shows
+where the duplicated text is. Only bundles change, never public/locales.
+"""
+
+import copy
+import hashlib
+import re
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Set, Tuple
+
+from .bundle import (BUNDLE_DIR, content_hash, gzip_size, hashed_name, read_manifest, save_manifest,
+                     stringify, write_bundle_files)
+from .flat_index import FlatIndex, load_json
+
+COMMON_NS = 'common'
+HOIST_PREFIX = 'hoisted'
+MIN_COUNT = 3
+MIN_NAMESPACES = 2
+
+_PLAIN_KEY_RE = re.compile(r'[\w-]+(?:\.[\w-]+)*')
+_UNSAFE = ('{{', '$t(')
+
+
+def value_hash(value: str) -> str:
+    return hashlib.blake2b(value.encode('utf-8'), digest_size=5).hexdigest()
+
+
+def reference(key: str) -> str:
+    return f"$t({COMMON_NS}:{key})"
+
+
+def _string_leaves(tree: dict, prefix: str = '') -> Iterator[Tuple[str, str]]:
+    """(flat key, value) of every string leaf outside arrays"""
+    for key, value in tree.items():
+        if isinstance(value, dict):
+            yield from _string_leaves(value, f"{prefix}{key}.")
+        elif isinstance(value, str):
+            yield f"{prefix}{key}", value
+
+
+@dataclass
+class Cluster:
+    lang: str
+    value: str
+    occurrences: List[Tuple[str, str]] = field(default_factory=list)  # (namespace, key)
+
+    @property
+    def size(self) -> int:
+        return len(self.value.encode('utf-8'))
+
+    @property
+    def count(self) -> int:
+        return len(self.occurrences)
+
+    @property
+    def namespaces(self) -> List[str]:
+        return sorted({namespace for namespace, _ in self.occurrences})
+
+    @property
+    def total_bytes(self) -> int:
+        return self.size * self.count
+
+    @property
+    def wasted_bytes(self) -> int:
+        return self.size * (self.count - 1)
+
+    def to_dict(self) -> dict:
+        return {'lang': self.lang, 'value': self.value, 'hash': value_hash(self.value), 'count': self.count,
+                'namespaces': self.namespaces, 'bytes': self.total_bytes, 'wasted': self.wasted_bytes,
+                'keys': [f"{namespace}:{key}" for namespace, key in self.occurrences]}
+
+
+def duplicate_clusters(trees: Dict[Tuple[str, str], dict], min_count: int = 2) -> List[Cluster]:
+    """Values occurring at least min_count times in one language, costliest first"""
+    groups: Dict[Tuple[str, str], Cluster] = {}
+    for (lang, namespace), tree in sorted(trees.items()):
+        for key, value in _string_leaves(tree):
+            digest = value_hash(value)
+            cluster = groups.get((lang, digest))
+            if cluster is None:
+                cluster = groups[(lang, digest)] = Cluster(lang, value)
+            cluster.occurrences.append((namespace, key))
+    clusters = [c for c in groups.values() if c.count >= min_count]
+    clusters.sort(key=lambda c: (-c.wasted_bytes, c.lang, c.value))
+    return clusters
+
+
+def locale_trees(index: FlatIndex, languages: Optional[List[str]] = None) -> Dict[Tuple[str, str], dict]:
+    """Merged namespace trees of the locale files"""
+    return {(lang, namespace): index.entry(lang, namespace).tree
+            for lang in languages or index.languages() for namespace in index.namespaces(lang)}
+
+
+def _hoistable(cluster: Cluster, min_count: int, min_namespaces: int) -> bool:
+    if cluster.count < min_count or len(cluster.namespaces) < min_namespaces:
+        return False
+    return not any(marker in cluster.value for marker in _UNSAFE)
+
+
+def _rewrite(tree: dict, replace, prefix: str = '') -> int:
+    """Replace string leaves outside arrays in place with replace(flat key, value) unless it returns None"""
+    count = 0
+    for key, value in tree.items():
+        if isinstance(value, dict):
+            count += _rewrite(value, replace, f"{prefix}{key}.")
+        elif isinstance(value, str):
+            new = replace(f"{prefix}{key}", value)
+            if new is not None:
+                tree[key] = new
+                count += 1
+    return count
+
+
+@dataclass
+class HoistResult:
+    lang: str
+    namespace: str
+    rewritten: int
+    before: int
+    after: int
+    gzip_before: int
+    gzip_after: int
+
+    def to_dict(self) -> dict:
+        return {'lang': self.lang, 'namespace': self.namespace, 'rewritten': self.rewritten,
+                'bytes': [self.before, self.after], 'gzip': [self.gzip_before, self.gzip_after]}
+
+
+def plan_hoist(trees: Dict[Tuple[str, str], dict], min_count: int = MIN_COUNT,
+               min_namespaces: int = MIN_NAMESPACES) -> Dict[Tuple[str, str], str]:
+    """(lang, value) -> common key for every candidate cluster; hoist() keeps those that pay off gzipped"""
+    plan = {}
+    for cluster in duplicate_clusters(trees, min_count):
+        if not _hoistable(cluster, min_count, min_namespaces):
+            continue
+        existing = sorted(key for namespace, key in cluster.occurrences
+                          if namespace == COMMON_NS and _PLAIN_KEY_RE.fullmatch(key))
+        key = existing[0] if existing else f"{HOIST_PREFIX}.{value_hash(cluster.value)}"
+        ref_size = len(reference(key).encode('utf-8'))
+        moved = cluster.count - (1 if existing else 0)
+        added = 0 if existing else len(f'"{key.split(".")[-1]}":"{cluster.value}",'.encode('utf-8'))
+        if moved * (cluster.size - ref_size) - added > 0:
+            plan[(cluster.lang, cluster.value)] = key
+    return plan
+
+
+def _apply(tree: dict, lang: str, namespace: str,
+           plan: Dict[Tuple[str, str], str]) -> Tuple[dict, int, Set[str]]:
+    """A copy of tree with planned values replaced by references; the count and the keys referenced"""
+    tree = copy.deepcopy(tree)
+    targets: Set[str] = set()
+
+    def replace(key: str, value: str) -> Optional[str]:
+        target = plan.get((lang, value))
+        if target is None or (namespace == COMMON_NS and key == target):
+            return None
+        targets.add(target)
+        return reference(target)
+    return tree, _rewrite(tree, replace), targets
+
+
+def hoist(out_dir: Path = BUNDLE_DIR, min_count: int = MIN_COUNT,
+          min_namespaces: int = MIN_NAMESPACES) -> List[HoistResult]:
+    """Rewrite the bundles in out_dir where that shrinks them gzipped; returns sizes per bundle"""
+    manifest = read_manifest(out_dir)
+    if manifest is None:
+        raise FileNotFoundError(f"no bundle manifest in {out_dir} (run `translation-tools.py bundle` first)")
+    if manifest.get('hoisted'):
+        raise ValueError(f"the bundles in {out_dir} are already hoisted")
+    paths = {(lang, namespace): out_dir / lang / f"{namespace}.json"
+             for lang, bundles in manifest['bundles'].items() for namespace in bundles}
+    originals = {pair: path.read_bytes() for pair, path in paths.items()}
+    trees = {pair: load_json(path) for pair, path in paths.items()}
+    plan = plan_hoist(trees, min_count, min_namespaces)
+    values = {(lang, key): value for (lang, value), key in plan.items()}
+    packed = {pair: gzip_size(content) for pair, content in originals.items()}
+
+    contents: Dict[Tuple[str, str], Tuple[bytes, int]] = {}  # the rewrites kept: content, references
+    hoisted = 0
+    for lang in sorted({lang for lang, _ in trees}):
+        accepted, targets, saved = {}, set(), 0
+        for (tree_lang, namespace), tree in sorted(trees.items()):
+            if tree_lang != lang or namespace == COMMON_NS:
+                continue
+            new_tree, count, referenced = _apply(tree, lang, namespace, plan)
+            if not count:
+                continue
+            content = stringify(new_tree)
+            delta = gzip_size(content) - packed[(lang, namespace)]
+            if delta < 0:
+                accepted[(lang, namespace)] = (content, count)
+                targets |= referenced
+                saved += delta
+        if not accepted:
+            continue
+        common, count, referenced = _apply(trees.get((lang, COMMON_NS), {}), lang, COMMON_NS,
+                                           {(l, v): k for (l, v), k in plan.items() if k in targets})
+        for key in sorted(targets | referenced):
+            if key.startswith(f"{HOIST_PREFIX}."):
+                common.setdefault(HOIST_PREFIX, {})[key.split('.', 1)[1]] = values[(lang, key)]
+        content = stringify(common)
+        delta = gzip_size(content) - packed.get((lang, COMMON_NS), gzip_size(b'{}'))
+        if saved + delta >= 0:
+            continue  # common grows by more than the other bundles shrink
+        accepted[(lang, COMMON_NS)] = (content, count)
+        contents.update(accepted)
+        hoisted += len(targets | referenced)
+
+    results = []
+    for pair in sorted(set(trees) | set(contents)):
+        before = originals.get(pair, b'{}')
+        after, count = contents.get(pair, (before, 0))
+        if after != before:
+            write_bundle_files(out_dir, pair[0], pair[1], after)
+            entry = manifest['bundles'].setdefault(pair[0], {}).setdefault(pair[1], {'files': 0})
+            digest = content_hash(after)
+            entry.update(bytes=len(after), hash=digest, file=hashed_name(pair[1], digest))
+        results.append(HoistResult(pair[0], pair[1], count, len(before), len(after),
+                                   packed.get(pair, gzip_size(before)), gzip_size(after)))
+    manifest['hoisted'] = hoisted
+    save_manifest(out_dir, manifest)
+    return results
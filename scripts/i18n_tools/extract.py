@@ -0,0 +1,266 @@
+"""
+Extract translation call sites from React components
+
+A call site is one t(...) call together with the namespaces of the
+useTranslation(...) hook that produced that t. Unlike the regexes in the
+batch scripts this keeps every namespace of an array argument, the
+{ ns: ... } / { count } / { returnObjects } options and template keys that
+contain ${...}, so later stages can resolve them the way i18next does.
+"""
+
+import hashlib
+import json
+import os
+import re
+from dataclasses import astuple, dataclass
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from .paths import BASE_DIR, SRC_DIR, relative_to_base
+
+# const { t } = useTranslation(...), const { t: tc, i18n } = useTranslation(...)
+HOOK_RE = re.compile(r'const\s*\{([^}]*)\}\s*=\s*useTranslation\s*\(([^)]*)\)', re.S)
+STRING_RE = re.compile(r"""'((?:[^'\\]|\\.)*)'|"((?:[^"\\]|\\.)*)"|`((?:[^`\\]|\\.)*)`""")
+NS_OPTION_RE = re.compile(r"""\bns\s*:\s*['"]([^'"]+)['"]""")
+COUNT_OPTION_RE = re.compile(r'\bcount\b')
+RETURN_OBJECTS_RE = re.compile(r'\breturnObjects\s*:\s*true\b')
+
+DEFAULT_BINDING = 't'
+SOURCE_SUFFIXES = ('.tsx', '.ts')
+
+# Persistent cache location (git-ignored)
+CACHE_FILE = BASE_DIR / '.cache' / 'translation-tools' / 'extraction.json'
+CACHE_VERSION = 1
+
+
+@dataclass(frozen=True)
+class TranslationHook:
+    """One useTranslation(...) call and the name its t is bound to"""
+    offset: int
+    binding: str
+    namespaces: Tuple[str, ...]
+    dynamic: bool = False  # namespace list contains a ${...} template
+
+
+@dataclass(frozen=True)
+class CallSite:
+    """One t('key') call with everything needed to resolve it"""
+    file: str
+    line: int
+    column: int
+    key: str
+    namespaces: Tuple[str, ...]
+    ns_option: Optional[str] = None
+    dynamic: bool = False
+    has_count: bool = False
+    return_objects: bool = False
+
+    @property
+    def location(self) -> str:
+        return f"{self.file}:{self.line}:{self.column}"
+
+
+def _unquote(match: re.Match) -> str:
+    for group in match.groups():
+        if group is not None:
+            return group
+    return ''
+
+
+def _bindings(destructure: str) -> List[str]:
+    """Local names bound to t in a `{ t, i18n }` / `{ t: tc }` pattern"""
+    names = []
+    for part in destructure.split(','):
+        name, _, alias = part.partition(':')
+        if name.strip() == 't':
+            names.append((alias or name).strip())
+    return names
+
+
+def find_hooks(content: str) -> List[TranslationHook]:
+    """Every useTranslation hook in a file, in source order"""
+    hooks = []
+    for match in HOOK_RE.finditer(content):
+        args = match.group(2).strip()
+        literals = [_unquote(m) for m in STRING_RE.finditer(args)]
+        dynamic = any('${' in value for value in literals)
+        namespaces = tuple(value for value in literals if '${' not in value)
+        for binding in _bindings(match.group(1)):
+            hooks.append(TranslationHook(match.start(), binding, namespaces, dynamic))
+    return hooks
+
+
+def _options_text(content: str, start: int, limit: int = 600) -> str:
+    """Text of the remaining call arguments up to the matching close paren"""
+    depth = 0
+    end = min(len(content), start + limit)
+    for i in range(start, end):
+        char = content[i]
+        if char in '([{':
+            depth += 1
+        elif char in ')]}':
+            if depth == 0:
+                return content[start:i]
+            depth -= 1
+    return content[start:end]
+
+
+def _call_regex(binding: str) -> re.Pattern:
+    return re.compile(r'(?<![\w.$])' + re.escape(binding) + r'\(\s*'
+                      r"""(?:'((?:[^'\\]|\\.)*)'|"((?:[^"\\]|\\.)*)"|`((?:[^`\\]|\\.)*)`)"""
+                      r'\s*([,)])')
+
+
+def _hook_for(hooks: List[TranslationHook], offset: int) -> Optional[TranslationHook]:
+    """Nearest hook before offset, else the first one after it"""
+    before = [h for h in hooks if h.offset <= offset]
+    if before:
+        return before[-1]
+    return hooks[0] if hooks else None
+
+
+def extract_call_sites_from_source(content: str, file: str) -> List[CallSite]:
+    """All t(...) call sites in one source text"""
+    hooks = find_hooks(content)
+    by_binding: Dict[str, List[TranslationHook]] = {}
+    for hook in hooks:
+        by_binding.setdefault(hook.binding, []).append(hook)
+    by_binding.setdefault(DEFAULT_BINDING, [])
+
+    line_starts = [0] + [m.end() for m in re.finditer('\n', content)]
+
+    def position(offset: int) -> Tuple[int, int]:
+        lo, hi = 0, len(line_starts)
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if line_starts[mid] <= offset:
+                lo = mid + 1
+            else:
+                hi = mid
+        return lo, offset - line_starts[lo - 1] + 1
+
+    sites = []
+    for binding, binding_hooks in by_binding.items():
+        for match in _call_regex(binding).finditer(content):
+            key = _unquote(match)
+            if not key:
+                continue
+            hook = _hook_for(binding_hooks, match.start())
+            options = _options_text(content, match.end()) if match.group(4) == ',' else ''
+            ns_match = NS_OPTION_RE.search(options)
+            line, column = position(match.start())
+            sites.append(CallSite(
+                file=file,
+                line=line,
+                column=column,
+                key=key,
+                namespaces=hook.namespaces if hook else (),
+                ns_option=ns_match.group(1) if ns_match else None,
+                dynamic=match.group(3) is not None and '${' in key,
+                has_count=bool(COUNT_OPTION_RE.search(options)),
+                return_objects=bool(RETURN_OBJECTS_RE.search(options)),
+            ))
+    sites.sort(key=lambda s: (s.line, s.column))
+    return sites
+
+
+def extract_call_sites(path: Path) -> List[CallSite]:
+    """All t(...) call sites in one file"""
+    content = path.read_text(encoding='utf-8')
+    return extract_call_sites_from_source(content, relative_to_base(path))
+
+
+def find_source_files(root: Path = SRC_DIR) -> List[Path]:
+    """Component and module sources, excluding tests and declarations"""
+    files = []
+    for dirpath, dirnames, filenames in os.walk(root):
+        dirnames[:] = sorted(d for d in dirnames if d not in ('__tests__', 'test'))
+        for name in sorted(filenames):
+            if name.endswith(SOURCE_SUFFIXES) and not name.endswith('.d.ts') \
+                    and '.test.' not in name:
+                files.append(Path(dirpath) / name)
+    return files
+
+
+class ExtractionCache:
+    """
+    Call sites per source file, re-extracted only when a file changes
+
+    In memory a file is re-read when its mtime or size changes. With a
+    cache_file the results are also persisted keyed by content hash, so a
+    fresh checkout (new mtimes, same contents) still skips extraction.
+    """
+
+    def __init__(self, cache_file: Optional[Path] = None):
+        self.cache_file = cache_file
+        self._entries: Dict[Path, Tuple[Tuple[int, int], List[CallSite]]] = {}
+        self._persisted: Dict[str, Tuple[str, List[CallSite]]] = {}
+        self._dirty = False
+        self.extracted = 0
+        if cache_file:
+            self._load()
+
+    def _load(self):
+        try:
+            with open(self.cache_file, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return
+        if data.get('version') != CACHE_VERSION:
+            return
+        for file, (digest, rows) in data.get('files', {}).items():
+            sites = [CallSite(file, line, column, key, tuple(namespaces), *rest)
+                     for line, column, key, namespaces, *rest in rows]
+            self._persisted[file] = (digest, sites)
+
+    def save(self):
+        """Write the persistent cache if anything was extracted since loading"""
+        if not self.cache_file or not self._dirty:
+            return
+        files = {file: [digest, [list(astuple(site))[1:] for site in sites]]
+                 for file, (digest, sites) in sorted(self._persisted.items())}
+        self.cache_file.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self.cache_file.with_suffix(f'.{os.getpid()}.tmp')
+        with open(tmp, 'w', encoding='utf-8') as f:
+            json.dump({'version': CACHE_VERSION, 'files': files}, f, ensure_ascii=False)
+        os.replace(tmp, self.cache_file)
+        self._dirty = False
+
+    def _extract(self, path: Path) -> List[CallSite]:
+        if not self.cache_file:
+            self.extracted += 1
+            return extract_call_sites(path)
+        raw = path.read_bytes()
+        digest = hashlib.blake2b(raw, digest_size=16).hexdigest()
+        file = relative_to_base(path)
+        persisted = self._persisted.get(file)
+        if persisted and persisted[0] == digest:
+            return persisted[1]
+        self.extracted += 1
+        sites = extract_call_sites_from_source(raw.decode('utf-8'), file)
+        self._persisted[file] = (digest, sites)
+        self._dirty = True
+        return sites
+
+    def get(self, path: Path) -> List[CallSite]:
+        try:
+            stat = path.stat()
+        except FileNotFoundError:
+            self._entries.pop(path, None)
+            return []
+        signature = (stat.st_mtime_ns, stat.st_size)
+        cached = self._entries.get(path)
+        if cached and cached[0] == signature:
+            return cached[1]
+        sites = self._extract(path)
+        self._entries[path] = (signature, sites)
+        return sites
+
+    def discard(self, path: Path):
+        self._entries.pop(path, None)
+
+    def files(self) -> List[Path]:
+        return sorted(self._entries)
+
+    def all_sites(self, paths: Iterable[Path]) -> Dict[Path, List[CallSite]]:
+        return {path: self.get(path) for path in paths}
@@ -0,0 +1,290 @@
+"""
+Flat index over public/locales
+
+Each (language, namespace) pair is loaded the way the browser sees it: the
+main calc/<ns>.json first, then the split files listed in splitNamespaces,
+deep-merged in order (see customRequest in src/i18n/config.ts). The merged
+tree is flattened to dot-notation keys so lookups are a single dict access.
+"""
+
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Set, Tuple
+
+from .i18n_config import I18nConfig, load_config
+from .key_trie import KeyTrie
+from .paths import LOCALES_DIR
+
+MISSING = object()
+
+
+def load_json(file_path: Path) -> dict:
+    """Load JSON file"""
+    if not file_path.exists():
+        return {}
+    with open(file_path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def flatten(data: dict, prefix: str = '') -> Dict[str, Any]:
+    """Flatten a nested dict to dot-notation leaves (arrays are leaves)"""
+    leaves: Dict[str, Any] = {}
+    stack = [(prefix, data)]
+    while stack:
+        base, node = stack.pop()
+        for key, value in node.items():
+            full_key = f"{base}.{key}" if base else key
+            if isinstance(value, dict):
+                stack.append((full_key, value))
+            else:
+                leaves[full_key] = value
+    return leaves
+
+
+def string_values(key: str, value) -> Iterator[Tuple[str, str]]:
+    """(key, text) for a leaf; array leaves yield one entry per string element (key[i])"""
+    if isinstance(value, str):
+        yield key, value
+    elif isinstance(value, list):
+        for i, item in enumerate(value):
+            yield from string_values(f"{key}[{i}]", item)
+
+
+def branch_keys(data: dict, prefix: str = '') -> Set[str]:
+    """All dot-notation paths that point at an object rather than a leaf"""
+    branches: Set[str] = set()
+    stack = [(prefix, data)]
+    while stack:
+        base, node = stack.pop()
+        for key, value in node.items():
+            if isinstance(value, dict):
+                full_key = f"{base}.{key}" if base else key
+                branches.add(full_key)
+                stack.append((full_key, value))
+    return branches
+
+
+def deep_merge(target: dict, source: dict) -> dict:
+    """Merge source into a copy of target exactly like deepMerge in config.ts"""
+    result = dict(target)
+    for key, value in source.items():
+        if isinstance(value, dict):
+            base = result.get(key)
+            result[key] = deep_merge(base if isinstance(base, dict) else {}, value)
+        else:
+            result[key] = value
+    return result
+
+
+def discover_languages(locales_dir: Path = LOCALES_DIR) -> List[str]:
+    """Language directories present under public/locales"""
+    if not locales_dir.is_dir():
+        return []
+    return sorted(p.name for p in locales_dir.iterdir() if p.is_dir())
+
+
+def is_populated(lang: str, locales_dir: Path = LOCALES_DIR) -> bool:
+    """True if any of the language's files holds something (a fresh scaffold is all `{}`)"""
+    for path in (locales_dir / lang).rglob('*.json'):
+        try:
+            if load_json(path):
+                return True
+        except ValueError:
+            return True  # unreadable is not empty; loading it reports the error
+    return False
+
+
+def active_languages(locales_dir: Path = LOCALES_DIR) -> List[str]:
+    """Populated languages: what checks and reports cover unless given languages explicitly"""
+    return [lang for lang in discover_languages(locales_dir) if is_populated(lang, locales_dir)]
+
+
+def namespace_for_file(path: Path, config: I18nConfig,
+                       locales_dir: Path = LOCALES_DIR) -> Optional[Tuple[str, str]]:
+    """Map a locale file to its (lang, namespace), or None if it is not a locale file"""
+    try:
+        rel = path.resolve().relative_to(locales_dir.resolve())
+    except ValueError:
+        return None
+    if rel.suffix != '.json' or len(rel.parts) < 2:
+        return None
+    lang = rel.parts[0]
+    name = Path(*rel.parts[1:]).with_suffix('').as_posix()
+    parent, _, stem = name.rpartition('/')
+    if parent in config.split_namespaces and stem in config.split_namespaces[parent]:
+        return lang, parent
+    return lang, name
+
+
+def namespace_files(lang: str, config: I18nConfig,
+                    locales_dir: Path = LOCALES_DIR) -> Dict[str, List[Path]]:
+    """Every namespace of a language with its files in merge order"""
+    lang_dir = locales_dir / lang
+    result: Dict[str, List[Path]] = {}
+    if not lang_dir.is_dir():
+        return result
+    for path in sorted(lang_dir.rglob('*.json')):
+        owner = namespace_for_file(path, config, locales_dir)
+        if owner:
+            result.setdefault(owner[1], [])
+    for namespace in result:
+        result[namespace] = files_for_namespace(lang, namespace, config, locales_dir)
+    return result
+
+
+def files_for_namespace(lang: str, namespace: str, config: I18nConfig,
+                        locales_dir: Path = LOCALES_DIR) -> List[Path]:
+    """Existing files that make up one namespace, main file first"""
+    base = locales_dir / lang / namespace
+    candidates = [base.with_name(base.name + '.json')]
+    for part in config.split_namespaces.get(namespace, ()):
+        candidates.append(base / f"{part}.json")
+    return [p for p in candidates if p.exists()]
+
+
+@dataclass
+class NamespaceData:
+    """One merged namespace of one language"""
+    lang: str
+    namespace: str
+    files: List[Path]
+    tree: dict
+    leaves: Dict[str, Any]
+    branches: Set[str]
+    sources: Dict[str, Path] = field(default_factory=dict)
+    trie: Optional[KeyTrie] = None
+
+
+def load_namespace(lang: str, namespace: str, config: I18nConfig,
+                   locales_dir: Path = LOCALES_DIR,
+                   files: Optional[List[Path]] = None) -> NamespaceData:
+    """Load, merge and flatten one namespace, remembering which file owns each key"""
+    if files is None:
+        files = files_for_namespace(lang, namespace, config, locales_dir)
+    tree: dict = {}
+    per_file: List[Tuple[Path, Dict[str, Any]]] = []
+    for path in files:
+        data = load_json(path)
+        tree = deep_merge(tree, data)
+        per_file.append((path, flatten(data)))
+
+    leaves = flatten(tree)
+    sources: Dict[str, Path] = {}
+    for path, file_leaves in per_file:
+        for key in file_leaves:
+            if key in leaves:
+                sources[key] = path
+    return NamespaceData(lang, namespace, files, tree, leaves, branch_keys(tree), sources)
+
+
+def _load_job(job: tuple) -> NamespaceData:
+    return load_namespace(*job)
+
+
+class FlatIndex:
+    """
+    Lazily loaded (lang, namespace) -> flat key map
+
+    Namespaces are loaded on first access and kept in memory, so one index
+    can answer any number of lookups across calculators.
+    """
+
+    def __init__(self, locales_dir: Path = LOCALES_DIR, config: Optional[I18nConfig] = None):
+        self.locales_dir = locales_dir
+        self.config = config or load_config()
+        self._entries: Dict[Tuple[str, str], NamespaceData] = {}
+        self._layout: Dict[str, Dict[str, List[Path]]] = {}
+
+    def languages(self) -> List[str]:
+        """Populated languages only, so a scaffolded locale is not checked until it has values"""
+        return active_languages(self.locales_dir)
+
+    def layout(self, lang: str) -> Dict[str, List[Path]]:
+        """Namespace -> files for a language (cached directory scan)"""
+        if lang not in self._layout:
+            self._layout[lang] = namespace_files(lang, self.config, self.locales_dir)
+        return self._layout[lang]
+
+    def namespaces(self, lang: str) -> List[str]:
+        return sorted(self.layout(lang))
+
+    def entry(self, lang: str, namespace: str) -> Optional[NamespaceData]:
+        """Loaded namespace data, or None if the namespace has no files"""
+        cache_key = (lang, namespace)
+        if cache_key not in self._entries:
+            files = self.layout(lang).get(namespace)
+            if not files:
+                return None
+            self._entries[cache_key] = load_namespace(
+                lang, namespace, self.config, self.locales_dir, files)
+        return self._entries[cache_key]
+
+    def load(self, languages: Optional[Iterable[str]] = None,
+             workers: Optional[int] = None) -> 'FlatIndex':
+        """
+        Eagerly load every namespace of the given languages
+
+        JSON parsing holds the GIL, so with more than one worker the
+        namespaces are parsed in a process pool (default: one per CPU).
+        """
+        pending = [(lang, namespace) for lang in languages or self.languages()
+                   for namespace in self.namespaces(lang) if (lang, namespace) not in self._entries]
+        workers = min(workers or os.cpu_count() or 1, len(pending))
+        if workers <= 1:
+            for lang, namespace in pending:
+                self.entry(lang, namespace)
+            return self
+        jobs = [(lang, namespace, self.config, self.locales_dir, self.layout(lang)[namespace])
+                for lang, namespace in pending]
+        with ProcessPoolExecutor(workers) as pool:
+            for data in pool.map(_load_job, jobs, chunksize=max(1, len(jobs) // (workers * 4))):
+                self._entries[(data.lang, data.namespace)] = data
+        return self
+
+    def invalidate(self, lang: str, namespace: Optional[str] = None, rescan: bool = True):
+        """Forget cached data so the next access re-reads from disk
+
+        rescan=False keeps the cached file layout, which is only safe when no
+        locale file was created or deleted.
+        """
+        if rescan:
+            self._layout.pop(lang, None)
+        if namespace is None:
+            for cache_key in [k for k in self._entries if k[0] == lang]:
+                del self._entries[cache_key]
+        else:
+            self._entries.pop((lang, namespace), None)
+
+    def loaded(self) -> Iterator[NamespaceData]:
+        return iter(self._entries.values())
+
+    def lookup(self, lang: str, namespace: str, key: str) -> Any:
+        """Leaf value at key, or MISSING"""
+        data = self.entry(lang, namespace)
+        if data is None:
+            return MISSING
+        return data.leaves.get(key, MISSING)
+
+    def is_branch(self, lang: str, namespace: str, key: str) -> bool:
+        """True if key points at an object (only valid with returnObjects)"""
+        data = self.entry(lang, namespace)
+        return data is not None and key in data.branches
+
+    def trie(self, lang: str, namespace: str) -> Optional[KeyTrie]:
+        """Key trie of a namespace, built on first use"""
+        data = self.entry(lang, namespace)
+        if data is None:
+            return None
+        if data.trie is None:
+            data.trie = KeyTrie(data.leaves)
+        return data.trie
+
+    def source(self, lang: str, namespace: str, key: str) -> Optional[Path]:
+        """File that supplies the merged value of key"""
+        data = self.entry(lang, namespace)
+        if data is None:
+            return None
+        return data.sources.get(key)
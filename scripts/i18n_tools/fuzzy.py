@@ -0,0 +1,155 @@
+"""
+Fuzzy translation memory: MinHash signatures with LSH banding
+
+"Please enter a valid age" has no exact match, but "Please enter a valid
+value" and its translation are a good starting point for a reviewer. Each
+English source of the exact memory is shingled into its word set and
+summarised by a MinHash signature; signatures are cut into bands and
+every band is hashed into a bucket, so only sources sharing a bucket with
+the query are ever compared (no pairwise pass over the corpus). Candidates
+are scored by the exact Jaccard similarity of their word sets.
+
+Fuzzy matches are never written to locale files: review_queue() lists
+them next to each missing value for a person to adapt.
+"""
+
+import random
+import re
+import zlib
+from dataclasses import dataclass
+from typing import Dict, FrozenSet, Iterable, List, Optional, Tuple
+
+from .flat_index import FlatIndex, string_values
+from .tm import SOURCE_LANG, TARGET_LANG, TranslationMemory, normalize_source
+
+NUM_PERM = 96
+# 3 rows per band: a pair at 0.5 Jaccard shares a bucket with probability
+# 1 - (1 - 0.5**3)**32 ~ 0.986, one at 0.3 with ~0.58
+BANDS = 32
+MIN_SIMILARITY = 0.5
+
+_PRIME = (1 << 61) - 1
+_MASK = (1 << 32) - 1
+TOKEN_RE = re.compile(r'\{\{[^}]*\}\}|\w+')
+
+
+def shingles(text: str) -> FrozenSet[str]:
+    """Word set of a normalized English value ({{placeholders}} are words)"""
+    return frozenset(TOKEN_RE.findall(normalize_source(text)))
+
+
+def jaccard(a: FrozenSet[str], b: FrozenSet[str]) -> float:
+    return len(a & b) / len(a | b) if a or b else 1.0
+
+
+@dataclass(frozen=True)
+class FuzzyMatch:
+    source: str
+    target: str
+    similarity: float
+    namespaces: Tuple[str, ...]
+
+
+class MinHashLSH:
+    """MinHash signatures of word sets, bucketed by band"""
+
+    def __init__(self, num_perm: int = NUM_PERM, bands: int = BANDS, seed: int = 1):
+        if num_perm % bands:
+            raise ValueError("num_perm must be a multiple of bands")
+        rng = random.Random(seed)
+        self.params = [(rng.randrange(1, _PRIME), rng.randrange(0, _PRIME)) for _ in range(num_perm)]
+        self.rows = num_perm // bands
+        self.bands = bands
+        self.buckets: Dict[Tuple[int, tuple], List[int]] = {}
+        self.sets: List[FrozenSet[str]] = []
+        self._token_hashes: Dict[str, List[int]] = {}
+
+    def _hashes(self, token: str) -> List[int]:
+        hashes = self._token_hashes.get(token)
+        if hashes is None:
+            value = zlib.crc32(token.encode('utf-8'))
+            hashes = self._token_hashes[token] = [((a * value + b) % _PRIME) & _MASK for a, b in self.params]
+        return hashes
+
+    def signature(self, tokens: Iterable[str]) -> List[int]:
+        vectors = [self._hashes(token) for token in tokens]
+        if not vectors:
+            return [_MASK] * len(self.params)
+        return list(map(min, zip(*vectors)))
+
+    def _bands(self, signature: List[int]):
+        for band in range(self.bands):
+            yield band, tuple(signature[band * self.rows:(band + 1) * self.rows])
+
+    def add(self, tokens: FrozenSet[str]) -> int:
+        item = len(self.sets)
+        self.sets.append(tokens)
+        for bucket in self._bands(self.signature(tokens)):
+            self.buckets.setdefault(bucket, []).append(item)
+        return item
+
+    def candidates(self, tokens: FrozenSet[str]) -> set:
+        found = set()
+        for bucket in self._bands(self.signature(tokens)):
+            found.update(self.buckets.get(bucket, ()))
+        return found
+
+
+class FuzzyMemory:
+    """Nearest translated English sources of a TranslationMemory"""
+
+    def __init__(self, memory: TranslationMemory, lsh: Optional[MinHashLSH] = None):
+        self.memory = memory
+        self.lsh = lsh or MinHashLSH()
+        self.sources: List[str] = []
+        for source in memory.entries:
+            tokens = shingles(source)
+            if tokens:
+                self.sources.append(source)
+                self.lsh.add(tokens)
+
+    def neighbours(self, text: str, k: int = 3, threshold: float = MIN_SIMILARITY) -> List[FuzzyMatch]:
+        """Up to k translated sources most similar to text, excluding an exact match"""
+        tokens = shingles(text)
+        if not tokens:
+            return []
+        norm = normalize_source(text)
+        scored = []
+        for item in self.lsh.candidates(tokens):
+            source = self.sources[item]
+            if source == norm:
+                continue
+            similarity = jaccard(tokens, self.lsh.sets[item])
+            if similarity >= threshold:
+                scored.append((similarity, source))
+        scored.sort(key=lambda pair: (-pair[0], pair[1]))
+        matches = []
+        for similarity, source in scored[:k]:
+            match = self.memory.lookup(source)
+            matches.append(FuzzyMatch(self.memory.originals[source], match.text, round(similarity, 3), match.namespaces))
+        return matches
+
+
+def review_queue(fuzzy: FuzzyMemory, index: FlatIndex, source_lang: str = SOURCE_LANG,
+                 target_lang: str = TARGET_LANG, k: int = 3) -> List[dict]:
+    """Missing target values without an exact match, each with its nearest translated neighbours"""
+    queue = []
+    for namespace in index.namespaces(source_lang):
+        target_data = index.entry(target_lang, namespace)
+        target_leaves = target_data.leaves if target_data else {}
+        for leaf, value in index.entry(source_lang, namespace).leaves.items():
+            if leaf in target_leaves:
+                continue
+            for key, source in string_values(leaf, value):
+                if fuzzy.memory.lookup(source) is not None:
+                    continue
+                matches = fuzzy.neighbours(source, k)
+                if matches:
+                    queue.append({
+                        'namespace': namespace,
+                        'key': key,
+                        'source': source,
+                        'neighbours': [{'source': m.source, 'target': m.target, 'similarity': m.similarity,
+                                        'namespaces': list(m.namespaces)} for m in matches],
+                    })
+    return queue
@@ -0,0 +1,96 @@
+"""
+Read the i18next settings from src/i18n/config.ts
+
+The tooling must agree with the runtime about namespaces, split files and
+fallback order, so instead of hard-coding them we parse the literals out of
+the config file. Only the simple literal forms used in config.ts are
+understood (strings, string arrays and the splitNamespaces record).
+"""
+
+import re
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from .paths import I18N_CONFIG_FILE
+
+_STRING = r"""'([^']*)'|"([^"]*)\""""
+_STRING_RE = re.compile(_STRING)
+
+
+@dataclass(frozen=True)
+class I18nConfig:
+    """The subset of the i18next init options the tooling relies on"""
+    default_ns: str = 'translation'
+    fallback_ns: Tuple[str, ...] = ()
+    fallback_lng: Tuple[str, ...] = ('ar',)
+    supported_lngs: Tuple[str, ...] = ('ar', 'en')
+    preload: Tuple[str, ...] = ()
+    namespaces: Tuple[str, ...] = ()
+    split_namespaces: Dict[str, Tuple[str, ...]] = field(default_factory=dict)
+    load_path: str = '/locales/{{lng}}/{{ns}}.json'
+    ns_separator: str = ':'
+    key_separator: str = '.'
+
+    def language_chain(self, lang: str) -> List[str]:
+        """Languages i18next tries for lang, in order (lang first, then fallbackLng)"""
+        chain = [lang]
+        for fallback in self.fallback_lng:
+            if fallback not in chain:
+                chain.append(fallback)
+        return chain
+
+
+def _strings(text: str) -> Tuple[str, ...]:
+    """All quoted string literals in text, in order"""
+    return tuple(m.group(1) if m.group(1) is not None else m.group(2)
+                 for m in _STRING_RE.finditer(text))
+
+
+def _option(source: str, name: str) -> Optional[Tuple[str, ...]]:
+    """Value of `name: 'x'` or `name: ['x', 'y']` in source, or None"""
+    match = re.search(r'\b' + name + r'\s*:\s*(\[[^\]]*\]|' + _STRING + r')', source)
+    if not match:
+        return None
+    return _strings(match.group(1))
+
+
+def _strip_comments(source: str) -> str:
+    """Remove // line comments so commented-out options are ignored"""
+    return re.sub(r'(?<![:\'"])//[^\n]*', '', source)
+
+
+def parse_config(source: str) -> I18nConfig:
+    """Parse the contents of config.ts"""
+    source = _strip_comments(source)
+    defaults = I18nConfig()
+
+    split_namespaces: Dict[str, Tuple[str, ...]] = {}
+    block = re.search(r'splitNamespaces[^=]*=\s*\{(.*?)\n\};', source, re.S)
+    if block:
+        for match in re.finditer(r"""['"]([^'"]+)['"]\s*:\s*\[([^\]]*)\]""", block.group(1)):
+            split_namespaces[match.group(1)] = _strings(match.group(2))
+
+    init = source[source.find('.init('):] if '.init(' in source else source
+
+    def first(name: str, default: str) -> str:
+        values = _option(init, name)
+        return values[0] if values else default
+
+    return I18nConfig(
+        default_ns=first('defaultNS', defaults.default_ns),
+        fallback_ns=_option(init, 'fallbackNS') or (),
+        fallback_lng=_option(init, 'fallbackLng') or defaults.fallback_lng,
+        supported_lngs=_option(init, 'supportedLngs') or defaults.supported_lngs,
+        preload=_option(init, 'preload') or (),
+        namespaces=_option(init, 'ns') or (),
+        split_namespaces=split_namespaces,
+        load_path=first('loadPath', defaults.load_path),
+    )
+
+
+def load_config(path: Path = I18N_CONFIG_FILE) -> I18nConfig:
+    """Load and parse src/i18n/config.ts, falling back to defaults if it is missing"""
+    if not path.exists():
+        return I18nConfig()
+    return parse_config(path.read_text(encoding='utf-8'))
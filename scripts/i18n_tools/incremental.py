@@ -0,0 +1,187 @@
+"""
+Git-aware incremental check: only analyse what changed since a ref
+
+The changed-file list comes from `git diff --name-only <ref>`. Changed
+components are re-extracted; every other component's call sites come from
+the persistent extraction cache and only feed the reverse index. In a
+changed component only the call sites the diff added count: a lookup the
+file already made at <ref> (same key, namespaces and options) is not
+reported again, so a PR is not blamed for misses it did not introduce. For a
+changed locale file the namespace is merged at <ref> and in the working
+tree, and the keys that appeared or vanished select the dependent
+components through the reverse index. Only those components are evaluated,
+so only the namespaces they probe are ever loaded.
+"""
+
+import json
+import subprocess
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, List, Optional, Set, Tuple
+
+from .extract import (CACHE_FILE, SOURCE_SUFFIXES, CallSite, ExtractionCache, extract_call_sites_from_source,
+                      find_source_files)
+from .flat_index import FlatIndex, branch_keys, deep_merge, flatten, load_json, namespace_for_file
+from .key_trie import glob_to_regex, template_to_pattern
+from .paths import BASE_DIR, LOCALES_DIR, SRC_DIR, relative_to_base
+from .resolver import lookup_order
+from .usage import ReverseIndex, UsageIndex, key_variants
+
+
+def git(*args: str, cwd: Path = BASE_DIR) -> str:
+    """Run a git command and return its stdout"""
+    result = subprocess.run(['git', *args], cwd=cwd, capture_output=True, text=True, check=True)
+    return result.stdout
+
+
+def changed_paths(ref: str, base: Path = BASE_DIR) -> List[Path]:
+    """Files that differ between ref and the working tree"""
+    output = git('diff', '--name-only', ref, '--', cwd=base)
+    return [base / line for line in output.splitlines() if line]
+
+
+def read_json_at(ref: str, path: Path, base: Path = BASE_DIR) -> Optional[dict]:
+    """Parsed contents of path at ref, or None if it did not exist there"""
+    try:
+        return json.loads(git('show', f"{ref}:{relative_to_base(path, base)}", cwd=base))
+    except subprocess.CalledProcessError:
+        return None
+
+
+def _signature(site: CallSite, config) -> tuple:
+    """What a call site looks up, independent of where it is"""
+    return lookup_order(site, config), site.has_count, site.return_objects
+
+
+def lookups_at(ref: str, path: Path, config, base: Path = BASE_DIR) -> Set[tuple]:
+    """Signatures of the call sites path had at ref (none if it did not exist there)"""
+    try:
+        source = git('show', f"{ref}:{relative_to_base(path, base)}", cwd=base)
+    except subprocess.CalledProcessError:
+        return set()
+    return {_signature(site, config) for site in extract_call_sites_from_source(source, relative_to_base(path, base))}
+
+
+def namespace_keys_at(ref: str, lang: str, namespace: str, index: FlatIndex,
+                      changed: Set[Path]) -> Set[str]:
+    """Leaf and branch keys of a merged namespace as it was at ref"""
+    tree: dict = {}
+    base = index.locales_dir / lang / namespace
+    candidates = [base.with_name(base.name + '.json')]
+    candidates += [base / f"{part}.json" for part in index.config.split_namespaces.get(namespace, ())]
+    for path in candidates:
+        if path in changed:
+            data = read_json_at(ref, path)
+        else:
+            data = load_json(path) if path.exists() else None
+        if data is not None:
+            tree = deep_merge(tree, data)
+    return set(flatten(tree)) | branch_keys(tree)
+
+
+def _is_source(path: Path) -> bool:
+    return (SRC_DIR in path.parents and path.name.endswith(SOURCE_SUFFIXES)
+            and not path.name.endswith('.d.ts') and '.test.' not in path.name
+            and '__tests__' not in path.parts and 'test' not in path.relative_to(SRC_DIR).parts)
+
+
+@dataclass
+class SinceReport:
+    """Findings limited to what changed since a ref"""
+    ref: str
+    changed_sources: List[str] = field(default_factory=list)
+    key_changes: Dict[str, Dict[str, List[str]]] = field(default_factory=dict)
+    evaluated: List[str] = field(default_factory=list)
+    missing: List[dict] = field(default_factory=list)
+    unused: List[dict] = field(default_factory=list)
+    namespaces_loaded: int = 0
+    extracted: int = 0
+    elapsed_ms: float = 0.0
+
+    def to_dict(self) -> dict:
+        return {
+            'ref': self.ref,
+            'changed_sources': self.changed_sources,
+            'key_changes': self.key_changes,
+            'evaluated': self.evaluated,
+            'missing': self.missing,
+            'unused': self.unused,
+            'namespaces_loaded': self.namespaces_loaded,
+            'extracted': self.extracted,
+            'elapsed_ms': round(self.elapsed_ms, 1),
+        }
+
+
+def check_since(ref: str, languages: Optional[List[str]] = None,
+                cache_file: Optional[Path] = CACHE_FILE) -> SinceReport:
+    """Missing and unused keys introduced by changes since ref"""
+    started = time.perf_counter()
+    report = SinceReport(ref)
+    changed = changed_paths(ref)
+    changed_set = set(changed)
+    sources = [p for p in changed if _is_source(p)]
+    locale_files = [p for p in changed if LOCALES_DIR in p.parents and p.suffix == '.json']
+    report.changed_sources = [relative_to_base(p) for p in sources]
+
+    index = FlatIndex()
+    languages = languages or index.languages()
+    cache = ExtractionCache(cache_file)
+    reverse = ReverseIndex(index.config)
+    for path in find_source_files():
+        reverse.add(path, cache.get(path))
+
+    affected: Set[Path] = {p for p in sources if p.exists()}
+    changed_keys: Dict[Tuple[str, str], Tuple[Set[str], Set[str]]] = {}
+    for path in locale_files:
+        owner = namespace_for_file(path, index.config)
+        if owner is None or owner in changed_keys:
+            continue
+        lang, namespace = owner
+        old = namespace_keys_at(ref, lang, namespace, index, changed_set)
+        data = index.entry(lang, namespace)
+        new = set(data.leaves) | data.branches if data else set()
+        added, removed = new - old, old - new
+        changed_keys[owner] = (added, removed)
+        report.key_changes[f"{lang}:{namespace}"] = {'added': sorted(added), 'removed': sorted(removed)}
+        affected |= reverse.referencing(added | removed, namespace)
+
+    usage = UsageIndex(index, languages, cache)
+    usage.build(sorted(affected))
+    report.evaluated = sorted(relative_to_base(p) for p in affected)
+
+    all_changed = set()
+    for added, removed in changed_keys.values():
+        all_changed |= added | removed
+    variants = {v for key in all_changed for v in key_variants(key)}
+    source_set = set(sources)
+    for path in sorted(affected):
+        relevant = set()
+        before = lookups_at(ref, path, index.config) if path in source_set else set()
+        for site in usage.sites(path):
+            key = lookup_order(site, index.config)[0]
+            added = path in source_set and _signature(site, index.config) not in before
+            if added or key in variants:
+                relevant.add((site.file, site.line, site.column, site.key))
+            elif site.dynamic:
+                pattern = glob_to_regex(template_to_pattern(key), subtree=site.return_objects)
+                if any(pattern.fullmatch(k) for k in all_changed):
+                    relevant.add((site.file, site.line, site.column, site.key))
+        for lang, file, line, column, key in sorted(usage.missing([path])):
+            if (file, line, column, key) in relevant:
+                report.missing.append({'lang': lang, 'key': key, 'location': f"{file}:{line}:{column}"})
+
+    for (lang, namespace), (added, _) in sorted(changed_keys.items()):
+        if lang not in languages:
+            continue
+        data = index.entry(lang, namespace)
+        used = usage.used(lang, namespace)
+        for key in sorted(added):
+            if data and key in data.leaves and key not in used:
+                report.unused.append({'lang': lang, 'namespace': namespace, 'key': key})
+
+    cache.save()
+    report.namespaces_loaded = sum(1 for _ in index.loaded())
+    report.extracted = cache.extracted
+    report.elapsed_ms = (time.perf_counter() - started) * 1000
+    return report
@@ -0,0 +1,180 @@
+"""
+Per-run change journal of locale writes
+
+Every real (non --dry-run) save through LocaleWriter is recorded as a JSON
+Patch against the file as it was just before the write. The journal of a
+run is one small JSON file under .cache/translation-tools/journal/, named
+after the run id, and can be
+
+- replayed: its patches applied, in bulk, to another checkout (each file
+  is read and written once, however many journals touch it);
+- undone: the inverse patches applied to only the files the run wrote.
+
+Patches test the values they overwrite, so both refuse to touch a file
+that has changed since and report the conflict instead.
+
+Undo is byte-exact. Files are written in the canonical layout
+(serialize.write_locale), so a file that was not canonical before the run
+(hand-edited indentation, a comma on its own line, CRLF) also has its
+exact text stored with its first entry. When the inverse patches bring
+the data back to what that text holds, undo writes the text itself.
+"""
+
+import copy
+import json
+import os
+import sys
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from .paths import BASE_DIR, relative_to_base
+from .patch import Operation, PatchConflict, apply_patch, invert, make_patch
+from .serialize import dumps, write_locale
+
+JOURNAL_DIR = BASE_DIR / '.cache' / 'translation-tools' / 'journal'
+JOURNAL_VERSION = 1
+
+
+def new_run_id() -> str:
+    return f"{datetime.now().strftime('%Y%m%d-%H%M%S')}-{os.getpid()}"
+
+
+class Journal:
+    """Patches written by one run, flushed to disk after every recorded save"""
+
+    def __init__(self, run_id: Optional[str] = None, directory: Path = JOURNAL_DIR,
+                 script: Optional[str] = None):
+        self.run_id = run_id or new_run_id()
+        self.path = directory / f"{self.run_id}.json"
+        self.script = script if script is not None else relative_to_base(Path(sys.argv[0]).resolve())
+        self.created = datetime.now().isoformat(timespec='seconds')
+        self.entries: List[dict] = []
+
+    def record(self, path: Path, before: Optional[dict], after: dict,
+               newline: Tuple[Optional[bool], bool] = (True, True), original: Optional[str] = None) -> int:
+        """Record the write of path (before is None for a new file); returns the operation count
+
+        newline says whether the file ended with a newline before and after
+        the write, and original is the file's text if it was not canonical
+        (see original_text), so replay and undo reproduce it byte for byte.
+        """
+        ops = make_patch(before, after)
+        if ops or newline[0] != newline[1]:
+            file = relative_to_base(path)
+            # the script may keep mutating `after`; the journal keeps what was written
+            entry = {'file': file, 'ops': copy.deepcopy(ops), 'newline': list(newline)}
+            if original is not None and not any(e['file'] == file for e in self.entries):
+                entry['original'] = original  # only the run's first write matters to undo
+            self.entries.append(entry)
+            self.flush()
+        return len(ops)
+
+    def to_dict(self) -> dict:
+        return {
+            'version': JOURNAL_VERSION,
+            'run_id': self.run_id,
+            'script': self.script,
+            'created': self.created,
+            'files': self.entries,
+        }
+
+    def flush(self):
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self.path.with_suffix(f'.{os.getpid()}.tmp')
+        with open(tmp, 'w', encoding='utf-8') as f:
+            json.dump(self.to_dict(), f, ensure_ascii=False, indent=2)
+            f.write('\n')
+        os.replace(tmp, self.path)
+
+
+def journal_path(ref: str, directory: Path = JOURNAL_DIR) -> Path:
+    """A journal file given as a path or as a run id"""
+    path = Path(ref)
+    if path.suffix == '.json' or path.exists():
+        return path
+    return directory / f"{ref}.json"
+
+
+def load_journal(path: Path) -> dict:
+    with open(path, 'r', encoding='utf-8') as f:
+        data = json.load(f)
+    if data.get('version') != JOURNAL_VERSION:
+        raise ValueError(f"{path}: unsupported journal version {data.get('version')!r}")
+    return data
+
+
+def read_locale(path: Path) -> Tuple[Optional[dict], Optional[bool]]:
+    """Parsed file and whether its text ends with a newline (None, None if absent)"""
+    if not path.exists():
+        return None, None
+    text = path.read_text(encoding='utf-8')
+    return json.loads(text), text.endswith('\n')
+
+
+def original_text(path: Path, data: Optional[dict]) -> Optional[str]:
+    """The exact text of path if write_locale would not reproduce it from data, else None"""
+    if data is None:
+        return None
+    text = path.read_bytes().decode('utf-8')
+    canonical = dumps(data)
+    return None if text in (canonical, canonical[:-1]) else text
+
+
+def _write(path: Path, data: Optional[dict], newline: bool, original: Optional[str] = None):
+    if data is None:
+        if path.exists():
+            path.unlink()
+        return
+    if original is not None and json.dumps(json.loads(original)) == json.dumps(data):
+        path.write_bytes(original.encode('utf-8'))
+        return
+    write_locale(path, data, newline)
+
+
+def apply_files(changes: Iterable[Tuple[str, List[Operation], Optional[bool], Optional[str]]],
+                root: Path = BASE_DIR, write: bool = True) -> Dict[str, int]:
+    """Apply (file, ops, newline, original text) grouped per file; nothing is written unless every file applies
+
+    The newline and original of the last change to a file win.
+    """
+    grouped: Dict[str, List[Operation]] = {}
+    newlines: Dict[str, Optional[bool]] = {}
+    originals: Dict[str, Optional[str]] = {}
+    for file, ops, newline, original in changes:
+        grouped.setdefault(file, []).extend(ops)
+        newlines[file] = newline
+        originals[file] = original
+    results = {}
+    conflicts = []
+    for file, ops in grouped.items():
+        path = root / file
+        data, newline = read_locale(path)
+        if newlines[file] is not None:
+            newline = newlines[file]
+        try:
+            results[file] = (apply_patch(data, ops), newline is not False, len(ops))
+        except PatchConflict as e:
+            conflicts.append(f"{file}: {e}")
+    if conflicts:
+        raise PatchConflict('\n'.join(conflicts))
+    if write:
+        for file, (data, newline, _) in results.items():
+            _write(root / file, data, newline, originals[file])
+    return {file: count for file, (_, _, count) in results.items()}
+
+
+def replay(journals: List[dict], root: Path = BASE_DIR, write: bool = True) -> Dict[str, int]:
+    """Apply the journals' patches in order; returns operations applied per file"""
+    return apply_files(((entry['file'], entry['ops'], entry['newline'][1], None) for journal in journals
+                        for entry in journal['files']), root, write)
+
+
+def undo(journal: dict, root: Path = BASE_DIR, write: bool = True) -> Dict[str, int]:
+    """Apply the inverse of a journal, last write first, to only the files it touched"""
+    return apply_files(((entry['file'], invert(entry['ops']), entry['newline'][0], entry.get('original'))
+                        for entry in reversed(journal['files'])), root, write)
+
+
+def list_journals(directory: Path = JOURNAL_DIR) -> List[dict]:
+    return [load_journal(path) for path in sorted(directory.glob('*.json'))] if directory.is_dir() else []
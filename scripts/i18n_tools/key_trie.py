@@ -0,0 +1,172 @@
+"""
+Prefix trie over dot-separated translation keys
+
+Dynamic keys such as t(`half_life.units.${unit}`) cannot be looked up
+directly. They are turned into glob patterns (`half_life.units.*`) and
+matched segment by segment against a trie of the namespace's keys, so a
+pattern costs O(prefix length + matches) rather than a scan of every key.
+A `*` matches within one key segment, never across a dot.
+"""
+
+import re
+from typing import Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+WILDCARD = '*'
+
+
+class _Node:
+    __slots__ = ('children', 'terminal')
+
+    def __init__(self):
+        self.children: Dict[str, '_Node'] = {}
+        self.terminal = False
+
+
+def template_to_pattern(template: str) -> str:
+    """Replace every ${...} expression in a template literal with `*`"""
+    out = []
+    i = 0
+    while i < len(template):
+        if template.startswith('${', i):
+            depth = 0
+            j = i + 1
+            while j < len(template):
+                if template[j] == '{':
+                    depth += 1
+                elif template[j] == '}':
+                    depth -= 1
+                    if depth == 0:
+                        break
+                j += 1
+            if not out or out[-1] != WILDCARD:
+                out.append(WILDCARD)
+            i = j + 1
+        else:
+            out.append(template[i])
+            i += 1
+    return ''.join(out)
+
+
+def static_prefix(pattern: str) -> str:
+    """Literal text before the first wildcard"""
+    return pattern.split(WILDCARD, 1)[0]
+
+
+def glob_to_regex(pattern: str, suffixes: Sequence[str] = (), subtree: bool = False) -> 're.Pattern':
+    """Whole-key regex equivalent to KeyTrie.match for one pattern"""
+    body = r'[^.]*'.join(re.escape(part) for part in pattern.split(WILDCARD))
+    if suffixes:
+        body += '(?:' + '|'.join(re.escape(s) for s in suffixes) + ')?'
+    if subtree:
+        body += r'(?:\..+)?'
+    return re.compile(body)
+
+
+def _segment_matcher(segment: str, suffixes: Sequence[str]):
+    """Predicate for one pattern segment; suffixes are optional endings (plural forms)"""
+    if WILDCARD not in segment and not suffixes:
+        return None
+    regex = glob_to_regex(segment, suffixes)
+    prefix = segment.split(WILDCARD, 1)[0]
+    return lambda name: name.startswith(prefix) and regex.fullmatch(name) is not None
+
+
+class KeyTrie:
+    """Trie of dot-notation keys supporting exact, prefix and glob queries"""
+
+    def __init__(self, keys: Iterable[str] = ()):
+        self._root = _Node()
+        self._size = 0
+        for key in keys:
+            self.add(key)
+
+    def __len__(self) -> int:
+        return self._size
+
+    def add(self, key: str):
+        node = self._root
+        for segment in key.split('.'):
+            node = node.children.setdefault(segment, _Node())
+        if not node.terminal:
+            node.terminal = True
+            self._size += 1
+
+    def remove(self, key: str) -> bool:
+        """Remove key, pruning empty branches; returns False if it was absent"""
+        path: List[Tuple[_Node, str]] = []
+        node = self._root
+        for segment in key.split('.'):
+            child = node.children.get(segment)
+            if child is None:
+                return False
+            path.append((node, segment))
+            node = child
+        if not node.terminal:
+            return False
+        node.terminal = False
+        self._size -= 1
+        for parent, segment in reversed(path):
+            child = parent.children[segment]
+            if child.terminal or child.children:
+                break
+            del parent.children[segment]
+        return True
+
+    def _find(self, key: str) -> Optional[_Node]:
+        node = self._root
+        for segment in key.split('.'):
+            node = node.children.get(segment)
+            if node is None:
+                return None
+        return node
+
+    def __contains__(self, key: str) -> bool:
+        node = self._find(key)
+        return node is not None and node.terminal
+
+    def _walk(self, node: _Node, path: str) -> Iterator[str]:
+        stack = [(node, path)]
+        while stack:
+            current, current_path = stack.pop()
+            if current.terminal:
+                yield current_path
+            for name, child in current.children.items():
+                stack.append((child, f"{current_path}.{name}" if current_path else name))
+
+    def subtree(self, key: str) -> List[str]:
+        """Every key at or below key (what returnObjects would hand back)"""
+        node = self._find(key)
+        return sorted(self._walk(node, key)) if node else []
+
+    def match(self, pattern: str, include_subtrees: bool = False,
+              suffixes: Sequence[str] = ()) -> List[str]:
+        """
+        Concrete keys matching a glob pattern
+
+        include_subtrees also returns the leaves below a matched branch
+        (returnObjects: true); suffixes lets the last segment carry an
+        optional ending such as a plural form (`_one`, `_other`).
+        """
+        segments = pattern.split('.')
+        matchers = [_segment_matcher(seg, suffixes if i == len(segments) - 1 else ())
+                    for i, seg in enumerate(segments)]
+        results: List[str] = []
+        stack = [(self._root, 0, '')]
+        while stack:
+            node, depth, path = stack.pop()
+            if depth == len(segments):
+                if node.terminal:
+                    results.append(path)
+                if include_subtrees and node.children:
+                    results.extend(k for k in self._walk(node, path) if k != path)
+                continue
+            matcher = matchers[depth]
+            if matcher is None:
+                child = node.children.get(segments[depth])
+                if child is not None:
+                    stack.append((child, depth + 1, f"{path}.{segments[depth]}" if path else segments[depth]))
+                continue
+            for name, child in node.children.items():
+                if matcher(name):
+                    stack.append((child, depth + 1, f"{path}.{name}" if path else name))
+        return sorted(set(results))
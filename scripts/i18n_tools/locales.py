@@ -0,0 +1,142 @@
+"""
+The language set as data, and per-locale processing in parallel
+
+Languages are the union of `supportedLngs` in src/i18n/config.ts and the
+directories under public/locales; English is the source. A configured
+language without a directory is scaffolded with every file English has,
+split namespaces included, each holding `{}` so the runtime keeps falling
+back to fallbackLng for it until values are added. Until then the locale
+is not active: check, coverage and the other reports leave it out unless
+it is asked for with --lang, so an empty scaffold does not turn every key
+into a missing translation.
+
+process_locales() runs one worker process per target locale. A worker
+loads English and its own locale only, so adding a locale adds one
+worker instead of lengthening a shared loop: wall time follows the
+largest locale while there are CPUs to spare.
+"""
+
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from .flat_index import FlatIndex, active_languages, discover_languages, string_values
+from .i18n_config import I18nConfig, load_config
+from .overlay import LocaleWriter
+from .paths import LOCALES_DIR
+from .placeholders import check_namespace
+from .quality import KINDS, scan_namespace
+from .serialize import write_locale
+
+SOURCE_LANG = 'en'
+
+
+@dataclass(frozen=True)
+class LanguageSet:
+    configured: Tuple[str, ...]
+    present: Tuple[str, ...]
+    active: Tuple[str, ...] = ()
+
+    @property
+    def all(self) -> List[str]:
+        return sorted(set(self.configured) | set(self.present))
+
+    @property
+    def targets(self) -> List[str]:
+        return [lang for lang in self.all if lang != SOURCE_LANG]
+
+    @property
+    def unscaffolded(self) -> List[str]:
+        """Configured but without a directory"""
+        return sorted(set(self.configured) - set(self.present))
+
+    @property
+    def inactive(self) -> List[str]:
+        """Present but without any value yet (left out of checks by default)"""
+        return sorted(set(self.present) - set(self.active))
+
+    @property
+    def unconfigured(self) -> List[str]:
+        """Present on disk but missing from supportedLngs"""
+        return sorted(set(self.present) - set(self.configured))
+
+
+def language_set(config: Optional[I18nConfig] = None, locales_dir: Path = LOCALES_DIR) -> LanguageSet:
+    config = config or load_config()
+    return LanguageSet(tuple(config.supported_lngs), tuple(discover_languages(locales_dir)),
+                       tuple(active_languages(locales_dir)))
+
+
+def scaffold(lang: str, writer: LocaleWriter, locales_dir: Path = LOCALES_DIR) -> List[Path]:
+    """Create every English file that lang lacks as an empty object; returns the new files"""
+    if lang == SOURCE_LANG:
+        raise ValueError("the source language cannot be scaffolded")
+    source_dir = locales_dir / SOURCE_LANG
+    created = []
+    for source in sorted(source_dir.rglob('*.json')):
+        path = locales_dir / lang / source.relative_to(source_dir)
+        if not path.exists():
+            writer.save(path, {}, write_locale)
+            created.append(path)
+    return created
+
+
+@dataclass
+class LocaleSummary:
+    lang: str
+    files: int = 0
+    source_files: int = 0
+    values: int = 0
+    source_values: int = 0
+    quality: Dict[str, int] = field(default_factory=dict)
+    placeholder_mismatches: int = 0
+    seconds: float = 0.0
+
+    @property
+    def coverage(self) -> int:
+        return self.values * 100 // self.source_values if self.source_values else 100
+
+    def to_dict(self) -> dict:
+        return {'lang': self.lang, 'files': self.files, 'source_files': self.source_files,
+                'values': self.values, 'source_values': self.source_values, 'coverage': self.coverage,
+                'quality': self.quality, 'placeholder_mismatches': self.placeholder_mismatches,
+                'seconds': round(self.seconds, 3)}
+
+
+def summarize_locale(job: Tuple[str, Path, I18nConfig]) -> LocaleSummary:
+    """Everything about one locale measured against English (runs in a worker)"""
+    started = time.perf_counter()
+    lang, locales_dir, config = job
+    index = FlatIndex(locales_dir, config)
+    summary = LocaleSummary(lang, quality=dict.fromkeys(KINDS, 0))
+    summary.source_files = sum(1 for _ in (locales_dir / SOURCE_LANG).rglob('*.json'))
+    summary.files = sum(1 for _ in (locales_dir / lang).rglob('*.json'))
+    for namespace in index.namespaces(SOURCE_LANG):
+        source = index.entry(SOURCE_LANG, namespace)
+        target = index.entry(lang, namespace)
+        sources = {key for leaf, value in source.leaves.items() for key, _ in string_values(leaf, value)}
+        summary.source_values += len(sources)
+        if target is None:
+            continue
+        summary.values += sum(1 for leaf, value in target.leaves.items()
+                              for key, text in string_values(leaf, value) if key in sources and text)
+        for finding in scan_namespace(index, lang, namespace).findings:
+            summary.quality[finding.kind] += 1
+        summary.placeholder_mismatches += len(check_namespace(index, namespace, [lang]))
+    summary.seconds = time.perf_counter() - started
+    return summary
+
+
+def process_locales(languages: List[str], locales_dir: Path = LOCALES_DIR,
+                    config: Optional[I18nConfig] = None, workers: Optional[int] = None) -> List[LocaleSummary]:
+    """summarize_locale for every target language, one worker process per locale"""
+    config = config or load_config()
+    jobs = [(lang, locales_dir, config) for lang in languages if lang != SOURCE_LANG]
+    workers = min(workers or os.cpu_count() or 1, len(jobs))
+    if workers <= 1:
+        return [summarize_locale(job) for job in jobs]
+    with ProcessPoolExecutor(workers) as pool:
+        return list(pool.map(summarize_locale, jobs))
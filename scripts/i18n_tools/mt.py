@@ -0,0 +1,298 @@
+"""
+Machine translation providers behind a batching, caching Translator
+
+The batch scripts synthesize missing values with word-substitution
+glossaries (translate_to_arabic, generate_translation, ...). A Provider
+turns a batch of English strings into one target language; Translator
+sits in front of it and
+
+- answers from a disk cache keyed by (source text, target language,
+  provider version) first, so a re-run sends no request for strings it
+  has already translated;
+- deduplicates what is left and cuts it into batches of provider.max_batch;
+- sends the batches concurrently over a bounded pool of keep-alive
+  connections (HttpProvider), retrying connection errors, 429 and 5xx
+  answers and responses that are not the expected JSON with exponential
+  backoff.
+
+HttpProvider speaks a minimal JSON protocol:
+
+    POST <url>  {"source": "en", "target": "ar", "texts": [...]}
+    200         {"translations": [...]}   (same length and order)
+
+mt_server.StandInServer implements it locally for tests. Scripts pick up a
+real backend from TRANSLATION_MT_URL (and TRANSLATION_MT_VERSION) and keep
+their glossary when it is unset; `translation-tools.py mt` translates every
+missing value in batches up front, after which the scripts' one-at-a-time
+calls are all cache hits.
+"""
+
+import http.client
+from abc import ABC, abstractmethod
+import json
+import os
+import queue
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+from urllib.parse import urlsplit
+
+from .paths import BASE_DIR
+from .provenance import note
+
+MT_CACHE_DIR = BASE_DIR / '.cache' / 'translation-tools' / 'mt'
+SOURCE_LANG = 'en'
+URL_ENV = 'TRANSLATION_MT_URL'
+VERSION_ENV = 'TRANSLATION_MT_VERSION'
+
+RETRY_STATUS = {429, 500, 502, 503, 504}
+
+
+class TranslationError(RuntimeError):
+    """A batch could not be translated after every retry"""
+
+
+class Provider(ABC):
+    """Translates batches of strings; version is part of every cache key"""
+
+    name = 'provider'
+    version = '1'
+    max_batch = 50
+    workers = 1
+    cacheable = True
+
+    @abstractmethod
+    def translate_batch(self, texts: Sequence[str], target_lang: str,
+                        source_lang: str = SOURCE_LANG) -> List[str]:
+        """One translation per text, in order; raises TranslationError"""
+
+    def close(self):
+        pass
+
+
+class GlossaryProvider(Provider):
+    """A script's own word-substitution function; local, so never cached"""
+
+    name = 'glossary'
+    cacheable = False
+
+    def __init__(self, glossary: Callable[[str], str]):
+        self.glossary = glossary
+
+    def translate_batch(self, texts, target_lang, source_lang=SOURCE_LANG):
+        return [self.glossary(text) for text in texts]
+
+
+class HttpProvider(Provider):
+    """JSON-over-HTTP backend with a bounded pool of keep-alive connections"""
+
+    name = 'http'
+
+    def __init__(self, url: str, version: str = '1', max_batch: int = 50, workers: int = 4,
+                 retries: int = 4, backoff: float = 0.5, timeout: float = 30.0):
+        parts = urlsplit(url)
+        if parts.scheme not in ('http', 'https') or not parts.hostname:
+            raise ValueError(f"not an http(s) URL: {url}")
+        self.url = url
+        self.version = version
+        self.max_batch = max_batch
+        self.workers = workers
+        self.retries = retries
+        self.backoff = backoff
+        self.timeout = timeout
+        self.requests = 0
+        self._lock = threading.Lock()
+        self._scheme = parts.scheme
+        self._host = parts.hostname
+        self._port = parts.port
+        self._path = (parts.path or '/') + (f"?{parts.query}" if parts.query else '')
+        # None slots are connected lazily; at most `workers` connections exist and
+        # the most recently used (still open) one is handed out first
+        self._pool: 'queue.LifoQueue[Optional[http.client.HTTPConnection]]' = queue.LifoQueue()
+        for _ in range(workers):
+            self._pool.put(None)
+
+    def _connect(self) -> http.client.HTTPConnection:
+        cls = http.client.HTTPSConnection if self._scheme == 'https' else http.client.HTTPConnection
+        return cls(self._host, self._port, timeout=self.timeout)
+
+    def _post(self, conn: http.client.HTTPConnection, body: bytes) -> Tuple[int, bytes, Optional[str]]:
+        with self._lock:
+            self.requests += 1
+        conn.request('POST', self._path, body, {'Content-Type': 'application/json'})
+        response = conn.getresponse()
+        return response.status, response.read(), response.getheader('Retry-After')
+
+    @staticmethod
+    def _translations(payload: bytes, count: int) -> List[str]:
+        """The translations of a 200 response; ValueError if it is not what the protocol promises"""
+        data = json.loads(payload)
+        translations = data.get('translations') if isinstance(data, dict) else None
+        if not isinstance(translations, list) or len(translations) != count \
+                or not all(isinstance(t, str) for t in translations):
+            raise ValueError(f"expected {count} translations")
+        return translations
+
+    def translate_batch(self, texts, target_lang, source_lang=SOURCE_LANG):
+        body = json.dumps({'source': source_lang, 'target': target_lang, 'texts': list(texts)},
+                          ensure_ascii=False).encode('utf-8')
+        conn = self._pool.get()
+        try:
+            for attempt in range(self.retries + 1):
+                delay = self.backoff * 2 ** attempt
+                try:
+                    conn = conn or self._connect()
+                    status, payload, retry_after = self._post(conn, body)
+                except (OSError, http.client.HTTPException) as e:
+                    # the server may have closed an idle keep-alive connection
+                    if conn is not None:
+                        conn.close()
+                    conn = None
+                    error = f"{type(e).__name__}: {e}"
+                else:
+                    if status == 200:
+                        try:
+                            return self._translations(payload, len(texts))
+                        except ValueError as e:  # JSONDecodeError included; a proxy's error page, say
+                            error = f"malformed response ({e})"
+                    else:
+                        error = f"HTTP {status}"
+                        if status not in RETRY_STATUS:
+                            break
+                    if retry_after and retry_after.isdigit():
+                        delay = max(delay, float(retry_after))
+                if attempt < self.retries:
+                    time.sleep(delay)
+            raise TranslationError(f"{self.url}: {error} ({len(texts)} texts)")
+        finally:
+            self._pool.put(conn)
+
+    def close(self):
+        for _ in range(self.workers):
+            conn = self._pool.get()
+            if conn is not None:
+                conn.close()
+            self._pool.put(None)
+
+
+class TranslationCache:
+    """
+    Append-only JSON-lines file of {version, target, source, text} records
+
+    Every finished batch is appended and flushed at once, so an interrupted
+    run keeps what it already paid for.
+    """
+
+    def __init__(self, path: Optional[Path]):
+        self.path = path
+        self._entries: Dict[Tuple[str, str, str], str] = {}
+        self._lock = threading.Lock()
+        if path and path.exists():
+            with open(path, 'r', encoding='utf-8') as f:
+                for line in f:
+                    try:
+                        record = json.loads(line)
+                        key = (record['source'], record['target'], record['version'])
+                        self._entries[key] = record['text']
+                    except (ValueError, KeyError, TypeError):
+                        continue  # a line cut short by an interrupted write
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, source: str, target_lang: str, version: str) -> Optional[str]:
+        return self._entries.get((source, target_lang, version))
+
+    def put_many(self, items: Iterable[Tuple[str, str]], target_lang: str, version: str):
+        lines = []
+        with self._lock:
+            for source, text in items:
+                self._entries[(source, target_lang, version)] = text
+                lines.append(json.dumps({'version': version, 'target': target_lang, 'source': source,
+                                         'text': text}, ensure_ascii=False))
+            if self.path and lines:
+                self.path.parent.mkdir(parents=True, exist_ok=True)
+                with open(self.path, 'a', encoding='utf-8') as f:
+                    f.write('\n'.join(lines) + '\n')
+
+
+class Translator:
+    """Cache first, then concurrent batches through the provider"""
+
+    def __init__(self, provider: Provider, cache: Optional[TranslationCache] = None):
+        self.provider = provider
+        if cache is None:
+            cache = TranslationCache(MT_CACHE_DIR / f"{provider.name}.jsonl" if provider.cacheable else None)
+        self.cache = cache
+        self.cached = 0
+        self.translated = 0
+        self.batches = 0
+
+    @classmethod
+    def from_env(cls) -> Optional['Translator']:
+        """Translator for the HttpProvider at $TRANSLATION_MT_URL, or None when it is unset"""
+        url = os.environ.get(URL_ENV)
+        return cls(HttpProvider(url, os.environ.get(VERSION_ENV, '1'))) if url else None
+
+    @property
+    def origin(self) -> str:
+        """Provenance origin of what this translator returns"""
+        return f"mt:{self.provider.name}@{self.provider.version}"
+
+    def translate_many(self, texts: Iterable[str], target_lang: str,
+                       source_lang: str = SOURCE_LANG) -> Dict[str, str]:
+        """source -> translation for every distinct text"""
+        version = self.provider.version
+        result: Dict[str, str] = {}
+        missing: List[str] = []
+        seen = set()
+        for text in texts:
+            if text in seen:
+                continue
+            seen.add(text)
+            hit = self.cache.get(text, target_lang, version)
+            if hit is None:
+                missing.append(text)
+            else:
+                result[text] = note(hit, self.origin, target_lang)
+                self.cached += 1
+        if not missing:
+            return result
+
+        size = self.provider.max_batch
+        batches = [missing[i:i + size] for i in range(0, len(missing), size)]
+
+        def run(batch: List[str]) -> List[str]:
+            translations = self.provider.translate_batch(batch, target_lang, source_lang)
+            if self.provider.cacheable:
+                self.cache.put_many(zip(batch, translations), target_lang, version)
+            return translations
+
+        workers = min(self.provider.workers, len(batches))
+        if workers <= 1:
+            done = map(run, batches)
+        else:
+            with ThreadPoolExecutor(workers) as pool:
+                done = list(pool.map(run, batches))
+        for batch, translations in zip(batches, done):
+            for source, text in zip(batch, translations):
+                result[source] = note(text, self.origin, target_lang)
+        self.batches += len(batches)
+        self.translated += len(missing)
+        return result
+
+    def translate(self, text: str, target_lang: str, source_lang: str = SOURCE_LANG) -> str:
+        return self.translate_many([text], target_lang, source_lang)[text]
+
+    def glossary(self, target_lang: str) -> Callable[[str], str]:
+        """One-string callable in the shape of the scripts' glossaries (e.g. for TranslationMemory.fill)"""
+        return lambda text: self.translate(text, target_lang)
+
+    def summary(self) -> str:
+        return (f"Machine translation ({self.provider.name} v{self.provider.version}): "
+                f"{self.translated} translated in {self.batches} batches, {self.cached} from cache")
+
+    def close(self):
+        self.provider.close()
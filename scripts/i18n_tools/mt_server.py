@@ -0,0 +1,102 @@
+"""
+Local stand-in for a machine translation backend
+
+Speaks HttpProvider's protocol over HTTP/1.1 keep-alive and "translates"
+by tagging each text with its target language ("[AR] Total Cost"), which
+the quality scan reports as untranslated, so nothing it produces can pass
+for a real translation. It counts requests, texts and connections, and
+can answer the next N requests with 503, or with a 200 whose body is not
+JSON, to exercise retries.
+"""
+
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Callable, Optional
+
+
+def tag_translation(text: str, target_lang: str) -> str:
+    return f"[{target_lang.upper()}] {text}"
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+    server: 'StandInServer'
+
+    def setup(self):
+        super().setup()
+        with self.server.lock:
+            self.server.connections += 1
+
+    def _send(self, status: int, payload: dict, body: Optional[bytes] = None):
+        body = body if body is not None else json.dumps(payload, ensure_ascii=False).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_POST(self):
+        body = self.rfile.read(int(self.headers.get('Content-Length') or 0))
+        server = self.server
+        with server.lock:
+            server.requests += 1
+            failing = server.fail_next > 0
+            if failing:
+                server.fail_next -= 1
+            garbled = not failing and server.garble_next > 0
+            if garbled:
+                server.garble_next -= 1
+        if failing:
+            self._send(503, {'error': 'unavailable'})
+            return
+        if garbled:
+            self._send(200, {}, b'<html>Bad Gateway</html>')
+            return
+        try:
+            request = json.loads(body)
+            texts, target = request['texts'], request['target']
+        except (ValueError, KeyError, TypeError):
+            self._send(400, {'error': 'expected {"source", "target", "texts"}'})
+            return
+        with server.lock:
+            server.texts += len(texts)
+        self._send(200, {'translations': [server.translate(text, target) for text in texts]})
+
+    def log_message(self, format, *args):
+        if self.server.verbose:
+            super().log_message(format, *args)
+
+
+class StandInServer(ThreadingHTTPServer):
+    """Threaded stand-in MT server; use as a context manager to run it in the background"""
+
+    daemon_threads = True
+
+    def __init__(self, port: int = 0, host: str = '127.0.0.1',
+                 translate: Callable[[str, str], str] = tag_translation, verbose: bool = False):
+        super().__init__((host, port), _Handler)
+        self.translate = translate
+        self.verbose = verbose
+        self.lock = threading.Lock()
+        self.requests = 0
+        self.texts = 0
+        self.connections = 0
+        self.fail_next = 0
+        self.garble_next = 0
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def url(self) -> str:
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}/translate"
+
+    def __enter__(self) -> 'StandInServer':
+        self._thread = threading.Thread(target=self.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self.shutdown()
+        self.server_close()
+        self._thread.join()
@@ -0,0 +1,213 @@
+"""
+Copy-on-write overlays over locale trees, and a dry-run mode for writers
+
+A CowDict starts as a shallow copy of one level of a loaded tree and wraps
+each child dict only when it is read, so the loaded tree itself is never
+modified and unread subtrees stay shared. Diffing an overlay against its
+base skips every shared subtree by identity: previewing a batch costs
+memory and time proportional to what the batch touched, not to the corpus.
+
+LocaleWriter is what the batch scripts load and save through. Without
+--dry-run it reads and writes files exactly as before and records each
+write in the run's change journal (see journal.py) and the origin of
+every value it adds or changes in the provenance index (provenance.py);
+with it, saves are kept in memory and reported as per-file leaf diffs at
+the end.
+"""
+
+import json
+import os
+import sys
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+
+from .journal import Journal, original_text, read_locale
+from .paths import relative_to_base
+from .provenance import ProvenanceIndex, script_origin
+
+_MISSING = object()
+
+ADDED = 'added'
+REMOVED = 'removed'
+CHANGED = 'changed'
+
+
+class CowDict(dict):
+    """Dict view of a base dict; reads wrap child dicts lazily, writes never reach the base"""
+
+    __slots__ = ('base',)
+
+    def __init__(self, base: dict):
+        super().__init__(base)
+        self.base = base
+
+    def _wrap(self, key, value):
+        if type(value) is dict:
+            value = CowDict(value)
+            dict.__setitem__(self, key, value)
+        elif type(value) is list:
+            value = list(value)
+            dict.__setitem__(self, key, value)
+        return value
+
+    def __getitem__(self, key):
+        return self._wrap(key, dict.__getitem__(self, key))
+
+    def get(self, key, default=None):
+        return self[key] if key in self else default
+
+    def setdefault(self, key, default=None):
+        if key not in self:
+            self[key] = default
+        return self[key]
+
+    def items(self):
+        return [(key, self[key]) for key in list(dict.keys(self))]
+
+    def values(self):
+        return [self[key] for key in list(dict.keys(self))]
+
+    def copy(self):
+        return CowDict(self)
+
+
+@dataclass(frozen=True)
+class Change:
+    kind: str
+    key: str
+    old: Any = None
+    new: Any = None
+
+
+def _leaves(value: Any, prefix: str):
+    if isinstance(value, dict):
+        for key in dict.keys(value):
+            yield from _leaves(dict.__getitem__(value, key), f"{prefix}.{key}" if prefix else key)
+    else:
+        yield prefix, value
+
+
+def diff_trees(old: dict, new: dict, prefix: str = '') -> List[Change]:
+    """Leaf-level differences; subtrees shared by identity are skipped without a visit"""
+    changes: List[Change] = []
+    for key in list(dict.keys(old)) + [k for k in dict.keys(new) if k not in old]:
+        before = dict.get(old, key, _MISSING)
+        after = dict.get(new, key, _MISSING)
+        if before is after:
+            continue
+        path = f"{prefix}.{key}" if prefix else key
+        if isinstance(before, dict) and isinstance(after, dict):
+            changes.extend(diff_trees(before, after, path))
+            continue
+        if before is not _MISSING and after is not _MISSING \
+                and not isinstance(before, dict) and not isinstance(after, dict):
+            if before != after:
+                changes.append(Change(CHANGED, path, before, after))
+            continue
+        if before is not _MISSING:
+            changes.extend(Change(REMOVED, k, old=v) for k, v in _leaves(before, path))
+        if after is not _MISSING:
+            changes.extend(Change(ADDED, k, new=v) for k, v in _leaves(after, path))
+    return changes
+
+
+def _read_json(path: Path) -> dict:
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+class LocaleWriter:
+    """Loads and saves locale files for batch scripts; --dry-run only reports the diff"""
+
+    def __init__(self, dry_run: Optional[bool] = None, journal: Optional[Journal] = None,
+                 provenance: Optional[ProvenanceIndex] = None):
+        self.dry_run = '--dry-run' in sys.argv[1:] if dry_run is None else dry_run
+        self._bases: Dict[Path, dict] = {}
+        self._pending: Dict[Path, dict] = {}
+        self._journal = journal
+        self._provenance = provenance
+
+    @property
+    def journal(self) -> Journal:
+        if self._journal is None:
+            self._journal = Journal()
+        return self._journal
+
+    @property
+    def provenance(self) -> ProvenanceIndex:
+        if self._provenance is None:
+            self._provenance = ProvenanceIndex()
+        return self._provenance
+
+    def _base(self, path: Path) -> dict:
+        if path not in self._bases:
+            self._bases[path] = _read_json(path) if path.exists() else {}
+        return self._bases[path]
+
+    def load(self, path, missing_ok: bool = False) -> dict:
+        path = Path(path)
+        if not self.dry_run:
+            if missing_ok and not path.exists():
+                return {}
+            return _read_json(path)
+        if path in self._pending:
+            return self._pending[path]
+        if not missing_ok and not path.exists():
+            raise FileNotFoundError(path)
+        return CowDict(self._base(path))
+
+    def save(self, path, data: dict, write: Callable[[Path, dict], None]) -> bool:
+        """Hand data to write() and journal it, or keep it for the report in a dry run; True if written"""
+        path = Path(path)
+        if not self.dry_run:
+            before, newline = read_locale(path)
+            original = original_text(path, before)
+            write(path, data)
+            with open(path, 'rb') as f:
+                f.seek(-1, os.SEEK_END)
+                after_newline = f.read(1) == b'\n'
+            self.journal.record(path, before, data, (newline, after_newline), original)
+            self.provenance.record_write(path, before, data, script_origin(self.journal.script))
+            return True
+        self._base(path)
+        self._pending[path] = data
+        return False
+
+    def diff(self) -> Dict[Path, List[Change]]:
+        """Changes per file that a real run would write (dry run only)"""
+        result = {}
+        for path, data in sorted(self._pending.items()):
+            changes = diff_trees(self._bases[path], data)
+            if changes:
+                result[path] = changes
+        return result
+
+    def report(self, out: Callable[[str], None] = print, width: int = 80):
+        if not self.dry_run:
+            if self._provenance is not None:
+                self._provenance.save()
+            if self._journal is not None and self._journal.entries:
+                out(f"Journal: {relative_to_base(self._journal.path)} "
+                    f"(undo: python3 scripts/translation-tools.py undo {self._journal.run_id})")
+            return
+        diff = self.diff()
+        out("=" * 80)
+        out(f"DRY RUN - no files written ({len(diff)} would change)")
+        out("=" * 80)
+        for path, changes in diff.items():
+            counts = {kind: sum(1 for c in changes if c.kind == kind) for kind in (ADDED, CHANGED, REMOVED)}
+            created = '' if path.exists() else ' (new file)'
+            out(f"{relative_to_base(path)}{created}: +{counts[ADDED]} ~{counts[CHANGED]} -{counts[REMOVED]}")
+            for change in changes:
+                if change.kind == ADDED:
+                    out(f"  + {change.key} = {_short(change.new, width)}")
+                elif change.kind == REMOVED:
+                    out(f"  - {change.key} (was {_short(change.old, width)})")
+                else:
+                    out(f"  ~ {change.key}: {_short(change.old, width)} -> {_short(change.new, width)}")
+
+
+def _short(value: Any, width: int) -> str:
+    text = json.dumps(value, ensure_ascii=False)
+    return text if len(text) <= width else text[:width - 3] + '...'
@@ -0,0 +1,181 @@
+"""
+RFC 6902 JSON Patch for locale trees
+
+make_patch describes one file's change as add/remove/replace operations,
+each remove and replace preceded by a `test` of the value it overwrites.
+That makes every patch checkable against the file it is applied to and
+invertible without the original file. Objects are patched key by key only
+while applying the patch (and its inverse) reproduces the exact key
+order; otherwise the whole object is replaced, so patched files serialize
+byte for byte like the ones the batch scripts wrote.
+"""
+
+from typing import Any, List
+
+Operation = dict
+
+
+class PatchConflict(ValueError):
+    """A patch does not apply to the document it was given"""
+
+
+def escape(token: str) -> str:
+    return token.replace('~', '~0').replace('/', '~1')
+
+
+def unescape(token: str) -> str:
+    return token.replace('~1', '/').replace('~0', '~')
+
+
+def pointer(*tokens: str) -> str:
+    """JSON Pointer for a key path"""
+    return ''.join('/' + escape(str(token)) for token in tokens)
+
+
+def split_pointer(path: str) -> List[str]:
+    if path == '':
+        return []
+    if not path.startswith('/'):
+        raise PatchConflict(f"invalid JSON pointer '{path}'")
+    return [unescape(token) for token in path[1:].split('/')]
+
+
+def _same(a: Any, b: Any) -> bool:
+    """Equal as JSON, including object key order"""
+    if isinstance(a, dict) and isinstance(b, dict):
+        return list(a) == list(b) and all(_same(a[k], b[k]) for k in a)
+    if isinstance(a, list) and isinstance(b, list):
+        return len(a) == len(b) and all(_same(x, y) for x, y in zip(a, b))
+    return type(a) is type(b) and a == b
+
+
+def make_patch(old: Any, new: Any, path: str = '') -> List[Operation]:
+    """Operations turning old into new"""
+    if old is new:
+        return []
+    if isinstance(old, dict) and isinstance(new, dict):
+        kept = [key for key in old if key in new]
+        removed = [key for key in old if key not in new]
+        added = [key for key in new if key not in old]
+        # add appends keys, so only in-order edits can be expressed key by key
+        if list(old) == kept + removed and list(new) == kept + added:
+            ops: List[Operation] = []
+            for key in removed:
+                child = path + pointer(key)
+                ops.append({'op': 'test', 'path': child, 'value': old[key]})
+                ops.append({'op': 'remove', 'path': child})
+            for key in kept:
+                ops.extend(make_patch(old[key], new[key], path + pointer(key)))
+            for key in added:
+                ops.append({'op': 'add', 'path': path + pointer(key), 'value': new[key]})
+            return ops
+    if _same(old, new):
+        return []
+    return [{'op': 'test', 'path': path, 'value': old},
+            {'op': 'replace', 'path': path, 'value': new}]
+
+
+def _parent(doc: Any, tokens: List[str], path: str):
+    node = doc
+    for token in tokens[:-1]:
+        try:
+            node = node[int(token)] if isinstance(node, list) else node[token]
+        except (KeyError, IndexError, ValueError, TypeError):
+            raise PatchConflict(f"{path}: no such location") from None
+    if not isinstance(node, (dict, list)):
+        raise PatchConflict(f"{path}: parent is not an object or array")
+    return node
+
+
+def _index(node: list, token: str, path: str, append: bool = False) -> int:
+    if append and token == '-':
+        return len(node)
+    if not token.isdigit() or int(token) > len(node) - (0 if append else 1):
+        raise PatchConflict(f"{path}: array index out of range")
+    return int(token)
+
+
+def apply_patch(doc: Any, ops: List[Operation]) -> Any:
+    """Apply ops to doc in place; returns the (possibly replaced) root"""
+    for op in ops:
+        kind, path = op.get('op'), op.get('path')
+        if path is None:
+            raise PatchConflict(f"operation without path: {op}")
+        tokens = split_pointer(path)
+        if not tokens:
+            if kind == 'test':
+                if not _same(doc, op['value']):
+                    raise PatchConflict("/: test failed")
+            elif kind in ('add', 'replace'):
+                doc = op['value']
+            else:
+                raise PatchConflict(f"cannot {kind} the document root")
+            continue
+        parent = _parent(doc, tokens, path)
+        token = tokens[-1]
+        if kind == 'add':
+            if isinstance(parent, list):
+                parent.insert(_index(parent, token, path, append=True), op['value'])
+            else:
+                parent[token] = op['value']
+            continue
+        if isinstance(parent, list):
+            key = _index(parent, token, path)
+        elif token in parent:
+            key = token
+        else:
+            raise PatchConflict(f"{path}: no such key")
+        if kind == 'test':
+            if not _same(parent[key], op['value']):
+                raise PatchConflict(f"{path}: test failed")
+        elif kind == 'remove':
+            del parent[key]
+        elif kind == 'replace':
+            parent[key] = op['value']
+        else:
+            raise PatchConflict(f"{path}: unsupported operation '{kind}'")
+    return doc
+
+
+def invert(ops: List[Operation]) -> List[Operation]:
+    """Operations undoing ops (which must test every value they overwrite)"""
+    groups = []
+    tested = {}
+    for op in ops:
+        kind, path = op['op'], op['path']
+        if kind == 'test':
+            tested[path] = op['value']
+            continue
+        if kind == 'add':
+            groups.append([{'op': 'test', 'path': path, 'value': op['value']},
+                           {'op': 'remove', 'path': path} if path else
+                           {'op': 'replace', 'path': path, 'value': None}])
+        elif kind in ('remove', 'replace'):
+            if path not in tested:
+                raise PatchConflict(f"{path}: {kind} without a preceding test cannot be inverted")
+            old = tested.pop(path)
+            if kind == 'remove':
+                groups.append([{'op': 'add', 'path': path, 'value': old}])
+            else:
+                groups.append([{'op': 'test', 'path': path, 'value': op['value']},
+                               {'op': 'replace', 'path': path, 'value': old}])
+        else:
+            raise PatchConflict(f"{path}: cannot invert '{kind}'")
+    return [op for group in reversed(groups) for op in group]
+
+
+def set_nested_value(data: dict, key_path: str, value: Any):
+    """Set a dotted key, creating objects on the way; never overwrites a value with an object"""
+    keys = key_path.split('.')
+    current = data
+    for depth, key in enumerate(keys[:-1]):
+        if key not in current:
+            current[key] = {}
+        elif not isinstance(current[key], dict):
+            taken = '.'.join(keys[:depth + 1])
+            raise PatchConflict(f"cannot set '{key_path}': '{taken}' is already a "
+                                f"{type(current[key]).__name__} value, not an object")
+        current = current[key]
+    if isinstance(current.get(keys[-1]), dict) and not isinstance(value, dict):
+        raise PatchConflict(f"cannot set '{key_path}': it is an object of nested keys")
+    current[keys[-1]] = value
@@ -0,0 +1,30 @@
+"""Repository layout used by the translation tooling"""
+
+from pathlib import Path
+from typing import Optional
+
+
+def find_repo_root(start: Optional[Path] = None) -> Path:
+    """Walk up from start until a directory with package.json and public/locales is found"""
+    current = (start or Path.cwd()).resolve()
+    for candidate in (current, *current.parents):
+        if (candidate / "package.json").exists() and (candidate / "public" / "locales").is_dir():
+            return candidate
+    raise FileNotFoundError(f"No repository root (package.json + public/locales) above {current}")
+
+
+# Base paths
+BASE_DIR = find_repo_root(Path(__file__).parent)
+LOCALES_DIR = BASE_DIR / "public" / "locales"
+SRC_DIR = BASE_DIR / "src"
+COMPONENTS_DIR = SRC_DIR / "components" / "calculators"
+CALCULATOR_DATA_DIR = SRC_DIR / "data" / "calculators"
+I18N_CONFIG_FILE = SRC_DIR / "i18n" / "config.ts"
+
+
+def relative_to_base(path: Path, base: Path = BASE_DIR) -> str:
+    """Return a POSIX path relative to the repository root when possible"""
+    try:
+        return path.resolve().relative_to(base).as_posix()
+    except ValueError:
+        return path.as_posix()
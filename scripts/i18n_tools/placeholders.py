@@ -0,0 +1,188 @@
+"""
+Interpolation placeholder parity across languages
+
+A value's placeholders are the multiset of {{name}} interpolations in it
+({{- name}} and {{name, format}} count as `name`). For every key the
+multiset must be the same in all languages, otherwise i18next renders the
+raw braces (or drops a value) at runtime. Every language is compared with
+English; a plural form English does not have (ar `_few`, `_many`, ...)
+is compared with its `_other` form, and a zero/one/two form may leave out
+{{count}}.
+"""
+
+import json
+import re
+from bisect import bisect_right
+from collections import Counter
+from dataclasses import dataclass
+from json.decoder import WHITESPACE, scanstring
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from .flat_index import FlatIndex, namespace_for_file, string_values
+from .paths import relative_to_base
+from .resolver import PLURAL_FORMS
+
+SOURCE_LANG = 'en'
+
+PLACEHOLDER_RE = re.compile(r'\{\{\s*-?\s*([^{}\s,]+)[^{}]*\}\}')
+# Plural forms whose text usually spells the number out instead of using {{count}}
+COUNTLESS_FORMS = ('zero', 'one', 'two')
+_DECODER = json.JSONDecoder()
+
+
+def placeholders(value: str) -> Counter:
+    """Multiset of interpolation names in one value"""
+    if '{{' not in value:
+        return Counter()
+    return Counter(PLACEHOLDER_RE.findall(value))
+
+
+@dataclass(frozen=True)
+class Mismatch:
+    namespace: str
+    key: str
+    lang: str
+    reference_key: str
+    missing: Tuple[str, ...]
+    extra: Tuple[str, ...]
+    value: str
+    file: Optional[str]
+    line: Optional[int] = None
+
+    def to_dict(self) -> dict:
+        return {
+            'namespace': self.namespace,
+            'key': self.key,
+            'lang': self.lang,
+            'reference_key': self.reference_key,
+            'missing': list(self.missing),
+            'extra': list(self.extra),
+            'value': self.value,
+            'location': f"{self.file}:{self.line}" if self.line else self.file,
+        }
+
+
+def key_lines(text: str) -> Dict[str, int]:
+    """1-based line of every key path in a JSON document, in the notation of
+    flatten() and string_values() (a.b, list[0])"""
+    newlines = [m.start() for m in re.finditer('\n', text)]
+    lines: Dict[str, int] = {}
+
+    def skip(pos: int) -> int:
+        return WHITESPACE.match(text, pos).end()
+
+    def scan(pos: int, key: str) -> int:
+        pos = skip(pos)
+        lines.setdefault(key, bisect_right(newlines, pos) + 1)
+        if text[pos] == '{':
+            pos = skip(pos + 1)
+            while text[pos] != '}':
+                line = bisect_right(newlines, pos) + 1
+                name, pos = scanstring(text, pos + 1)
+                child = f"{key}.{name}" if key else name
+                lines[child] = line
+                pos = skip(scan(skip(pos) + 1, child))  # past ':' and the value
+                if text[pos] == ',':
+                    pos = skip(pos + 1)
+            return pos + 1
+        if text[pos] == '[':
+            pos = skip(pos + 1)
+            index = 0
+            while text[pos] != ']':
+                pos = skip(scan(pos, f"{key}[{index}]"))
+                index += 1
+                if text[pos] == ',':
+                    pos = skip(pos + 1)
+            return pos + 1
+        return _DECODER.raw_decode(text, pos)[1]
+
+    try:
+        scan(0, '')
+    except (ValueError, IndexError):
+        return {}
+    lines.pop('', None)
+    return lines
+
+
+def key_line(path: Path, key: str, cache: Optional[Dict[Path, Dict[str, int]]] = None) -> Optional[int]:
+    """1-based line of the flat key in path (None when unreadable); cache maps path to key_lines"""
+    cache = {} if cache is None else cache
+    if path not in cache:
+        try:
+            cache[path] = key_lines(path.read_text(encoding='utf-8'))
+        except OSError:
+            cache[path] = {}
+    return cache[path].get(key)
+
+
+def _plural_form(key: str) -> Optional[Tuple[str, str]]:
+    base, sep, form = key.rpartition('_')
+    if sep and form in PLURAL_FORMS['ar']:
+        return base, form
+    return None
+
+
+def _strings(data) -> Dict[str, str]:
+    if data is None:
+        return {}
+    values = {}
+    for leaf, value in data.leaves.items():
+        values.update(string_values(leaf, value))
+    return values
+
+
+def check_namespace(index: FlatIndex, namespace: str,
+                    languages: Optional[List[str]] = None) -> List[Mismatch]:
+    """Every key of namespace whose placeholders differ from the source language"""
+    languages = languages or index.languages()
+    reference = _strings(index.entry(SOURCE_LANG, namespace))
+    if not reference:
+        return []
+    mismatches = []
+    lines: Dict[Path, Dict[str, int]] = {}
+    for lang in languages:
+        if lang == SOURCE_LANG:
+            continue
+        data = index.entry(lang, namespace)
+        for key, value in _strings(data).items():
+            plural = _plural_form(key)
+            ref_key = key
+            if key not in reference and plural:
+                ref_key = f"{plural[0]}_other"
+            if ref_key not in reference:
+                continue
+            found, expected = placeholders(value), placeholders(reference[ref_key])
+            if found == expected:
+                continue
+            missing = expected - found
+            if plural and plural[1] in COUNTLESS_FORMS:
+                del missing['count']
+            extra = found - expected
+            if not missing and not extra:
+                continue
+            path = data.sources.get(key.split('[', 1)[0])
+            mismatches.append(Mismatch(
+                namespace, key, lang, ref_key,
+                tuple(sorted(missing.elements())), tuple(sorted(extra.elements())), value,
+                relative_to_base(path) if path else None, key_line(path, key, lines) if path else None))
+    return mismatches
+
+
+def check(index: Optional[FlatIndex] = None, languages: Optional[List[str]] = None,
+          namespaces: Optional[Iterable[str]] = None) -> List[Mismatch]:
+    """Placeholder mismatches in the given namespaces (default: all)"""
+    index = index or FlatIndex()
+    languages = languages or index.languages()
+    if namespaces is None:
+        namespaces = sorted({ns for lang in languages for ns in index.namespaces(lang)})
+    mismatches = []
+    for namespace in namespaces:
+        mismatches.extend(check_namespace(index, namespace, languages))
+    return mismatches
+
+
+def namespaces_for_files(index: FlatIndex, paths: Iterable[Path]) -> List[str]:
+    """Namespaces owning the given locale files (for checking a single write)"""
+    owners = {namespace_for_file(Path(p).resolve(), index.config, index.locales_dir) for p in paths}
+    return sorted({owner[1] for owner in owners if owner})
@@ -0,0 +1,145 @@
+"""
+Precompressed siblings of the built locale files
+
+Every .json under the output directory (bundles, slices, manifests and the
+split files vite copied from public/locales) gets a .json.gz (gzip level 9)
+and a .json.br (Brotli quality 11) next to it, so the server can send the
+stored variant instead of deflating 100-300 KB per request (see the
+rewrite rules in public/.htaccess). Brotli needs the `brotli` package
+from scripts/requirements.txt, and the precompress command fails without
+it; with --no-brotli only .gz files are written and stale .br files are
+removed, so a sibling never disagrees with its source.
+
+Files are compressed in parallel. The content hash and sizes of every file
+are kept in .cache/translation-tools/precompress.json; a file whose hash is
+unchanged and whose siblings exist is skipped. Siblings whose .json is gone
+are deleted.
+"""
+
+import gzip
+import hashlib
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from .bundle import BUNDLE_DIR
+from .paths import BASE_DIR, relative_to_base
+
+try:
+    import brotli
+except ImportError:  # scripts/requirements.txt; only --no-brotli runs without it
+    brotli = None
+
+STATE_FILE = BASE_DIR / '.cache' / 'translation-tools' / 'precompress.json'
+STATE_VERSION = 1
+GZIP_LEVEL = 9
+BROTLI_QUALITY = 11
+SUFFIXES = ('.gz', '.br')
+
+
+def _digest(content: bytes) -> str:
+    return hashlib.blake2b(content, digest_size=16).hexdigest()
+
+
+def _write(path: Path, content: bytes):
+    tmp = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+    tmp.write_bytes(content)
+    os.replace(tmp, path)
+
+
+@dataclass
+class Compressed:
+    path: str  # relative to the output directory
+    digest: str
+    size: int
+    gzip: int
+    br: Optional[int] = None
+    written: bool = False
+
+    def to_dict(self) -> dict:
+        return {'path': self.path, 'bytes': self.size, 'gzip': self.gzip, 'br': self.br, 'written': self.written}
+
+
+def compress_file(job: Tuple[Path, Path, bool]) -> Compressed:
+    """Write path.gz (and path.br when with_brotli) and return the sizes"""
+    path, out_dir, with_brotli = job
+    content = path.read_bytes()
+    packed = gzip.compress(content, compresslevel=GZIP_LEVEL, mtime=0)
+    _write(path.with_name(path.name + '.gz'), packed)
+    result = Compressed(path.relative_to(out_dir).as_posix(), _digest(content), len(content), len(packed),
+                        written=True)
+    if with_brotli:
+        packed = brotli.compress(content, quality=BROTLI_QUALITY)
+        _write(path.with_name(path.name + '.br'), packed)
+        result.br = len(packed)
+    return result
+
+
+def load_state(state_file: Path = STATE_FILE) -> Dict[str, dict]:
+    try:
+        data = json.loads(state_file.read_text(encoding='utf-8'))
+    except (OSError, ValueError):
+        return {}
+    return data.get('files', {}) if data.get('version') == STATE_VERSION else {}
+
+
+def save_state(state: Dict[str, dict], state_file: Path = STATE_FILE):
+    state_file.parent.mkdir(parents=True, exist_ok=True)
+    _write(state_file, json.dumps({'version': STATE_VERSION, 'files': dict(sorted(state.items()))},
+                                  ensure_ascii=False, indent=2).encode('utf-8') + b'\n')
+
+
+def remove_orphans(out_dir: Path, with_brotli: bool) -> List[Path]:
+    """Delete siblings without a .json (and .br files when Brotli is unavailable)"""
+    removed = []
+    for suffix in SUFFIXES:
+        for path in out_dir.rglob(f"*.json{suffix}"):
+            if not path.with_suffix('').exists() or (suffix == '.br' and not with_brotli):
+                path.unlink()
+                removed.append(path)
+    return removed
+
+
+def precompress(out_dir: Path = BUNDLE_DIR, workers: Optional[int] = None,
+                state_file: Optional[Path] = STATE_FILE,
+                with_brotli: Optional[bool] = None) -> Tuple[List[Compressed], List[Path]]:
+    """Compress every changed .json under out_dir; returns all files' sizes and the removed siblings"""
+    if not out_dir.is_dir():
+        raise FileNotFoundError(f"{out_dir} does not exist (run the build first)")
+    with_brotli = brotli is not None if with_brotli is None else with_brotli
+    state = load_state(state_file) if state_file else {}
+    sources = sorted(out_dir.rglob('*.json'))
+    results: List[Compressed] = []
+    jobs = []
+    for path in sources:
+        key = relative_to_base(path)
+        known = state.get(key)
+        siblings = [path.with_name(path.name + suffix) for suffix in SUFFIXES if with_brotli or suffix == '.gz']
+        if (known and (known['br'] is not None) == with_brotli and all(p.exists() for p in siblings)
+                and known['digest'] == _digest(path.read_bytes())):
+            results.append(Compressed(path.relative_to(out_dir).as_posix(), known['digest'], known['bytes'],
+                                      known['gzip'], known['br']))
+        else:
+            jobs.append((path, out_dir, with_brotli))
+
+    workers = min(workers or os.cpu_count() or 1, len(jobs)) if jobs else 1
+    if workers <= 1:
+        results.extend(compress_file(job) for job in jobs)
+    else:
+        with ProcessPoolExecutor(workers) as pool:
+            results.extend(pool.map(compress_file, jobs, chunksize=4))
+    removed = remove_orphans(out_dir, with_brotli)
+
+    if state_file:
+        prefix = relative_to_base(out_dir) + '/'
+        for key in [key for key in state if key.startswith(prefix)]:
+            del state[key]
+        for result in results:
+            state[relative_to_base(out_dir / result.path)] = {
+                'digest': result.digest, 'bytes': result.size, 'gzip': result.gzip, 'br': result.br}
+        save_state(state, state_file)
+    results.sort(key=lambda r: r.path)
+    return results, removed
@@ -0,0 +1,216 @@
+"""
+Provenance of translation values: who or what wrote each one
+
+translation-provenance.json, at the repository root and so never shipped
+with public/locales, maps (lang, namespace, key) to a short hash of the
+value and its origin:
+
+- human             reviewed or hand-written (e.g. `translation-tools.py import`)
+- script:<name>     written by a batch script from its own tables
+- key               derived from the key itself (translate_key_to_english)
+- glossary          word substitution (translate_to_arabic, ...)
+- tm                reused from the exact translation memory
+- mt:<name>@<ver>   machine translation provider
+
+An origin is only reported while the value still hashes the same, so any
+later edit (by hand, another script or an undo) invalidates it without
+bookkeeping, and `provenance --prune` drops such entries from the file.
+LocaleWriter records every leaf a run adds or changes: functions that
+produce values call note() (or are decorated with @noting), and values
+nobody noted are attributed to the script. The file has one header line
+with the origin table and one line per (lang, namespace), so git diffs
+stay readable.
+"""
+
+import functools
+import hashlib
+import json
+import os
+from pathlib import Path
+from typing import Callable, Dict, Iterator, Optional, Tuple
+
+from .flat_index import FlatIndex, flatten, namespace_for_file, string_values
+from .i18n_config import I18nConfig, load_config
+from .paths import BASE_DIR, LOCALES_DIR
+
+PROVENANCE_FILE = BASE_DIR / 'translation-provenance.json'
+PROVENANCE_VERSION = 1
+
+HUMAN = 'human'
+KEY = 'key'
+GLOSSARY = 'glossary'
+TM = 'tm'
+UNKNOWN = 'unknown'
+STALE = 'stale'
+
+# (lang or None, value text) -> origin, for what this process produced and has not written yet
+_noted: Dict[Tuple[Optional[str], str], str] = {}
+
+
+def note(value: str, origin: str, lang: Optional[str] = None) -> str:
+    """Remember where value came from for the next save that writes it (in lang, or any language)"""
+    if isinstance(value, str):
+        _noted[(lang, value)] = origin
+    return value
+
+
+def noted(value: str, lang: Optional[str] = None) -> Optional[str]:
+    return _noted.get((lang, value)) or _noted.get((None, value))
+
+
+def clear_notes():
+    _noted.clear()
+
+
+def noting(origin: str) -> Callable:
+    """Decorator: values the function returns are noted with origin
+
+    A result equal to the first argument (a glossary that found nothing to
+    substitute) produced nothing and is not noted.
+    """
+    def decorate(function: Callable[..., str]) -> Callable[..., str]:
+        @functools.wraps(function)
+        def wrapper(*args, **kwargs):
+            value = function(*args, **kwargs)
+            if not args or value != args[0]:
+                note(value, origin)
+            return value
+        return wrapper
+    return decorate
+
+
+def script_origin(script: str) -> str:
+    return f"script:{Path(script).name}"
+
+
+def value_hash(value: str) -> str:
+    return hashlib.blake2b(value.encode('utf-8'), digest_size=6).hexdigest()
+
+
+def _strings(tree: Optional[dict]) -> Dict[str, str]:
+    if not tree:
+        return {}
+    return {key: text for leaf, value in flatten(tree).items() for key, text in string_values(leaf, value)}
+
+
+class ProvenanceIndex:
+    """(lang, namespace, key) -> (value hash, origin), loaded on first use"""
+
+    def __init__(self, path: Path = PROVENANCE_FILE, locales_dir: Path = LOCALES_DIR,
+                 config: Optional[I18nConfig] = None):
+        self.path = path
+        self.locales_dir = locales_dir
+        self._config = config
+        self._entries: Optional[Dict[Tuple[str, str, str], Tuple[str, str]]] = None
+        self.dirty = False
+
+    @property
+    def config(self) -> I18nConfig:
+        if self._config is None:
+            self._config = load_config()
+        return self._config
+
+    @property
+    def entries(self) -> Dict[Tuple[str, str, str], Tuple[str, str]]:
+        if self._entries is None:
+            self._entries = {}
+            if self.path.exists():
+                self._load()
+        return self._entries
+
+    def _load(self):
+        with open(self.path, 'r', encoding='utf-8') as f:
+            header = json.loads(f.readline())
+            if header.get('version') != PROVENANCE_VERSION:
+                return
+            origins = header['origins']
+            for line in f:
+                if not line.strip():
+                    continue
+                row = json.loads(line)
+                lang, namespace = row['lang'], row['ns']
+                for key, (digest, origin) in row['values'].items():
+                    self._entries[(lang, namespace, key)] = (digest, origins[origin])
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    def get(self, lang: str, namespace: str, key: str, value: str) -> Optional[str]:
+        """Origin of value at key, or None if unknown or recorded for a different value"""
+        entry = self.entries.get((lang, namespace, key))
+        if entry is None or entry[0] != value_hash(value):
+            return None
+        return entry[1]
+
+    def status(self, lang: str, namespace: str, key: str, value: str) -> str:
+        """The origin, or STALE when the value changed since it was recorded, or UNKNOWN"""
+        entry = self.entries.get((lang, namespace, key))
+        if entry is None:
+            return UNKNOWN
+        return entry[1] if entry[0] == value_hash(value) else STALE
+
+    def record(self, lang: str, namespace: str, key: str, value: str, origin: str):
+        self.entries[(lang, namespace, key)] = (value_hash(value), origin)
+        self.dirty = True
+
+    def forget(self, lang: str, namespace: str, key: str):
+        if self.entries.pop((lang, namespace, key), None) is not None:
+            self.dirty = True
+
+    def record_write(self, path: Path, before: Optional[dict], after: dict, default_origin: str) -> int:
+        """Record the strings a write of path added or changed; returns how many"""
+        owner = namespace_for_file(Path(path), self.config, self.locales_dir)
+        if owner is None:
+            return 0
+        lang, namespace = owner
+        old = _strings(before)
+        new = _strings(after)
+        recorded = 0
+        for key, value in new.items():
+            if old.get(key) != value:
+                self.record(lang, namespace, key, value, noted(value, lang) or default_origin)
+                recorded += 1
+        for key in old.keys() - new.keys():
+            self.forget(lang, namespace, key)
+        return recorded
+
+    def values(self, index: FlatIndex, languages=None) -> Iterator[Tuple[str, str, str, str, str]]:
+        """(lang, namespace, key, value, status) for every string in the tree"""
+        for lang in languages or index.languages():
+            for namespace in index.namespaces(lang):
+                for leaf, value in index.entry(lang, namespace).leaves.items():
+                    for key, text in string_values(leaf, value):
+                        yield lang, namespace, key, text, self.status(lang, namespace, key, text)
+
+    def prune(self, index: FlatIndex) -> int:
+        """Drop entries whose value changed or no longer exists; returns how many"""
+        current = {}
+        for lang in {lang for lang, _, _ in self.entries}:
+            for namespace in index.namespaces(lang):
+                for leaf, value in index.entry(lang, namespace).leaves.items():
+                    for key, text in string_values(leaf, value):
+                        current[(lang, namespace, key)] = text
+        stale = [k for k, (digest, _) in self.entries.items()
+                 if k not in current or value_hash(current[k]) != digest]
+        for k in stale:
+            del self.entries[k]
+        if stale:
+            self.dirty = True
+        return len(stale)
+
+    def save(self):
+        if not self.dirty:
+            return
+        origins = sorted({origin for _, origin in self.entries.values()})
+        number = {origin: i for i, origin in enumerate(origins)}
+        rows: Dict[Tuple[str, str], Dict[str, list]] = {}
+        for (lang, namespace, key), (digest, origin) in sorted(self.entries.items()):
+            rows.setdefault((lang, namespace), {})[key] = [digest, number[origin]]
+        tmp = self.path.with_name(f"{self.path.name}.{os.getpid()}.tmp")
+        with open(tmp, 'w', encoding='utf-8') as f:
+            f.write(json.dumps({'version': PROVENANCE_VERSION, 'origins': origins}, ensure_ascii=False) + '\n')
+            for (lang, namespace), values in rows.items():
+                f.write(json.dumps({'lang': lang, 'ns': namespace, 'values': values},
+                                   ensure_ascii=False, separators=(',', ':')) + '\n')
+        os.replace(tmp, self.path)
+        self.dirty = False
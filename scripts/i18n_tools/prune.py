@@ -0,0 +1,154 @@
+"""
+Dead keys: what the shipped bundles can leave out
+
+A key is live in a language when anything can look it up there:
+
+- a t() call in src, static or template, as the usage index resolves it
+  (strictly per language, which is also what a fallback lookup reaches);
+- a registry nameKey/descriptionKey with {{slug}} filled in, and the
+  rich content CalculatorPage.tsx looks up for every calculator
+  (calc/<category>:<slug as snake_case>.faqs, .howItWorks, ...);
+- a quoted string in src that spells the key out (data tables such as
+  `{ name: 'star-distance.examples.proxima_centauri' }` passed to t later),
+  with plural forms of such a key;
+- a pattern in the allowlist, for lookups built at runtime that none of
+  the above can see (category names built from the category slug).
+
+Everything else is dead: keys of renamed calculators, the duplicate
+snake_case/kebab-case families the batch scripts wrote, and keys nobody
+used. live_keys() feeds bundle.build_bundles(keep=...), which writes
+pruned production bundles; the locale files themselves stay as they are.
+"""
+
+import fnmatch
+import re
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+from .extract import STRING_RE, CallSite, ExtractionCache, find_source_files
+from .flat_index import FlatIndex, NamespaceData
+from .paths import BASE_DIR
+from .registry import CalculatorEntry, load_registry
+from .resolver import PLURAL_FORMS
+from .usage import UsageIndex
+
+ALLOWLIST_FILE = BASE_DIR / 'translation-prune-allowlist.txt'
+# returnObjects lookups CalculatorPage.tsx makes under each calculator's content key
+PAGE_CONTENT = ('faqs', 'howItWorks', 'useCases', 'seoTips', 'commonMistakes')
+
+_PLURAL_SUFFIX_RE = re.compile(r'_(?:%s)$' % '|'.join(sorted({f for forms in PLURAL_FORMS.values() for f in forms})))
+
+
+def load_allowlist(path: Path = ALLOWLIST_FILE) -> List[str]:
+    """`namespace:key` glob patterns, one per line; # starts a comment"""
+    if not path.exists():
+        return []
+    patterns = []
+    for line in path.read_text(encoding='utf-8').splitlines():
+        line = line.split('#', 1)[0].strip()
+        if line:
+            patterns.append(line if ':' in line else f"*:{line}")
+    return patterns
+
+
+def allowed(namespace: str, key: str, patterns: List[str]) -> bool:
+    """A pattern matches the key itself or one of its parents (keeping the whole subtree)"""
+    parts = key.split('.')
+    candidates = [f"{namespace}:{'.'.join(parts[:i])}" for i in range(len(parts), 0, -1)]
+    return any(fnmatch.fnmatchcase(candidate, pattern) for pattern in patterns for candidate in candidates)
+
+
+def string_literals(paths: Iterable[Path]) -> Set[str]:
+    """Every quoted '...' or "..." string in the sources (template literals are t() business)"""
+    literals: Set[str] = set()
+    for path in paths:
+        for match in STRING_RE.finditer(path.read_text(encoding='utf-8')):
+            text = match.group(1) if match.group(1) is not None else match.group(2)
+            if text:
+                literals.add(text)
+    return literals
+
+
+def content_keys(slug: str) -> List[str]:
+    """The keys CalculatorPage.tsx tries for a calculator's rich content, in its order"""
+    keys = [slug.replace('-', '_'),
+            slug.replace('-calculator', '').replace('-', '_'),
+            slug.replace('-calculator', '').replace('_calculator', '').replace('-', '_')]
+    return list(dict.fromkeys(keys))
+
+
+def page_sites(entry: CalculatorEntry) -> List[CallSite]:
+    """The rich content lookups CalculatorPage.tsx makes for entry, in its order"""
+    return [CallSite(entry.file, entry.line, 1, f"calc/{entry.category}:{key}.{field}", (), return_objects=True)
+            for key in content_keys(entry.slug) for field in PAGE_CONTENT]
+
+
+def registry_sites(registry: List[CalculatorEntry]) -> Dict[Path, List[CallSite]]:
+    """Lookups made for every registry entry: nameKey/descriptionKey (calculatorTranslation.ts,
+    default namespace) and the page's rich content"""
+    sites: Dict[Path, List[CallSite]] = {}
+    for entry in registry:
+        found = sites.setdefault(BASE_DIR / entry.file, [])
+        for key in entry.registry_keys():
+            found.append(CallSite(entry.file, entry.line, 1, key, ()))
+        found.extend(page_sites(entry))
+    return sites
+
+
+def _literal(namespace: str, key: str, is_leaf: bool, literals: Set[str]) -> bool:
+    names = [key]
+    if is_leaf:
+        names.append(_PLURAL_SUFFIX_RE.sub('', key))
+    return any(name in literals or f"{namespace}:{name}" in literals for name in names)
+
+
+def literal_keys(data: NamespaceData, literals: Set[str]) -> Set[str]:
+    """Leaves a quoted string spells out, directly, without its plural suffix or through a parent"""
+    namespace = data.namespace
+    branches = {b for b in data.branches if '.' in b and _literal(namespace, b, False, literals)}
+    return {key for key in data.leaves
+            if _literal(namespace, key, True, literals) or any(key.startswith(f"{b}.") for b in branches)}
+
+
+@dataclass
+class NamespacePrune:
+    lang: str
+    namespace: str
+    keys: int
+    live: int
+    removed: List[str]
+
+    def to_dict(self) -> dict:
+        return {'lang': self.lang, 'namespace': self.namespace, 'keys': self.keys,
+                'live': self.live, 'removed': len(self.removed)}
+
+
+def live_keys(index: FlatIndex, languages: Optional[List[str]] = None,
+              cache: Optional[ExtractionCache] = None,
+              registry: Optional[List[CalculatorEntry]] = None,
+              sources: Optional[List[Path]] = None,
+              allowlist: Optional[List[str]] = None) -> Tuple[Dict[Tuple[str, str], Set[str]], List[NamespacePrune]]:
+    """Live flat keys per (lang, namespace), and what pruning removes from each namespace"""
+    languages = languages or index.languages()
+    sources = find_source_files() if sources is None else sources
+    registry = load_registry() if registry is None else registry
+    allowlist = load_allowlist() if allowlist is None else allowlist
+
+    usage = UsageIndex(index, languages, cache).build(sources)
+    for path, sites in registry_sites(registry).items():
+        usage.add_sites(path, sites)
+    literals = string_literals(sources)
+
+    keep: Dict[Tuple[str, str], Set[str]] = {}
+    results = []
+    for lang in languages:
+        for namespace in index.namespaces(lang):
+            data = index.entry(lang, namespace)
+            used = usage.used(lang, namespace)
+            live = (used & data.leaves.keys()) | literal_keys(data, literals)
+            live.update(key for key in data.leaves if allowed(namespace, key, allowlist))
+            keep[(lang, namespace)] = live
+            results.append(NamespacePrune(lang, namespace, len(data.leaves), len(live),
+                                          sorted(set(data.leaves) - live)))
+    return keep, results
@@ -0,0 +1,129 @@
+"""
+Single-pass quality scan of translated values
+
+Flags what the batch generators leave behind: "[AR] Words" placeholders,
+values copied verbatim from English, empty strings and values in a
+non-Latin language that are mostly Latin letters. Every value is visited
+once, with precompiled script regexes, and findings are yielded one
+namespace at a time so output starts before the whole tree is read.
+"""
+
+import re
+from dataclasses import dataclass, field
+from typing import Dict, Iterator, List, Optional
+
+from .flat_index import FlatIndex, string_values
+
+SOURCE_LANG = 'en'
+
+MARKER = 'marker'
+EMPTY = 'empty'
+IDENTICAL = 'identical'
+LATIN = 'latin'
+KINDS = (MARKER, EMPTY, IDENTICAL, LATIN)
+
+MARKER_RE = re.compile(r'\[[A-Z]{2}\]')
+# Interpolations, nested $t() references and markup are not prose
+NON_PROSE_RE = re.compile(r'\{\{[^}]*\}\}|\$t\([^)]*\)|<[^>]*>')
+LATIN_RE = re.compile(r'[A-Za-zÀ-ɏ]')
+SCRIPT_RES = {
+    'ar': re.compile(r'[؀-ۿݐ-ݿࢠ-ࣿﭐ-﷿ﹰ-﻿]'),
+    'he': re.compile(r'[\u0590-\u05ff\ufb1d-\ufb4f]'),
+}
+# Unit symbols and abbreviations (N, kW, Bar) are legitimately left in Latin
+SYMBOL_MAX_LETTERS = 3
+
+
+@dataclass(frozen=True)
+class Finding:
+    lang: str
+    namespace: str
+    key: str
+    kind: str
+    value: str
+    file: Optional[str] = None
+
+
+@dataclass
+class NamespaceFindings:
+    lang: str
+    namespace: str
+    values: int = 0
+    findings: List[Finding] = field(default_factory=list)
+
+    def to_dict(self) -> dict:
+        return {
+            'lang': self.lang,
+            'namespace': self.namespace,
+            'values': self.values,
+            'findings': [{'key': f.key, 'kind': f.kind, 'value': f.value, 'file': f.file}
+                         for f in self.findings],
+        }
+
+
+def classify(value: str, source: Optional[str], script: Optional[re.Pattern]) -> Optional[str]:
+    """The first problem found with one value, or None"""
+    if '[' in value and MARKER_RE.search(value):
+        return MARKER
+    if not value.strip():
+        return EMPTY
+    if script is None or not LATIN_RE.search(value):
+        return None
+    prose = NON_PROSE_RE.sub('', value)
+    latin = len(LATIN_RE.findall(prose))
+    if latin <= SYMBOL_MAX_LETTERS and ' ' not in prose.strip():
+        return None
+    if value == source:
+        return IDENTICAL
+    if latin > len(script.findall(prose)):
+        return LATIN
+    return None
+
+
+def scan_namespace(index: FlatIndex, lang: str, namespace: str) -> NamespaceFindings:
+    result = NamespaceFindings(lang, namespace)
+    data = index.entry(lang, namespace)
+    if data is None:
+        return result
+    source_data = index.entry(SOURCE_LANG, namespace) if lang != SOURCE_LANG else None
+    source_leaves = source_data.leaves if source_data else {}
+    script = SCRIPT_RES.get(lang.split('-')[0])
+    for leaf, value in data.leaves.items():
+        if isinstance(value, str):
+            result.values += 1
+            kind = classify(value, source_leaves.get(leaf), script)
+            if kind:
+                result.findings.append(_finding(index, data, leaf, leaf, kind, value))
+            continue
+        sources = dict(string_values(leaf, source_leaves.get(leaf)))
+        for key, text in string_values(leaf, value):
+            result.values += 1
+            kind = classify(text, sources.get(key), script)
+            if kind:
+                result.findings.append(_finding(index, data, leaf, key, kind, text))
+    return result
+
+
+def _finding(index: FlatIndex, data, leaf: str, key: str, kind: str, value: str) -> Finding:
+    path = data.sources.get(leaf)
+    return Finding(data.lang, data.namespace, key, kind, value,
+                   path.relative_to(index.locales_dir).as_posix() if path else None)
+
+
+def scan(index: Optional[FlatIndex] = None,
+         languages: Optional[List[str]] = None) -> Iterator[NamespaceFindings]:
+    """Findings per (language, namespace), yielded as each namespace is scanned"""
+    index = index or FlatIndex()
+    for lang in languages or index.languages():
+        for namespace in index.namespaces(lang):
+            yield scan_namespace(index, lang, namespace)
+
+
+def summarize(results: List[NamespaceFindings]) -> Dict[str, Dict[str, int]]:
+    """lang -> kind -> count"""
+    totals: Dict[str, Dict[str, int]] = {}
+    for result in results:
+        counts = totals.setdefault(result.lang, dict.fromkeys(KINDS, 0))
+        for finding in result.findings:
+            counts[finding.kind] += 1
+    return totals
@@ -0,0 +1,133 @@
+"""
+Calculator registry (src/data/calculators/*.ts) and component lookup
+
+Entries are read straight from the TypeScript object literals, and each
+componentName is mapped to its file the way src/utils/calculatorLoader.tsx
+does it: the explicit calculatorImports map first, then the category
+subdirectory, the components root and finally any directory.
+"""
+
+import os
+import re
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from .paths import CALCULATOR_DATA_DIR, COMPONENTS_DIR, SRC_DIR, relative_to_base
+
+NON_REGISTRY_FILES = ('types.ts', 'index.ts', 'categories.ts')
+IMPORTS_FILE = SRC_DIR / 'utils' / 'calculator-imports.ts'
+
+FIELD_RE = re.compile(r"""\b(slug|category|componentName|nameKey|descriptionKey)\s*:\s*"""
+                      r"""(?:'((?:[^'\\]|\\.)*)'|"((?:[^"\\]|\\.)*)")""")
+EXPLICIT_IMPORT_RE = re.compile(r"""['"](\w+)['"]\s*:\s*\(\)\s*=>\s*import\(\s*['"]([^'"]+)['"]\s*\)""")
+
+
+@dataclass(frozen=True)
+class CalculatorEntry:
+    """One calculator object from the registry"""
+    slug: str
+    category: str
+    component_name: str
+    name_key: Optional[str]
+    description_key: Optional[str]
+    file: str
+    line: int
+
+    def registry_keys(self) -> List[str]:
+        """nameKey/descriptionKey with {{slug}} filled in (see calculatorTranslation.ts)"""
+        return [key.replace('{{slug}}', self.slug)
+                for key in (self.name_key, self.description_key) if key]
+
+
+def _objects(content: str):
+    """(offset, text) of every top-level {...} literal, skipping braces inside strings"""
+    depth = 0
+    start = 0
+    quote = None
+    i = 0
+    while i < len(content):
+        char = content[i]
+        if quote:
+            if char == '\\':
+                i += 1
+            elif char == quote:
+                quote = None
+        elif char in '\'"`':
+            quote = char
+        elif char == '/' and content.startswith('//', i):
+            i = content.find('\n', i)
+            if i < 0:
+                break
+        elif char == '{':
+            if depth == 0:
+                start = i
+            depth += 1
+        elif char == '}' and depth:
+            depth -= 1
+            if depth == 0:
+                yield start, content[start:i + 1]
+        i += 1
+
+
+def parse_registry_source(content: str, file: str) -> List[CalculatorEntry]:
+    """Calculator entries in one registry module"""
+    entries = []
+    for offset, text in _objects(content):
+        fields: Dict[str, str] = {}
+        slug_offset = 0
+        for match in FIELD_RE.finditer(text):
+            if match.group(1) not in fields:
+                fields[match.group(1)] = match.group(2) if match.group(2) is not None else match.group(3)
+                if match.group(1) == 'slug':
+                    slug_offset = offset + match.start()
+        if 'slug' not in fields:
+            continue
+        entries.append(CalculatorEntry(
+            slug=fields['slug'],
+            category=fields.get('category', ''),
+            component_name=fields.get('componentName', ''),
+            name_key=fields.get('nameKey'),
+            description_key=fields.get('descriptionKey'),
+            file=file,
+            line=content.count('\n', 0, slug_offset) + 1,
+        ))
+    return entries
+
+
+def load_registry(data_dir: Path = CALCULATOR_DATA_DIR) -> List[CalculatorEntry]:
+    """Every calculator in the registry, in file order"""
+    entries = []
+    for path in sorted(data_dir.glob('*.ts')):
+        if path.name in NON_REGISTRY_FILES:
+            continue
+        entries.extend(parse_registry_source(path.read_text(encoding='utf-8'), relative_to_base(path)))
+    return entries
+
+
+class ComponentLocator:
+    """componentName -> component file, following calculatorLoader's search order"""
+
+    def __init__(self, components_dir: Path = COMPONENTS_DIR, imports_file: Path = IMPORTS_FILE):
+        self.components_dir = components_dir
+        self.explicit: Dict[str, Path] = {}
+        if imports_file.exists():
+            for name, target in EXPLICIT_IMPORT_RE.findall(imports_file.read_text(encoding='utf-8')):
+                self.explicit[name] = (imports_file.parent / target).resolve()
+        self.by_name: Dict[str, List[Path]] = {}
+        for dirpath, dirnames, filenames in os.walk(components_dir):
+            dirnames.sort()
+            for name in sorted(filenames):
+                if name.endswith('.tsx'):
+                    self.by_name.setdefault(name[:-4], []).append(Path(dirpath) / name)
+
+    def find(self, entry: CalculatorEntry) -> Optional[Path]:
+        name = entry.component_name
+        if name in self.explicit:
+            return self.explicit[name]
+        for candidate in (self.components_dir / entry.category / f"{name}.tsx",
+                          self.components_dir / f"{name}.tsx"):
+            if candidate.exists():
+                return candidate
+        matches = self.by_name.get(name)
+        return matches[0] if matches else None
@@ -0,0 +1,236 @@
+"""
+Resolve call sites the way i18next does at runtime
+
+react-i18next binds t to the FIRST namespace of useTranslation([...]) (the
+default nsMode); the remaining entries are only loaded. i18next then looks a
+key up in that namespace followed by every fallbackNS entry, and for each
+namespace tries the requested language before the fallbackLng chain.
+A "ns:key" prefix or a { ns } option replaces the bound namespace.
+
+For every call site the resolver reports which namespace actually satisfies
+the key, how many namespaces had to be probed, and which other probed
+namespaces carry a shadowed copy of the same key.
+"""
+
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Tuple
+
+from .extract import CallSite
+from .flat_index import MISSING, FlatIndex
+from .i18n_config import I18nConfig
+from .key_trie import template_to_pattern
+
+# CLDR plural categories i18next appends as key_<form> when { count } is passed
+PLURAL_FORMS: Dict[str, Tuple[str, ...]] = {
+    'ar': ('zero', 'one', 'two', 'few', 'many', 'other'),
+    'en': ('one', 'other'),
+    'he': ('one', 'two', 'other'),
+}
+DEFAULT_PLURAL_FORMS = ('one', 'other')
+
+RESOLVED = 'resolved'
+OBJECT = 'object'          # hit a subtree without returnObjects: renders an error string
+MISSING_KEY = 'missing'
+
+
+@dataclass(frozen=True)
+class Resolution:
+    """Outcome of resolving one call site for one language"""
+    key: str
+    lang: str
+    status: str
+    namespace: Optional[str]
+    language: Optional[str]
+    probes: int
+    order: Tuple[str, ...]
+    shadowed: Tuple[str, ...] = ()
+
+    @property
+    def via_fallback_language(self) -> bool:
+        return self.language is not None and self.language != self.lang
+
+    @property
+    def via_fallback_namespace(self) -> bool:
+        return self.namespace is not None and bool(self.order) and self.namespace != self.order[0]
+
+
+@dataclass(frozen=True)
+class DynamicResolution:
+    """Concrete keys reachable from one template call site, per namespace"""
+    template: str
+    lang: str
+    pattern: str
+    order: Tuple[str, ...]
+    reachable: Dict[str, Tuple[str, ...]]
+
+    @property
+    def keys(self) -> List[str]:
+        return [k for keys in self.reachable.values() for k in keys]
+
+
+def split_namespace(key: str, config: I18nConfig) -> Tuple[Optional[str], str]:
+    """Split "ns:key.path" into (ns, key.path); keys that read like prose are not split"""
+    separator = config.ns_separator
+    if separator not in key:
+        return None, key
+    head, _, rest = key.partition(separator)
+    if not head or any(c.isspace() for c in head):
+        return None, key
+    return head, rest.replace(separator, config.key_separator)
+
+
+def lookup_order(site: CallSite, config: I18nConfig) -> Tuple[str, Tuple[str, ...]]:
+    """The bare key and the namespaces i18next probes for it, in order, without repeats"""
+    prefix, key = split_namespace(site.key, config)
+    primary = prefix or site.ns_option or (site.namespaces[0] if site.namespaces else config.default_ns)
+    order: List[str] = []
+    for namespace in (primary, *config.fallback_ns):
+        if namespace not in order:
+            order.append(namespace)
+    return key, tuple(order)
+
+
+class NamespaceResolver:
+    """Reproduces i18next's namespace and language lookup against a FlatIndex"""
+
+    def __init__(self, index: FlatIndex, config: Optional[I18nConfig] = None):
+        self.index = index
+        self.config = config or index.config
+
+    def candidates(self, key: str, lang: str, has_count: bool) -> List[str]:
+        """Keys tried for one lookup; plural suffixes first, like i18next's finalKeys"""
+        if not has_count:
+            return [key]
+        forms = PLURAL_FORMS.get(lang.split('-')[0], DEFAULT_PLURAL_FORMS)
+        return [f"{key}_{form}" for form in forms] + [key]
+
+    def _hit(self, code: str, namespace: str, key: str, site: CallSite) -> Optional[str]:
+        for candidate in self.candidates(key, code, site.has_count):
+            if self.index.lookup(code, namespace, candidate) is not MISSING:
+                return RESOLVED
+            if self.index.is_branch(code, namespace, candidate):
+                return RESOLVED if site.return_objects else OBJECT
+        return None
+
+    def resolve(self, site: CallSite, lang: str, strict: bool = False) -> Resolution:
+        """
+        Resolve a static call site for lang
+
+        With strict=True only lang itself is consulted, which is what coverage
+        reports want; otherwise the fallbackLng chain is tried per namespace.
+        """
+        key, order = lookup_order(site, self.config)
+        languages = [lang] if strict else self.config.language_chain(lang)
+        found: Optional[Tuple[str, str, str]] = None
+        probes = 0
+        shadowed = []
+        for namespace in order:
+            if found is None:
+                probes += 1
+                for code in languages:
+                    status = self._hit(code, namespace, key, site)
+                    if status:
+                        found = (status, namespace, code)
+                        break
+            elif self._hit(lang, namespace, key, site):
+                shadowed.append(namespace)
+        if found is None:
+            return Resolution(key, lang, MISSING_KEY, None, None, probes, order)
+        status, namespace, code = found
+        return Resolution(key, lang, status, namespace, code, probes, order, tuple(shadowed))
+
+    def resolve_dynamic(self, site: CallSite, lang: str) -> 'DynamicResolution':
+        """
+        Concrete keys a template call site can reach for lang
+
+        Each concrete key is attributed to the first namespace in lookup
+        order that contains it, exactly as a static lookup of that key would.
+        """
+        template, order = lookup_order(site, self.config)
+        pattern = template_to_pattern(template)
+        suffixes = ()
+        if site.has_count:
+            forms = PLURAL_FORMS.get(lang.split('-')[0], DEFAULT_PLURAL_FORMS)
+            suffixes = tuple(f"_{form}" for form in forms)
+        reachable: Dict[str, Tuple[str, ...]] = {}
+        seen = set()
+        for namespace in order:
+            trie = self.index.trie(lang, namespace)
+            if trie is None:
+                continue
+            keys = [k for k in trie.match(pattern, site.return_objects, suffixes) if k not in seen]
+            if keys:
+                reachable[namespace] = tuple(keys)
+                seen.update(keys)
+        return DynamicResolution(site.key, lang, pattern, order, reachable)
+
+    def target_namespace(self, site: CallSite) -> str:
+        """Namespace a missing key should be written to (the one t is bound to)"""
+        return lookup_order(site, self.config)[1][0]
+
+
+def resolution_report(resolver: NamespaceResolver, sites: List[CallSite],
+                      languages: List[str], min_probes: int = 3) -> dict:
+    """Summarise resolutions of every static call site across languages"""
+    report: Dict[str, dict] = {}
+    for lang in languages:
+        satisfied_by: Dict[str, int] = {}
+        probe_histogram: Dict[int, int] = {}
+        deep, fallback_ns, fallback_lng, shadowed, missing, objects = [], [], [], [], [], []
+        for site in sites:
+            if site.dynamic:
+                continue
+            result = resolver.resolve(site, lang)
+            entry = {
+                'key': site.key,
+                'location': site.location,
+                'namespace': result.namespace,
+                'language': result.language,
+                'probes': result.probes,
+                'order': list(result.order),
+            }
+            if result.status == MISSING_KEY:
+                entry['target'] = resolver.target_namespace(site)
+                missing.append(entry)
+                continue
+            if result.status == OBJECT:
+                objects.append(entry)
+            satisfied_by[result.namespace] = satisfied_by.get(result.namespace, 0) + 1
+            probe_histogram[result.probes] = probe_histogram.get(result.probes, 0) + 1
+            if result.probes >= min_probes:
+                deep.append(entry)
+            if result.via_fallback_namespace:
+                fallback_ns.append(entry)
+            if result.via_fallback_language:
+                fallback_lng.append(entry)
+            if result.shadowed:
+                shadowed.append(dict(entry, shadowed=list(result.shadowed)))
+        report[lang] = {
+            'satisfied_by': dict(sorted(satisfied_by.items())),
+            'probe_histogram': dict(sorted(probe_histogram.items())),
+            'deep_probes': deep,
+            'via_fallback_namespace': fallback_ns,
+            'via_fallback_language': fallback_lng,
+            'shadowed': shadowed,
+            'objects_without_return_objects': objects,
+            'missing': missing,
+        }
+    return report
+
+
+def dynamic_report(resolver: NamespaceResolver, sites: List[CallSite], lang: str) -> List[dict]:
+    """Reachable concrete keys for every template call site"""
+    entries = []
+    for site in sites:
+        if not site.dynamic:
+            continue
+        result = resolver.resolve_dynamic(site, lang)
+        entries.append({
+            'template': site.key,
+            'location': site.location,
+            'pattern': result.pattern,
+            'order': list(result.order),
+            'reachable': {ns: list(keys) for ns, keys in result.reachable.items()},
+            'count': len(result.keys),
+        })
+    return entries
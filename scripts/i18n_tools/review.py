@@ -0,0 +1,319 @@
+"""
+Streaming XLIFF 2.0 / CSV round trip for translator review
+
+Export walks the namespaces one at a time (English and the target
+language, nothing else held) and writes a unit for every selected value:
+
+- missing:     English has the value, the target language does not;
+- placeholder: the target value is one the quality scan flags ("[AR] ..."
+               markers, English copies, mostly Latin, empty);
+- changed:     the English value differs from the one at a git ref.
+
+Units go out as soon as they are found, so memory stays at one namespace
+whatever the corpus size. Keys of array elements are written as
+`key[i]`, as everywhere else in the tooling.
+
+Import parses the reviewed file incrementally (iterparse for XLIFF, the
+csv reader for CSV) and groups consecutive units by namespace, which is
+how export writes them. Each group is one transaction: every unit is
+checked (the key exists in English, the English text is still the one
+that was reviewed, the interpolations match, the translation is not
+itself a placeholder) and the namespace is written, through LocaleWriter
+so it is journaled and honours --dry-run, only if all of them pass.
+Imported values are recorded as human in the provenance index.
+"""
+
+import csv
+import re
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Optional, Set, TextIO
+from xml.etree import ElementTree
+from xml.sax.saxutils import escape, quoteattr
+
+from .flat_index import (NamespaceData, deep_merge, discover_languages, flatten, load_json, load_namespace,
+                         namespace_files, string_values)
+from .i18n_config import I18nConfig, load_config
+from .incremental import changed_paths, read_json_at
+from .overlay import LocaleWriter
+from .patch import PatchConflict, set_nested_value
+from .paths import LOCALES_DIR
+from .placeholders import placeholders
+from .provenance import HUMAN, note
+from .quality import EMPTY, MARKER, SCRIPT_RES, classify
+from .serialize import write_locale
+
+SOURCE_LANG = 'en'
+
+MISSING = 'missing'
+PLACEHOLDER = 'placeholder'
+CHANGED = 'changed'
+SELECTIONS = (MISSING, PLACEHOLDER, CHANGED)
+
+XLIFF_NS = 'urn:oasis:names:tc:xliff:document:2.0'
+CSV_FIELDS = ('namespace', 'key', 'reason', 'source', 'target')
+
+_ELEMENT_RE = re.compile(r'^(.*)\[(\d+)\]$')
+
+
+@dataclass(frozen=True)
+class ReviewUnit:
+    namespace: str
+    key: str
+    source: str
+    target: str = ''
+    reason: str = ''
+
+
+@dataclass
+class ImportResult:
+    namespace: str
+    units: int = 0
+    applied: int = 0
+    errors: List[str] = field(default_factory=list)
+    files: List[Path] = field(default_factory=list)
+
+
+def format_for(path: str, default: str = 'xliff') -> str:
+    """'csv' or 'xliff' from a file name"""
+    suffix = Path(path).suffix.lower()
+    if suffix == '.csv':
+        return 'csv'
+    if suffix in ('.xlf', '.xliff'):
+        return 'xliff'
+    return default
+
+
+def _strings(data: Optional[NamespaceData]) -> Dict[str, str]:
+    if data is None:
+        return {}
+    return {key: text for leaf, value in data.leaves.items() for key, text in string_values(leaf, value)}
+
+
+def _previous_sources(ref: str, files: List[Path], changed: Set[Path]) -> Optional[Dict[str, str]]:
+    """English strings of a namespace at ref, or None if none of its files changed"""
+    if not changed.intersection(files):
+        return None
+    tree: dict = {}
+    for path in files:
+        data = read_json_at(ref, path) if path in changed else load_json(path)
+        tree = deep_merge(tree, data or {})
+    return {key: text for leaf, value in flatten(tree).items() for key, text in string_values(leaf, value)}
+
+
+def select_units(lang: str, selections: Iterable[str] = (MISSING, PLACEHOLDER), ref: Optional[str] = None,
+                 locales_dir: Path = LOCALES_DIR, config: Optional[I18nConfig] = None,
+                 namespaces: Optional[Iterable[str]] = None) -> Iterator[ReviewUnit]:
+    """Selected values of lang, one namespace loaded at a time"""
+    config = config or load_config()
+    selections = set(selections)
+    if CHANGED in selections and not ref:
+        raise ValueError("selecting changed values needs a git ref")
+    changed = {path.resolve() for path in changed_paths(ref)} if CHANGED in selections else set()
+    script = SCRIPT_RES.get(lang.split('-')[0])
+    layout = namespace_files(SOURCE_LANG, config, locales_dir)
+    wanted = set(namespaces) if namespaces else None
+    for namespace, files in sorted(layout.items()):
+        if wanted is not None and namespace not in wanted:
+            continue
+        sources = _strings(load_namespace(SOURCE_LANG, namespace, config, locales_dir, files))
+        targets = _strings(load_namespace(lang, namespace, config, locales_dir))
+        previous = _previous_sources(ref, [path.resolve() for path in files], changed) if changed else None
+        for key, source in sources.items():
+            target = targets.get(key)
+            if target is None:
+                reason = MISSING
+            elif classify(target, source, script):
+                reason = PLACEHOLDER
+            elif previous is not None and previous.get(key) != source:
+                reason = CHANGED
+            else:
+                continue
+            if reason in selections:
+                yield ReviewUnit(namespace, key, source, target or '', reason)
+
+
+def write_xliff(units: Iterable[ReviewUnit], out: TextIO, lang: str) -> Dict[str, int]:
+    """Stream units as XLIFF 2.0, one <file> per namespace; returns counts per reason"""
+    counts: Dict[str, int] = {}
+    out.write('<?xml version="1.0" encoding="UTF-8"?>\n')
+    out.write(f'<xliff xmlns="{XLIFF_NS}" version="2.0" srcLang="{SOURCE_LANG}" trgLang={quoteattr(lang)}>\n')
+    namespace = None
+    files = 0
+    number = 0
+    for unit in units:
+        if unit.namespace != namespace:
+            if namespace is not None:
+                out.write('  </file>\n')
+            namespace = unit.namespace
+            files += 1
+            number = 0
+            out.write(f'  <file id="f{files}" original={quoteattr(namespace)}>\n')
+        number += 1
+        counts[unit.reason] = counts.get(unit.reason, 0) + 1
+        state = 'initial' if unit.reason != CHANGED else 'translated'
+        out.write(f'    <unit id="u{number}" name={quoteattr(unit.key)}>\n'
+                  f'      <notes><note category="reason">{unit.reason}</note></notes>\n'
+                  f'      <segment state="{state}">\n'
+                  f'        <source>{escape(unit.source)}</source>\n'
+                  f'        <target>{escape(unit.target)}</target>\n'
+                  f'      </segment>\n'
+                  f'    </unit>\n')
+    if namespace is not None:
+        out.write('  </file>\n')
+    out.write('</xliff>\n')
+    return counts
+
+
+def write_csv(units: Iterable[ReviewUnit], out: TextIO) -> Dict[str, int]:
+    counts: Dict[str, int] = {}
+    writer = csv.writer(out)
+    writer.writerow(CSV_FIELDS)
+    for unit in units:
+        counts[unit.reason] = counts.get(unit.reason, 0) + 1
+        writer.writerow((unit.namespace, unit.key, unit.reason, unit.source, unit.target))
+    return counts
+
+
+def read_xliff(source) -> Iterator[ReviewUnit]:
+    """Units of an XLIFF 2.0 file; each element is dropped once read"""
+    tag = lambda name: f"{{{XLIFF_NS}}}{name}"
+    namespace = None
+    parent = None
+    for event, element in ElementTree.iterparse(source, events=('start', 'end')):
+        if event == 'start':
+            if element.tag == tag('file'):
+                namespace = element.get('original') or element.get('id')
+                parent = element
+            continue
+        if element.tag != tag('unit'):
+            continue
+        texts = {'source': [], 'target': []}
+        for segment in element.iter(tag('segment')):
+            for name in texts:
+                part = segment.find(tag(name))
+                if part is not None:
+                    texts[name].append(''.join(part.itertext()))
+        note = element.find(f"{tag('notes')}/{tag('note')}")
+        yield ReviewUnit(namespace, element.get('name') or element.get('id'), ''.join(texts['source']),
+                         ''.join(texts['target']), note.text if note is not None else '')
+        element.clear()
+        if parent is not None and element in parent:
+            parent.remove(element)
+
+
+def read_csv(source: TextIO) -> Iterator[ReviewUnit]:
+    reader = csv.DictReader(source)
+    missing = [name for name in ('namespace', 'key', 'source', 'target') if name not in (reader.fieldnames or ())]
+    if missing:
+        raise ValueError(f"CSV header lacks {', '.join(missing)}")
+    for row in reader:
+        yield ReviewUnit(row['namespace'], row['key'], row['source'] or '', row['target'] or '',
+                         row.get('reason') or '')
+
+
+def _set_value(tree: dict, key: str, value: str, source_leaves: Dict[str, object]):
+    """Write one string at key (or key[i]) into a file tree"""
+    element = _ELEMENT_RE.match(key)
+    if not element:
+        set_nested_value(tree, key, value)
+        return
+    leaf, position = element.group(1), int(element.group(2))
+    node = tree
+    for part in leaf.split('.'):
+        node = node.get(part) if isinstance(node, dict) else None
+    english = source_leaves.get(leaf)
+    if not isinstance(english, list) or position >= len(english) or not isinstance(english[position], str):
+        raise PatchConflict(f"cannot set '{key}': English has no string element {position}")
+    # a new list, so a dry run's copy-on-write tree never shares it with the file;
+    # elements not reviewed yet keep the English text
+    items = list(node) if isinstance(node, list) else []
+    items.extend(english[len(items):position + 1])
+    if not isinstance(items[position], str):
+        raise PatchConflict(f"cannot set '{key}': element {position} is not a string")
+    items[position] = value
+    set_nested_value(tree, leaf, items)
+
+
+class ReviewImporter:
+    """Validates and applies reviewed units, one transaction per namespace"""
+
+    def __init__(self, lang: str, writer: Optional[LocaleWriter] = None, locales_dir: Path = LOCALES_DIR,
+                 config: Optional[I18nConfig] = None):
+        if lang == SOURCE_LANG:
+            raise ValueError("reviewed translations cannot be imported into the source language")
+        if lang not in discover_languages(locales_dir):
+            raise ValueError(f"unknown language '{lang}'")
+        self.lang = lang
+        self.writer = writer or LocaleWriter()
+        self.locales_dir = locales_dir
+        self.config = config or load_config()
+        self.script = SCRIPT_RES.get(lang.split('-')[0])
+
+    def run(self, units: Iterable[ReviewUnit]) -> Iterator[ImportResult]:
+        """Results per namespace group, as each group is applied"""
+        group: List[ReviewUnit] = []
+        for unit in units:
+            if group and unit.namespace != group[0].namespace:
+                yield self.apply(group)
+                group = []
+            group.append(unit)
+        if group:
+            yield self.apply(group)
+
+    def _check(self, unit: ReviewUnit, sources: Dict[str, str], targets: Dict[str, str]) -> Optional[str]:
+        source = sources.get(unit.key)
+        if source is None:
+            return f"{unit.key}: not an English key of {unit.namespace}"
+        if unit.source != source:
+            return f"{unit.key}: English text changed since export ({unit.source!r} -> {source!r})"
+        if placeholders(unit.target) != placeholders(source):
+            expected = ', '.join(sorted(placeholders(source))) or 'none'
+            return f"{unit.key}: interpolations differ from English (expected {expected})"
+        if classify(unit.target, source, self.script) in (MARKER, EMPTY):
+            return f"{unit.key}: translation is still a placeholder ({unit.target!r})"
+        return None
+
+    def apply(self, units: List[ReviewUnit]) -> ImportResult:
+        namespace = units[0].namespace
+        result = ImportResult(namespace, len(units))
+        if not namespace or not namespace_files(SOURCE_LANG, self.config, self.locales_dir).get(namespace):
+            result.errors.append(f"unknown namespace '{namespace}'")
+            return result
+        source_data = load_namespace(SOURCE_LANG, namespace, self.config, self.locales_dir)
+        target_data = load_namespace(self.lang, namespace, self.config, self.locales_dir)
+        sources = _strings(source_data)
+        targets = _strings(target_data)
+
+        pending = []
+        for unit in units:
+            if not unit.target.strip() or unit.target == targets.get(unit.key):
+                continue  # left for later, or unchanged
+            error = self._check(unit, sources, targets)
+            if error:
+                result.errors.append(error)
+            else:
+                pending.append(unit)
+        if result.errors or not pending:
+            return result
+
+        trees: Dict[Path, dict] = {}
+        for unit in pending:
+            leaf = _ELEMENT_RE.sub(r'\1', unit.key)
+            path = target_data.sources.get(leaf)
+            if path is None:
+                english = source_data.sources[leaf]
+                path = self.locales_dir / self.lang / english.relative_to(self.locales_dir / SOURCE_LANG)
+            if path not in trees:
+                trees[path] = self.writer.load(path, missing_ok=True)
+            try:
+                _set_value(trees[path], unit.key, note(unit.target, HUMAN, self.lang), source_data.leaves)
+            except PatchConflict as e:
+                result.errors.append(str(e))
+        if result.errors:
+            return result
+        for path, tree in trees.items():
+            self.writer.save(path, tree, write_locale)
+        result.applied = len(pending)
+        result.files = sorted(trees)
+        return result
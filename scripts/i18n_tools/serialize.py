@@ -0,0 +1,154 @@
+"""
+Canonical locale file serializer
+
+Locale files are written as json.dump(data, ensure_ascii=False, indent=2)
+plus a trailing newline. json only uses its C encoder without indent, so
+that format always goes through the slow generator-based encoder. dumps()
+produces the same text byte for byte, either through orjson (optional;
+used when installed and the tree holds nothing orjson formats differently,
+i.e. floats, integers beyond 64 bits or non-string keys; a lone surrogate,
+which orjson refuses, falls back too) or through a
+recursive encoder specialised for the indent=2 layout, which still escapes
+strings with json's C routine.
+"""
+
+import os
+from json.encoder import encode_basestring
+from pathlib import Path
+from typing import Any, List, Optional
+
+try:
+    import orjson
+except ImportError:  # optional fast path
+    orjson = None
+
+INDENT = '  '
+_INT64 = 1 << 63
+
+
+def _orjson_safe(value: Any) -> bool:
+    """True if orjson's output for value matches json's"""
+    if type(value) is not dict and type(value) is not list:
+        return False
+    stack = [value]
+    while stack:
+        node = stack.pop()
+        if type(node) is dict:
+            for key in node:
+                if type(key) is not str:
+                    return False
+            items = node.values()
+        else:
+            items = node
+        for item in items:
+            kind = type(item)
+            if kind is str or item is None or kind is bool:
+                continue
+            if kind is dict or kind is list:
+                stack.append(item)
+            elif kind is not int or not -_INT64 <= item < _INT64:
+                return False
+    return True
+
+
+def _scalar(value: Any) -> str:
+    if value is None:
+        return 'null'
+    if value is True:
+        return 'true'
+    if value is False:
+        return 'false'
+    if isinstance(value, int):
+        return int.__repr__(value)
+    if isinstance(value, float):
+        if value != value:
+            return 'NaN'
+        if value in (float('inf'), float('-inf')):
+            return 'Infinity' if value > 0 else '-Infinity'
+        return float.__repr__(value)
+    raise TypeError(f'Object of type {type(value).__name__} is not JSON serializable')
+
+
+def _key(key: Any) -> str:
+    if isinstance(key, str):
+        return key
+    if isinstance(key, float) or key is None or isinstance(key, bool):
+        return _scalar(key)
+    if isinstance(key, int):
+        return int.__repr__(key)
+    raise TypeError(f'keys must be str, int, float, bool or None, not {type(key).__name__}')
+
+
+def _encode(value: Any, append, indent: str):
+    kind = type(value)
+    if kind is str:
+        append(encode_basestring(value))
+    elif kind is dict or isinstance(value, dict):
+        if not value:
+            append('{}')
+            return
+        inner = indent + INDENT
+        prefix = '{\n' + inner
+        for key, item in value.items():
+            key = encode_basestring(key if type(key) is str else _key(key)) + ': '
+            if type(item) is str:
+                append(prefix + key + encode_basestring(item))
+            else:
+                append(prefix + key)
+                _encode(item, append, inner)
+            prefix = ',\n' + inner
+        append('\n' + indent + '}')
+    elif kind is list or isinstance(value, (list, tuple)):
+        if not value:
+            append('[]')
+            return
+        inner = indent + INDENT
+        prefix = '[\n' + inner
+        for item in value:
+            if type(item) is str:
+                append(prefix + encode_basestring(item))
+            else:
+                append(prefix)
+                _encode(item, append, inner)
+            prefix = ',\n' + inner
+        append('\n' + indent + ']')
+    else:
+        append(_scalar(value))
+
+
+def dumps_python(data: Any) -> str:
+    """The pure-Python path of dumps()"""
+    out: List[str] = []
+    _encode(data, out.append, '')
+    out.append('\n')
+    return ''.join(out)
+
+
+def _orjson_dumps(data: Any) -> Optional[bytes]:
+    """orjson's output for data, or None where it may differ from json's or orjson refuses it"""
+    if orjson is None or not _orjson_safe(data):
+        return None
+    try:
+        return orjson.dumps(data, option=orjson.OPT_INDENT_2) + b'\n'
+    except orjson.JSONEncodeError:  # lone surrogates, which json writes as they are
+        return None
+
+
+def dumps(data: Any) -> str:
+    """json.dumps(data, ensure_ascii=False, indent=2) + '\\n'"""
+    content = _orjson_dumps(data)
+    return content.decode('utf-8') if content is not None else dumps_python(data)
+
+
+def dumpb(data: Any) -> bytes:
+    """dumps() encoded as UTF-8"""
+    content = _orjson_dumps(data)
+    return content if content is not None else dumps_python(data).encode('utf-8')
+
+
+def write_locale(path: Path, data: Any, newline: bool = True):
+    """Write a locale file in the canonical format (newline=False drops the final newline)"""
+    content = dumpb(data)
+    os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+    with open(path, 'wb') as f:
+        f.write(content if newline else content[:-1])
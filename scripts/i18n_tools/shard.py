@@ -0,0 +1,110 @@
+"""
+Deterministic sharding of `check` across CI workers
+
+Every component is assigned to the namespace most of its t() calls are
+bound to, and every namespace to shard crc32(namespace) % N, so a
+calculator's components and its calc/<category> locale files always land
+on the same shard. Namespaces reached only through fallbackNS (common,
+translation, ...) are read by whichever shard needs them, but only the
+owning shard reports on them.
+
+A shard writes the missing keys of its own components, the unused-key
+candidates of the namespaces it owns, and the keys its components use in
+namespaces it does not own. merge_shards subtracts the latter from the
+former, which gives exactly the report of a single-process run.
+"""
+
+import json
+import zlib
+from collections import Counter
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+from .extract import CallSite, ExtractionCache
+from .flat_index import FlatIndex
+from .i18n_config import I18nConfig
+from .resolver import lookup_order
+from .usage import UsageIndex, check_report
+
+SHARD_VERSION = 1
+
+
+def parse_shard(spec: str) -> Tuple[int, int]:
+    """'i/N' -> (i, N), 1-based"""
+    index, sep, count = spec.partition('/')
+    try:
+        shard, total = int(index), int(count)
+    except ValueError:
+        raise ValueError(f"invalid shard '{spec}', expected i/N") from None
+    if not sep or total < 1 or not 1 <= shard <= total:
+        raise ValueError(f"invalid shard '{spec}', expected 1 <= i <= N")
+    return shard, total
+
+
+def shard_of(namespace: str, total: int) -> int:
+    """1-based shard owning namespace; stable across processes and machines"""
+    return zlib.crc32(namespace.encode('utf-8')) % total + 1
+
+
+def home_namespace(sites: List[CallSite], config: I18nConfig) -> str:
+    """Namespace most call sites of a component are bound to ('' if it has none)"""
+    counts = Counter(lookup_order(site, config)[1][0] for site in sites)
+    return counts.most_common(1)[0][0] if counts else ''
+
+
+def run_shard(index: FlatIndex, sources: Iterable[Path], shard: int, total: int,
+              languages: Optional[List[str]] = None,
+              cache: Optional[ExtractionCache] = None) -> dict:
+    """Partial check result for one shard"""
+    cache = cache or ExtractionCache()
+    files = [path for path in sources
+             if shard_of(home_namespace(cache.get(path), index.config), total) == shard]
+    usage = UsageIndex(index, languages, cache).build(files)
+
+    candidates = {}
+    for lang in usage.languages:
+        for namespace in index.namespaces(lang):
+            if shard_of(namespace, total) == shard:
+                candidates[f"{lang}:{namespace}"] = sorted(usage.unused(lang, namespace))
+    foreign = {f"{lang}:{namespace}": sorted(usage.used(lang, namespace))
+               for lang, namespace in usage.used_namespaces()
+               if shard_of(namespace, total) != shard}
+    return {
+        'version': SHARD_VERSION,
+        'shard': [shard, total],
+        'components': len(files),
+        'missing': sorted(usage.missing()),
+        'unused_candidates': candidates,
+        'used_elsewhere': foreign,
+    }
+
+
+def merge_shards(results: List[dict]) -> dict:
+    """Combine every shard's result into the single-process `check` report"""
+    if not results:
+        raise ValueError("no shard results to merge")
+    total = results[0]['shard'][1]
+    seen = sorted(result['shard'][0] for result in results)
+    if any(r.get('version') != SHARD_VERSION or r['shard'][1] != total for r in results) \
+            or seen != list(range(1, total + 1)):
+        raise ValueError(f"expected one result per shard 1..{total}, got {seen}")
+
+    used: Dict[str, Set[str]] = {}
+    for result in results:
+        for name, keys in result['used_elsewhere'].items():
+            used.setdefault(name, set()).update(keys)
+    unused = {}
+    missing = []
+    for result in results:
+        missing.extend(tuple(entry) for entry in result['missing'])
+        for name, keys in result['unused_candidates'].items():
+            unused[name] = set(keys) - used.get(name, set())
+    return check_report(sum(r['components'] for r in results), missing, unused)
+
+
+def load_shard_results(paths: Iterable[str]) -> List[dict]:
+    results = []
+    for path in paths:
+        with open(path, 'r', encoding='utf-8') as f:
+            results.append(json.load(f))
+    return results
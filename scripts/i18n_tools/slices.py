@@ -0,0 +1,192 @@
+"""
+Per-calculator locale slices
+
+A calculator page only reaches the keys of its own component (plus its
+registry nameKey/descriptionKey and page content), yet loading its
+namespace pulls every calculator of the category. For each registry entry
+a slice holds, per language, exactly the values prune's liveness rules
+reach from that calculator, grouped by the namespace that supplies them:
+
+    {"calc/construction": {"drywall": {...}}, "common": {"units": {...}}}
+
+Static keys are resolved with the resolver's lookup order (plural forms
+and returnObjects subtrees included), template keys with
+resolve_dynamic(), so t(`drywall.types.${type}`) brings the whole
+family it can reach. The CalculatorPage content lookups (faqs,
+howItWorks, ...) and the keys quoted strings in the component spell out
+(`{ name: 'star-distance.examples.vega' }` rendered as t(star.name)) are
+added the way prune.live_keys() keeps them. Lookups are strict per language: a key only the
+fallback language has lives in that language's slice, which i18next loads
+for the fallback anyway.
+
+Slices are written minified to dist/locales/slices/<lang>/<slug>.json with
+slices/manifest.json mapping each slug to its namespaces, key count and
+raw/gzip bytes per language.
+"""
+
+import json
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+from .bundle import BUNDLE_DIR, gzip_size, stringify
+from .coverage import calculator_sites
+from .extract import CallSite, ExtractionCache
+from .flat_index import FlatIndex
+from .prune import literal_keys, page_sites, string_literals
+from .registry import CalculatorEntry, ComponentLocator, load_registry
+from .resolver import RESOLVED, NamespaceResolver, lookup_order
+
+SLICE_DIR = BUNDLE_DIR / 'slices'
+MANIFEST_NAME = 'manifest.json'
+MANIFEST_VERSION = 1
+
+
+@dataclass
+class Slice:
+    slug: str
+    lang: str
+    values: Dict[str, Dict[str, object]] = field(default_factory=dict)  # namespace -> flat key -> value
+    unresolved: int = 0
+
+    @property
+    def keys(self) -> int:
+        return sum(len(values) for values in self.values.values())
+
+    def tree(self) -> dict:
+        """Namespaces with their keys nested again, in key order"""
+        tree: dict = {}
+        for namespace, values in sorted(self.values.items()):
+            node_root = tree.setdefault(namespace, {})
+            for key in sorted(values):
+                *parents, last = key.split('.')
+                node = node_root
+                for part in parents:
+                    child = node.get(part)
+                    if not isinstance(child, dict):
+                        child = node[part] = {}
+                    node = child
+                node[last] = values[key]
+        return tree
+
+
+def _add_leaves(result: Slice, index: FlatIndex, namespace: str, keys: Iterable[str]):
+    data = index.entry(result.lang, namespace)
+    values = result.values.setdefault(namespace, {})
+    for key in keys:
+        values[key] = data.leaves[key]
+
+
+def _add_static(result: Slice, resolver: NamespaceResolver, site: CallSite) -> bool:
+    """Add what a static lookup resolves to; False when it resolves to nothing"""
+    index = resolver.index
+    resolution = resolver.resolve(site, result.lang, strict=True)
+    if resolution.status != RESOLVED:
+        return False
+    namespace = resolution.namespace
+    key = lookup_order(site, resolver.config)[0]
+    for candidate in resolver.candidates(key, result.lang, site.has_count):
+        if candidate in index.entry(result.lang, namespace).leaves:
+            _add_leaves(result, index, namespace, [candidate])
+        elif site.return_objects and index.is_branch(result.lang, namespace, candidate):
+            _add_leaves(result, index, namespace, index.trie(result.lang, namespace).match(candidate, True))
+    return True
+
+
+def build_slice(resolver: NamespaceResolver, entry: CalculatorEntry, component: Optional[Path],
+                cache: ExtractionCache, lang: str, literals: Optional[Set[str]] = None) -> Slice:
+    """The values entry's call sites, page content and quoted keys reach in lang"""
+    index = resolver.index
+    if literals is None:
+        literals = string_literals([component]) if component else set()
+    result = Slice(entry.slug, lang)
+    sites = calculator_sites(entry, component, cache)
+    for site in sites:
+        if site.dynamic:
+            reachable = resolver.resolve_dynamic(site, lang).reachable
+            for namespace, keys in reachable.items():
+                _add_leaves(result, index, namespace, keys)
+            result.unresolved += not reachable
+        else:
+            result.unresolved += not _add_static(result, resolver, site)
+    # CalculatorPage tries several content keys, so a miss here is not unresolved
+    for site in page_sites(entry):
+        _add_static(result, resolver, site)
+    # data tables such as { name: 'star-distance.examples.vega' } passed to t() later
+    namespaces = {ns for site in sites for ns in lookup_order(site, resolver.config)[1]}
+    for namespace in sorted(namespaces):
+        data = index.entry(lang, namespace)
+        if data is not None:
+            _add_leaves(result, index, namespace, literal_keys(data, literals))
+    result.values = {namespace: values for namespace, values in result.values.items() if values}
+    return result
+
+
+@dataclass
+class SliceReport:
+    slug: str
+    category: str
+    namespaces: List[str]
+    keys: Dict[str, int] = field(default_factory=dict)
+    raw: Dict[str, int] = field(default_factory=dict)
+    gzip: Dict[str, int] = field(default_factory=dict)
+    namespace_raw: Dict[str, int] = field(default_factory=dict)  # the whole namespaces the slice replaces
+    unresolved: Dict[str, int] = field(default_factory=dict)
+
+    def to_dict(self) -> dict:
+        return {'slug': self.slug, 'category': self.category, 'namespaces': self.namespaces,
+                'keys': self.keys, 'bytes': self.raw, 'gzip': self.gzip,
+                'namespace_bytes': self.namespace_raw, 'unresolved': self.unresolved}
+
+
+def build_slices(out_dir: Path = SLICE_DIR, index: Optional[FlatIndex] = None,
+                 languages: Optional[List[str]] = None, cache: Optional[ExtractionCache] = None,
+                 registry: Optional[List[CalculatorEntry]] = None,
+                 locator: Optional[ComponentLocator] = None, workers: Optional[int] = None) -> List[SliceReport]:
+    """Write a slice per (calculator, language) and the manifest; returns one report per calculator"""
+    index = index or FlatIndex()
+    languages = languages or index.languages()
+    cache = cache or ExtractionCache()
+    registry = load_registry() if registry is None else registry
+    locator = locator or ComponentLocator()
+    index.load(languages, workers)
+    resolver = NamespaceResolver(index)
+    namespace_bytes: Dict[Tuple[str, str], int] = {}
+
+    reports = []
+    for entry in sorted(registry, key=lambda e: e.slug):
+        component = locator.find(entry)
+        literals = string_literals([component]) if component else set()
+        slices = [build_slice(resolver, entry, component, cache, lang, literals) for lang in languages]
+        report = SliceReport(entry.slug, entry.category, sorted({ns for s in slices for ns in s.values}))
+        for piece in slices:
+            content = stringify(piece.tree())
+            path = out_dir / piece.lang / f"{entry.slug}.json"
+            path.parent.mkdir(parents=True, exist_ok=True)
+            if not path.exists() or path.read_bytes() != content:
+                path.write_bytes(content)
+            report.keys[piece.lang] = piece.keys
+            report.raw[piece.lang] = len(content)
+            report.gzip[piece.lang] = gzip_size(content)
+            report.unresolved[piece.lang] = piece.unresolved
+            for namespace in piece.values:
+                if (piece.lang, namespace) not in namespace_bytes:
+                    whole = index.entry(piece.lang, namespace).tree
+                    namespace_bytes[(piece.lang, namespace)] = len(stringify(whole))
+            report.namespace_raw[piece.lang] = sum(namespace_bytes[(piece.lang, ns)] for ns in piece.values)
+        reports.append(report)
+    write_manifest(out_dir, reports)
+    return reports
+
+
+def write_manifest(out_dir: Path, reports: List[SliceReport]):
+    manifest = {
+        'version': MANIFEST_VERSION,
+        'path': '/locales/slices/{{lng}}/{{slug}}.json',
+        'slices': {report.slug: {'file': f"{report.slug}.json", 'namespaces': report.namespaces,
+                                 'keys': report.keys, 'bytes': report.raw, 'gzip': report.gzip}
+                   for report in reports},
+    }
+    out_dir.mkdir(parents=True, exist_ok=True)
+    (out_dir / MANIFEST_NAME).write_text(
+        json.dumps(manifest, ensure_ascii=False, indent=2) + '\n', encoding='utf-8')
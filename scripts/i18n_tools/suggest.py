@@ -0,0 +1,173 @@
+"""
+Nearest existing keys for a missing one
+
+A missing `drywall.unit_tooltip` next to an existing `drywall.unitTooltip`
+is a typo or a stale rename, and should be fixed in the component rather
+than by adding a second English value. SuggestionIndex holds every key of
+a language under a normalized spelling (lowercase, without `_` and `-`)
+with character trigram postings over the distinct spellings. Trigrams
+shared by a large share of keys (`pla`, `ace`, ... of `placeholders.`)
+carry no signal and are skipped when collecting candidates; the
+candidates sharing most of the remaining trigrams get a banded edit
+distance. A lookup over the ~25k keys in the tree stays under a
+millisecond.
+"""
+
+import math
+from collections import Counter
+from dataclasses import dataclass
+from typing import Dict, Iterable, List, Optional, Sequence, Set, Tuple
+
+from .flat_index import FlatIndex
+from .resolver import PLURAL_FORMS
+
+GRAM = 3
+# Trigrams in more than this share of the spellings are not used to find candidates
+STOP_SHARE = 0.02
+# Candidates whose edit distance is computed, by descending trigram overlap
+RERANK = 16
+
+
+def normalize(key: str) -> str:
+    """Spelling used for matching: case, `_` and `-` are not significant"""
+    return key.lower().replace('_', '').replace('-', '')
+
+
+def trigrams(text: str) -> Set[str]:
+    padded = f"^{text}$"
+    return {padded[i:i + GRAM] for i in range(max(1, len(padded) - GRAM + 1))}
+
+
+def edit_distance(a: str, b: str, limit: Optional[int] = None) -> int:
+    """Levenshtein distance; with a limit, any value above it is returned as limit + 1"""
+    if limit is None:
+        limit = max(len(a), len(b))
+    if abs(len(a) - len(b)) > limit:
+        return limit + 1
+    # keys mostly differ in one spot; the shared prefix and suffix cost nothing
+    shortest = min(len(a), len(b))
+    prefix = 0
+    while prefix < shortest and a[prefix] == b[prefix]:
+        prefix += 1
+    suffix = 0
+    while suffix < shortest - prefix and a[-1 - suffix] == b[-1 - suffix]:
+        suffix += 1
+    a = a[prefix:len(a) - suffix]
+    b = b[prefix:len(b) - suffix]
+    if not a or not b:
+        return min(max(len(a), len(b)), limit + 1)
+    if len(a) < len(b):
+        a, b = b, a
+    previous = list(range(len(b) + 1))
+    for i, ca in enumerate(a, 1):
+        low = max(1, i - limit)
+        high = min(len(b), i + limit)
+        current = [i] + [limit + 1] * len(b)
+        best = current[low - 1]
+        for j in range(low, high + 1):
+            cost = previous[j - 1] + (ca != b[j - 1])
+            if previous[j] + 1 < cost:
+                cost = previous[j] + 1
+            if current[j - 1] + 1 < cost:
+                cost = current[j - 1] + 1
+            current[j] = cost
+            if cost < best:
+                best = cost
+        if best > limit:
+            return limit + 1
+        previous = current
+    return min(previous[-1], limit + 1)
+
+
+def _plural_base(key: str) -> Optional[str]:
+    base, sep, form = key.rpartition('_')
+    return base if sep and form in PLURAL_FORMS['ar'] else None
+
+
+def _is_path_suffix(a: str, b: str) -> bool:
+    """One dotted key is the other with leading segments added (a moved key)"""
+    return a.endswith('.' + b) or b.endswith('.' + a)
+
+
+@dataclass(frozen=True)
+class Suggestion:
+    namespace: str
+    key: str
+    distance: int
+
+    def qualified(self, default_ns: Optional[str] = None) -> str:
+        """The key as it would be written in t(), with ns: unless it is default_ns"""
+        return self.key if self.namespace == default_ns else f"{self.namespace}:{self.key}"
+
+
+class SuggestionIndex:
+    """Trigram postings over the normalized spellings of (namespace, key) pairs"""
+
+    def __init__(self, entries: Iterable[Tuple[str, str]]):
+        self.norms: List[str] = []
+        self.grams: List[Set[str]] = []
+        self.owners: List[List[Tuple[str, str]]] = []
+        self.postings: Dict[str, List[int]] = {}
+        ids: Dict[str, int] = {}
+        seen = set()
+        for namespace, key in entries:
+            for candidate in (key, _plural_base(key)):
+                if candidate is None or (namespace, candidate) in seen:
+                    continue
+                seen.add((namespace, candidate))
+                norm = normalize(candidate)
+                if norm not in ids:
+                    ids[norm] = len(self.norms)
+                    self.norms.append(norm)
+                    self.grams.append(trigrams(norm))
+                    self.owners.append([])
+                    for gram in self.grams[-1]:
+                        self.postings.setdefault(gram, []).append(ids[norm])
+                self.owners[ids[norm]].append((namespace, candidate))
+        self.stop = max(50, int(len(self.norms) * STOP_SHARE))
+
+    @classmethod
+    def from_index(cls, index: FlatIndex, lang: str) -> 'SuggestionIndex':
+        return cls((namespace, key) for namespace in index.namespaces(lang)
+                   for key in index.entry(lang, namespace).leaves)
+
+    def __len__(self) -> int:
+        return sum(len(owners) for owners in self.owners)
+
+    def suggest(self, key: str, namespaces: Sequence[str] = (), k: int = 3) -> List[Suggestion]:
+        """Up to k closest keys; keys in namespaces (the lookup chain) win ties
+
+        A key qualifies within an edit distance of a third of the query's
+        last segment, or when it is the query moved under another parent.
+        """
+        norm = normalize(key)
+        grams = trigrams(norm)
+        postings = sorted((self.postings[gram] for gram in grams if gram in self.postings), key=len)
+        counts: Counter = Counter()
+        for ids in postings:
+            if len(ids) <= self.stop:
+                counts.update(ids)
+        if not counts:
+            for ids in postings[:2]:
+                counts.update(ids)
+        limit = max(1, math.ceil(len(norm.rsplit('.', 1)[-1]) / 3))
+        rank = {namespace: i for i, namespace in enumerate(namespaces)}
+        results = []
+        for norm_id, _ in counts.most_common(RERANK):
+            candidate = self.norms[norm_id]
+            shared = len(grams & self.grams[norm_id])
+            # one edit changes at most GRAM trigrams
+            if len(grams) - shared > GRAM * limit:
+                distance = limit + 1
+            else:
+                distance = edit_distance(norm, candidate, limit)
+            if distance > limit:
+                if not _is_path_suffix(norm, candidate):
+                    continue
+                # only insertions separate a key from itself under another parent
+                distance = abs(len(norm) - len(candidate))
+            for namespace, original in self.owners[norm_id]:
+                results.append((distance, rank.get(namespace, len(rank)), -shared, namespace, original))
+        results.sort()
+        return [Suggestion(namespace, original, distance)
+                for distance, _, _, namespace, original in results[:k]]
@@ -0,0 +1,145 @@
+"""
+Exact-match translation memory from the existing en -> ar pairs
+
+Every key present in both languages pairs its English value with the
+translation a person wrote for it. TranslationMemory keeps those pairs in
+one hash map from the normalized English text (NFKC, case-folded, single
+spaces) to each Arabic rendering with its frequency and the namespaces it
+comes from, so filling a missing value is a single dict lookup. Pairs that
+are not real translations (the quality scan's markers, copies of the
+English and mostly-Latin values) or whose interpolations differ are left
+out. fill() tries the memory first and only then the caller's glossary,
+counting which of the two produced each value.
+"""
+
+import re
+import unicodedata
+from dataclasses import dataclass, field
+from typing import Callable, Dict, Iterable, List, Optional, Set
+
+from .flat_index import FlatIndex, string_values
+from .placeholders import placeholders
+from .provenance import TM, note
+from .quality import SCRIPT_RES, classify
+
+SOURCE_LANG = 'en'
+TARGET_LANG = 'ar'
+
+_SPACE_RE = re.compile(r'\s+')
+
+
+def normalize_source(text: str) -> str:
+    """Lookup form of an English value"""
+    return _SPACE_RE.sub(' ', unicodedata.normalize('NFKC', text)).strip().casefold()
+
+
+@dataclass
+class Rendering:
+    text: str
+    count: int = 0
+    namespaces: Set[str] = field(default_factory=set)
+
+
+@dataclass(frozen=True)
+class Match:
+    text: str
+    count: int
+    total: int
+    namespaces: tuple
+
+
+class TranslationMemory:
+    """normalized English -> {Arabic text: Rendering}"""
+
+    def __init__(self, target_lang: str = TARGET_LANG):
+        self.target_lang = target_lang
+        self.entries: Dict[str, Dict[str, Rendering]] = {}
+        # first spelling seen of each normalized source, for display
+        self.originals: Dict[str, str] = {}
+        self.reused = 0
+        self.synthesized = 0
+
+    def add(self, source: str, target: str, namespace: str):
+        norm = normalize_source(source)
+        self.originals.setdefault(norm, source)
+        renderings = self.entries.setdefault(norm, {})
+        rendering = renderings.get(target)
+        if rendering is None:
+            rendering = renderings[target] = Rendering(target)
+        rendering.count += 1
+        rendering.namespaces.add(namespace)
+
+    @classmethod
+    def from_index(cls, index: Optional[FlatIndex] = None, source_lang: str = SOURCE_LANG,
+                   target_lang: str = TARGET_LANG,
+                   namespaces: Optional[Iterable[str]] = None) -> 'TranslationMemory':
+        index = index or FlatIndex()
+        memory = cls(target_lang)
+        script = SCRIPT_RES.get(target_lang.split('-')[0])
+        for namespace in namespaces or index.namespaces(source_lang):
+            source_data = index.entry(source_lang, namespace)
+            target_data = index.entry(target_lang, namespace)
+            if source_data is None or target_data is None:
+                continue
+            for leaf, value in target_data.leaves.items():
+                sources = dict(string_values(leaf, source_data.leaves.get(leaf)))
+                for key, target in string_values(leaf, value):
+                    source = sources.get(key)
+                    if not source or not source.strip():
+                        continue
+                    if classify(target, source, script) or placeholders(target) != placeholders(source):
+                        continue
+                    memory.add(source, target, namespace)
+        return memory
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    def pairs(self) -> int:
+        return sum(r.count for renderings in self.entries.values() for r in renderings.values())
+
+    def ambiguous(self) -> List[str]:
+        """Normalized sources with more than one rendering"""
+        return sorted(source for source, renderings in self.entries.items() if len(renderings) > 1)
+
+    def lookup(self, source: str, namespace: Optional[str] = None) -> Optional[Match]:
+        """Most frequent rendering of source; one used in namespace wins ties"""
+        renderings = self.entries.get(normalize_source(source))
+        if not renderings:
+            return None
+        best = max(renderings.values(),
+                   key=lambda r: (r.count, namespace in r.namespaces, r.text))
+        return Match(best.text, best.count, sum(r.count for r in renderings.values()),
+                     tuple(sorted(best.namespaces)))
+
+    def fill(self, source: str, glossary: Callable[[str], str], namespace: Optional[str] = None) -> str:
+        """Translation of source from the memory, else from glossary; counted as reused or synthesized"""
+        match = self.lookup(source, namespace)
+        if match is not None:
+            self.reused += 1
+            return note(match.text, TM, self.target_lang)
+        self.synthesized += 1
+        return glossary(source)
+
+    def fillable(self, index: FlatIndex, source_lang: str = SOURCE_LANG,
+                 target_lang: str = TARGET_LANG) -> Dict[str, List[dict]]:
+        """Values present in source_lang but not target_lang, split by whether the memory has them"""
+        result: Dict[str, List[dict]] = {'reused': [], 'synthesized': []}
+        for namespace in index.namespaces(source_lang):
+            target_data = index.entry(target_lang, namespace)
+            target_leaves = target_data.leaves if target_data else {}
+            for leaf, value in index.entry(source_lang, namespace).leaves.items():
+                if leaf in target_leaves:
+                    continue
+                for key, source in string_values(leaf, value):
+                    match = self.lookup(source, namespace)
+                    entry = {'namespace': namespace, 'key': key, 'source': source}
+                    if match:
+                        entry.update(target=match.text, count=match.count, total=match.total)
+                    result['reused' if match else 'synthesized'].append(entry)
+        return result
+
+    def summary(self) -> str:
+        total = self.reused + self.synthesized
+        share = f" ({self.reused * 100 // total}% reused)" if total else ''
+        return f"Translation memory: {self.reused} reused, {self.synthesized} synthesized{share}"
@@ -0,0 +1,313 @@
+"""
+Incremental usage index: which keys each component uses and which it misses
+
+Built once from every call site, then kept up to date one file at a time:
+a changed component only re-evaluates its own call sites, and a changed
+locale file only re-evaluates the components whose keys appeared in or
+vanished from that namespace (found through the reverse key index).
+"""
+
+import re
+from collections import Counter, defaultdict
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+from .extract import CallSite, ExtractionCache
+from .flat_index import FlatIndex, namespace_for_file
+from .i18n_config import I18nConfig
+from .key_trie import glob_to_regex, template_to_pattern
+from .resolver import PLURAL_FORMS, RESOLVED, NamespaceResolver, lookup_order
+
+# (lang, file, line, column, raw key)
+MissingEntry = Tuple[str, str, int, int, str]
+# (lang, namespace, key)
+UsedKey = Tuple[str, str, str]
+
+
+@dataclass
+class Delta:
+    """What changed in the analysis after one update"""
+    new_missing: List[MissingEntry] = field(default_factory=list)
+    fixed_missing: List[MissingEntry] = field(default_factory=list)
+    new_unused: List[UsedKey] = field(default_factory=list)
+    now_used: List[UsedKey] = field(default_factory=list)
+
+    def __bool__(self) -> bool:
+        return bool(self.new_missing or self.fixed_missing or self.new_unused or self.now_used)
+
+    def extend(self, other: 'Delta'):
+        self.new_missing.extend(other.new_missing)
+        self.fixed_missing.extend(other.fixed_missing)
+        self.new_unused.extend(other.new_unused)
+        self.now_used.extend(other.now_used)
+
+
+@dataclass
+class _FileState:
+    sites: List[CallSite]
+    missing: Set[MissingEntry]
+    used: Counter
+    namespaces: Set[str]
+
+
+def key_variants(key: str) -> List[str]:
+    """A changed key plus the call-site keys it can affect (plural base, parents)"""
+    variants = [key]
+    base, sep, suffix = key.rpartition('_')
+    if sep and suffix in PLURAL_FORMS['ar']:
+        variants.append(base)
+    parts = key.split('.')
+    variants.extend('.'.join(parts[:i]) for i in range(1, len(parts)))
+    return variants
+
+
+class ReverseIndex:
+    """
+    Key -> components and namespace -> components, built from call sites alone
+
+    No locale data is needed, so it can be built from cached extraction
+    results without loading a single namespace.
+    """
+
+    def __init__(self, config: I18nConfig):
+        self.config = config
+        self._by_key: Dict[str, Set[Path]] = defaultdict(set)
+        self._dependents: Dict[str, Set[Path]] = defaultdict(set)
+        self._dynamic: Dict[Path, List[re.Pattern]] = {}
+        self._orders: Dict[tuple, Tuple[str, Tuple[str, ...]]] = {}
+
+    def _order(self, site: CallSite) -> Tuple[str, Tuple[str, ...]]:
+        """lookup_order, memoised on the only fields it depends on"""
+        signature = (site.key, site.namespaces[:1], site.ns_option)
+        order = self._orders.get(signature)
+        if order is None:
+            order = self._orders[signature] = lookup_order(site, self.config)
+        return order
+
+    def _dynamic_regex(self, site: CallSite) -> re.Pattern:
+        """Regex over bare keys that a template call site can reach"""
+        template = lookup_order(site, self.config)[0]
+        suffixes = [f"_{form}" for form in PLURAL_FORMS['ar']] if site.has_count else ()
+        return glob_to_regex(template_to_pattern(template), suffixes, site.return_objects)
+
+    def add(self, path: Path, sites: List[CallSite]):
+        for site in sites:
+            key, order = self._order(site)
+            if site.dynamic:
+                self._dynamic.setdefault(path, []).append(self._dynamic_regex(site))
+            else:
+                self._by_key[key].add(path)
+            for namespace in order:
+                self._dependents[namespace].add(path)
+
+    def remove(self, path: Path, sites: List[CallSite]):
+        for site in sites:
+            key, order = self._order(site)
+            if not site.dynamic:
+                self._by_key[key].discard(path)
+            for namespace in order:
+                self._dependents[namespace].discard(path)
+        self._dynamic.pop(path, None)
+
+    def dependents(self, namespace: str) -> Set[Path]:
+        """Components whose lookups probe namespace"""
+        return set(self._dependents.get(namespace, ()))
+
+    def referencing(self, keys: Iterable[str], namespace: Optional[str] = None) -> Set[Path]:
+        """Components with a call site that can reach any of keys (optionally via namespace)"""
+        keys = list(keys)
+        found: Set[Path] = set()
+        for key in keys:
+            for variant in key_variants(key):
+                found |= self._by_key.get(variant, set())
+        for path, patterns in self._dynamic.items():
+            if path not in found and any(p.fullmatch(k) for p in patterns for k in keys):
+                found.add(path)
+        if namespace is not None:
+            found &= self._dependents.get(namespace, set())
+        return found
+
+
+class UsageIndex:
+    """Call sites, missing keys and used keys, maintained incrementally"""
+
+    def __init__(self, index: FlatIndex, languages: Optional[List[str]] = None,
+                 cache: Optional[ExtractionCache] = None):
+        self.index = index
+        self.resolver = NamespaceResolver(index)
+        self.languages = languages or index.languages()
+        self.cache = cache or ExtractionCache()
+        self._files: Dict[Path, _FileState] = {}
+        self.reverse = ReverseIndex(index.config)
+        self._used: Dict[Tuple[str, str], Counter] = defaultdict(Counter)
+
+    # -- queries -----------------------------------------------------------
+
+    def files(self) -> List[Path]:
+        return sorted(self._files)
+
+    def sites(self, path: Path) -> List[CallSite]:
+        state = self._files.get(path)
+        return state.sites if state else []
+
+    def dependents(self, namespace: str) -> Set[Path]:
+        """Components whose lookups probe namespace (reverse index)"""
+        return self.reverse.dependents(namespace)
+
+    def namespaces_of(self, path: Path) -> Set[str]:
+        state = self._files.get(path)
+        return set(state.namespaces) if state else set()
+
+    def missing(self, paths: Optional[Iterable[Path]] = None) -> Set[MissingEntry]:
+        result: Set[MissingEntry] = set()
+        for path in (self._files if paths is None else paths):
+            state = self._files.get(path)
+            if state:
+                result |= state.missing
+        return result
+
+    def used(self, lang: str, namespace: str) -> Set[str]:
+        return set(self._used.get((lang, namespace), ()))
+
+    def used_namespaces(self) -> List[Tuple[str, str]]:
+        """(lang, namespace) pairs with at least one used key"""
+        return sorted(pair for pair, counter in self._used.items() if counter)
+
+    def unused(self, lang: str, namespace: str) -> Set[str]:
+        data = self.index.entry(lang, namespace)
+        if data is None:
+            return set()
+        used = self._used.get((lang, namespace), Counter())
+        return {key for key in data.leaves if not used.get(key)}
+
+    # -- evaluation --------------------------------------------------------
+
+    def _evaluate(self, sites: List[CallSite]) -> Tuple[Set[MissingEntry], Counter, Set[str]]:
+        missing: Set[MissingEntry] = set()
+        used: Counter = Counter()
+        namespaces: Set[str] = set()
+        for site in sites:
+            namespaces.update(lookup_order(site, self.resolver.config)[1])
+            for lang in self.languages:
+                entry = (lang, site.file, site.line, site.column, site.key)
+                if site.dynamic:
+                    result = self.resolver.resolve_dynamic(site, lang)
+                    if not result.reachable:
+                        missing.add(entry)
+                    for namespace, keys in result.reachable.items():
+                        used.update((lang, namespace, key) for key in keys)
+                    continue
+                result = self.resolver.resolve(site, lang, strict=True)
+                if result.status != RESOLVED:
+                    missing.add(entry)
+                    continue
+                data = self.index.entry(lang, result.namespace)
+                for candidate in self.resolver.candidates(result.key, lang, site.has_count):
+                    if candidate in data.leaves:
+                        used[(lang, result.namespace, candidate)] += 1
+                    elif site.return_objects and candidate in data.branches:
+                        used.update((lang, result.namespace, k)
+                                    for k in self.index.trie(lang, result.namespace).subtree(candidate))
+        return missing, used, namespaces
+
+    def _unindex(self, path: Path, state: _FileState):
+        self.reverse.remove(path, state.sites)
+        for (lang, namespace, key), count in state.used.items():
+            counter = self._used[(lang, namespace)]
+            counter[key] -= count
+            if counter[key] <= 0:
+                del counter[key]
+
+    def _index(self, path: Path, state: _FileState):
+        self.reverse.add(path, state.sites)
+        for (lang, namespace, key), count in state.used.items():
+            self._used[(lang, namespace)][key] += count
+        self._files[path] = state
+
+    def _refresh(self, paths: Iterable[Path], reextract: bool) -> Delta:
+        """Re-evaluate files and return the difference in missing and unused keys"""
+        paths = list(paths)
+        touched_before: Dict[Tuple[str, str], Set[str]] = {}
+        before_missing = self.missing(paths)
+        old_states = {p: self._files.pop(p) for p in paths if p in self._files}
+
+        affected = {(lang, namespace) for state in old_states.values()
+                    for (lang, namespace, _) in state.used}
+        new_states = {}
+        for path in paths:
+            if reextract or path not in old_states:
+                sites = self.cache.get(path)
+            else:
+                sites = old_states[path].sites
+            if not sites and not path.exists():
+                continue
+            new_states[path] = _FileState(sites, *self._evaluate(sites))
+            affected |= {(lang, namespace) for (lang, namespace, _) in new_states[path].used}
+
+        for pair in affected:
+            touched_before[pair] = self.unused(*pair)
+        for path, state in old_states.items():
+            self._unindex(path, state)
+        for path, state in new_states.items():
+            self._index(path, state)
+
+        delta = Delta()
+        after_missing = self.missing(paths)
+        delta.new_missing = sorted(after_missing - before_missing)
+        delta.fixed_missing = sorted(before_missing - after_missing)
+        for (lang, namespace), before in touched_before.items():
+            after = self.unused(lang, namespace)
+            delta.new_unused.extend((lang, namespace, k) for k in sorted(after - before))
+            delta.now_used.extend((lang, namespace, k) for k in sorted(before - after))
+        return delta
+
+    def build(self, paths: Iterable[Path]) -> 'UsageIndex':
+        """Index every given source file from scratch"""
+        for path in paths:
+            self.add_sites(path, self.cache.get(path))
+        return self
+
+    def add_sites(self, path: Path, sites: List[CallSite]):
+        """Index call sites under path, e.g. registry keys that no t() call spells out"""
+        self._index(path, _FileState(sites, *self._evaluate(sites)))
+
+    def update_source(self, path: Path) -> Delta:
+        """A component was created, edited or deleted"""
+        return self._refresh([path], reextract=True)
+
+    def update_locale(self, path: Path) -> Delta:
+        """A locale file was created, edited or deleted"""
+        owner = namespace_for_file(path, self.index.config, self.index.locales_dir)
+        if owner is None:
+            return Delta()
+        lang, namespace = owner
+        old = self.index.entry(lang, namespace)
+        old_leaves, old_branches = (set(old.leaves), old.branches) if old else (set(), set())
+        old_unused = self.unused(lang, namespace)
+
+        known = path in self.index.layout(lang).get(namespace, [])
+        self.index.invalidate(lang, namespace, rescan=known != path.exists())
+        new = self.index.entry(lang, namespace)
+        new_leaves, new_branches = (set(new.leaves), new.branches) if new else (set(), set())
+
+        # a key turning from a leaf into an object (or back) may change nothing else, yet resolves differently
+        changed = (old_leaves ^ new_leaves) | (old_branches ^ new_branches)
+        affected = self.reverse.referencing(changed, namespace)
+        delta = self._refresh(affected, reextract=False)
+        after = self.unused(lang, namespace)
+        reported = {(l, n, k) for (l, n, k) in delta.new_unused + delta.now_used}
+        delta.new_unused.extend((lang, namespace, k) for k in sorted(after - old_unused)
+                                if (lang, namespace, k) not in reported)
+        return delta
+
+
+def check_report(components: int, missing: Iterable[MissingEntry],
+                 unused: Dict[str, Iterable[str]]) -> dict:
+    """The `check` report; unused is keyed by "lang:namespace" """
+    return {
+        'components': components,
+        'missing': [{'lang': lang, 'key': key, 'location': f"{file}:{line}:{column}"}
+                    for lang, file, line, column, key in sorted(missing)],
+        'unused': {name: sorted(keys) for name, keys in sorted(unused.items()) if keys},
+    }
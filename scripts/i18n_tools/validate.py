@@ -0,0 +1,181 @@
+"""
+Structural validation of every locale file
+
+Checks what the runtime silently depends on: that each file parses, that
+its root is an object, that every leaf is a string (arrays may hold only
+strings or only objects, as returnObjects expects), that no object repeats
+a key (the parser keeps the last one), and that every language has the same
+files with the same shape as English: a path that is an object in one
+language must not be a string or an array in another. Missing keys are
+left to `check` and `coverage`.
+
+Files are grouped by their path relative to the language directory and
+each group (one file in every language) is parsed and compared in a
+worker process, so nothing but the issues crosses process boundaries.
+"""
+
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from .flat_index import discover_languages
+from .paths import LOCALES_DIR
+
+SOURCE_LANG = 'en'
+
+SYNTAX = 'syntax'
+ROOT = 'root'
+LEAF = 'leaf'
+ARRAY = 'array'
+EMPTY_KEY = 'empty-key'
+DUPLICATE = 'duplicate'
+SHAPE = 'shape'
+MISSING_FILE = 'missing-file'
+KINDS = (SYNTAX, ROOT, LEAF, ARRAY, EMPTY_KEY, DUPLICATE, SHAPE, MISSING_FILE)
+
+
+@dataclass(frozen=True)
+class Issue:
+    file: str
+    kind: str
+    message: str
+    path: str = ''
+    line: Optional[int] = None
+    column: Optional[int] = None
+
+    def location(self) -> str:
+        if self.line:
+            return f"{self.file}:{self.line}:{self.column}"
+        return f"{self.file}:{self.path}" if self.path else self.file
+
+    def to_dict(self) -> dict:
+        return {'file': self.file, 'kind': self.kind, 'message': self.message, 'path': self.path,
+                'line': self.line, 'column': self.column}
+
+
+class _Pairs(list):
+    """Object members in file order, so duplicates survive parsing"""
+
+
+def _kind(value) -> str:
+    if isinstance(value, _Pairs):
+        return 'object'
+    if isinstance(value, list):
+        return 'array'
+    if isinstance(value, str):
+        return 'string'
+    return 'null' if value is None else type(value).__name__
+
+
+def _path(base: str, key) -> str:
+    if isinstance(key, int):
+        return f"{base}[{key}]"
+    return f"{base}.{key}" if base else key
+
+
+def _check_tree(file: str, root, issues: List[Issue]) -> Dict[str, str]:
+    """Schema issues of one parsed file; returns path -> kind for shape parity"""
+    shape: Dict[str, str] = {}
+    if not isinstance(root, _Pairs):
+        issues.append(Issue(file, ROOT, f"root is {_kind(root)}, expected an object"))
+        return shape
+    stack = [('', root)]
+    while stack:
+        base, node = stack.pop()
+        if isinstance(node, _Pairs):
+            seen = set()
+            members = node
+        else:
+            kinds = {_kind(item) for item in node}
+            if len(kinds) > 1 or kinds - {'string', 'object'}:
+                issues.append(Issue(file, ARRAY, f"array holds {', '.join(sorted(kinds))}; "
+                                                 "expected only strings or only objects", base))
+            members = enumerate(node)
+        for key, value in members:
+            path = _path(base, key)
+            if isinstance(node, _Pairs):
+                if key == '':
+                    issues.append(Issue(file, EMPTY_KEY, "empty key", path or '""'))
+                if key in seen:
+                    issues.append(Issue(file, DUPLICATE, "key repeated in the same object "
+                                                         "(only the last value is kept)", path))
+                seen.add(key)
+            kind = _kind(value)
+            shape[path] = kind
+            if kind in ('object', 'array'):
+                stack.append((path, value))
+            elif kind != 'string':
+                issues.append(Issue(file, LEAF, f"{kind} value, expected a string", path))
+    return shape
+
+
+def _parse(path: Path, file: str, issues: List[Issue]):
+    try:
+        text = path.read_text(encoding='utf-8')
+    except UnicodeDecodeError as e:
+        issues.append(Issue(file, SYNTAX, f"not UTF-8: {e.reason} at byte {e.start}"))
+        return None
+    try:
+        return json.loads(text, object_pairs_hook=_Pairs)
+    except json.JSONDecodeError as e:
+        issues.append(Issue(file, SYNTAX, e.msg, line=e.lineno, column=e.colno))
+        return None
+
+
+def validate_group(job: Tuple[Path, str, List[str]]) -> List[Issue]:
+    """Parse one relative path in every language, check each file and compare shapes with English"""
+    locales_dir, rel, languages = job
+    issues: List[Issue] = []
+    shapes: Dict[str, Dict[str, str]] = {}
+    for lang in languages:
+        path = locales_dir / lang / rel
+        if not path.exists():
+            continue
+        file = f"{lang}/{rel}"
+        tree = _parse(path, file, issues)
+        if tree is not None:
+            shapes[lang] = _check_tree(file, tree, issues)
+    reference = shapes.get(SOURCE_LANG)
+    if reference is None:
+        return issues
+    for lang, shape in shapes.items():
+        if lang == SOURCE_LANG:
+            continue
+        for path, kind in shape.items():
+            expected = reference.get(path)
+            if expected is not None and expected != kind:
+                issues.append(Issue(f"{lang}/{rel}", SHAPE,
+                                    f"{kind} here but {expected} in {SOURCE_LANG}/{rel}", path))
+    return issues
+
+
+def validate(locales_dir: Path = LOCALES_DIR, languages: Optional[List[str]] = None,
+             workers: Optional[int] = None) -> List[Issue]:
+    """Every structural issue under locales_dir, sorted by file"""
+    languages = languages or discover_languages(locales_dir)
+    present: Dict[str, List[str]] = {}
+    for lang in languages:
+        for path in (locales_dir / lang).rglob('*.json'):
+            present.setdefault(path.relative_to(locales_dir / lang).as_posix(), []).append(lang)
+
+    issues: List[Issue] = []
+    for rel, langs in present.items():
+        for lang in languages:
+            if lang not in langs:
+                issues.append(Issue(f"{lang}/{rel}", MISSING_FILE,
+                                    f"file missing (present in {', '.join(sorted(langs))})"))
+
+    jobs = [(locales_dir, rel, languages) for rel in sorted(present)]
+    workers = min(workers or os.cpu_count() or 1, len(jobs))
+    if workers <= 1:
+        for job in jobs:
+            issues.extend(validate_group(job))
+    else:
+        with ProcessPoolExecutor(workers) as pool:
+            for found in pool.map(validate_group, jobs, chunksize=max(1, len(jobs) // (workers * 4))):
+                issues.extend(found)
+    issues.sort(key=lambda issue: (issue.file, issue.line or 0, issue.path))
+    return issues
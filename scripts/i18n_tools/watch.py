@@ -0,0 +1,263 @@
+"""
+Watch mode: keep the extraction cache and flat index hot and report
+translation changes as files are saved
+
+Uses Linux inotify through ctypes when available (no extra dependency) and
+falls back to stat polling elsewhere. Events are debounced so a burst such
+as `git checkout` is processed as one batch; very large batches trigger a
+full rebuild instead of hundreds of incremental updates.
+"""
+
+import ctypes
+import ctypes.util
+import os
+import select
+import struct
+import sys
+import time
+from pathlib import Path
+from typing import Callable, Dict, Iterator, List, Optional, Sequence, Set, Tuple
+
+from .extract import SOURCE_SUFFIXES, ExtractionCache, find_source_files
+from .flat_index import FlatIndex
+from .paths import LOCALES_DIR, SRC_DIR, relative_to_base
+from .usage import Delta, UsageIndex
+
+# inotify(7) constants
+IN_MODIFY = 0x00000002
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_FROM = 0x00000040
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE = 0x00000200
+IN_DELETE_SELF = 0x00000400
+IN_ISDIR = 0x40000000
+IN_Q_OVERFLOW = 0x00004000
+IN_NONBLOCK = 0o4000
+IN_CLOEXEC = 0o2000000
+WATCH_MASK = (IN_CLOSE_WRITE | IN_MODIFY | IN_MOVED_FROM | IN_MOVED_TO
+              | IN_CREATE | IN_DELETE | IN_DELETE_SELF)
+EVENT_HEADER = struct.Struct('iIII')
+
+FULL_REBUILD_THRESHOLD = 200
+
+
+def _wanted(path: Path, roots: Sequence[Tuple[Path, Tuple[str, ...]]]) -> bool:
+    for root, suffixes in roots:
+        if path.name.endswith(suffixes) and root in path.parents:
+            return True
+    return False
+
+
+class PollingWatcher:
+    """Portable fallback: compares (mtime, size) snapshots of the watched trees"""
+
+    overflowed = False
+
+    def __init__(self, roots: Sequence[Tuple[Path, Tuple[str, ...]]], interval: float = 0.25):
+        self.roots = roots
+        self.interval = interval
+        self._snapshot = self._scan()
+
+    def _scan(self) -> Dict[Path, Tuple[int, int]]:
+        snapshot: Dict[Path, Tuple[int, int]] = {}
+        for root, suffixes in self.roots:
+            stack = [str(root)]
+            while stack:
+                try:
+                    entries = os.scandir(stack.pop())
+                except OSError:
+                    continue
+                with entries:
+                    for entry in entries:
+                        if entry.is_dir(follow_symlinks=False):
+                            stack.append(entry.path)
+                        elif entry.name.endswith(suffixes):
+                            st = entry.stat()
+                            snapshot[Path(entry.path)] = (st.st_mtime_ns, st.st_size)
+        return snapshot
+
+    def wait(self, timeout: Optional[float]) -> Set[Path]:
+        """Block up to timeout seconds and return paths that changed"""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            snapshot = self._scan()
+            changed = {p for p in snapshot.keys() | self._snapshot.keys()
+                       if snapshot.get(p) != self._snapshot.get(p)}
+            self._snapshot = snapshot
+            if changed:
+                return changed
+            if deadline is not None and time.monotonic() >= deadline:
+                return set()
+            time.sleep(self.interval if deadline is None
+                       else max(0.0, min(self.interval, deadline - time.monotonic())))
+
+    def close(self):
+        pass
+
+
+class InotifyWatcher:
+    """Recursive inotify watcher over the given roots"""
+
+    def __init__(self, roots: Sequence[Tuple[Path, Tuple[str, ...]]]):
+        self.roots = roots
+        libc_name = ctypes.util.find_library('c') or 'libc.so.6'
+        self._libc = ctypes.CDLL(libc_name, use_errno=True)
+        self._fd = self._libc.inotify_init1(IN_NONBLOCK | IN_CLOEXEC)
+        if self._fd < 0:
+            raise OSError(ctypes.get_errno(), 'inotify_init1 failed')
+        self._dirs: Dict[int, Path] = {}
+        self.overflowed = False
+        for root, _ in roots:
+            self._add_tree(root)
+
+    def _add_tree(self, root: Path) -> List[Path]:
+        """Watch root and its subdirectories; returns files already inside"""
+        found = []
+        for dirpath, _, filenames in os.walk(root):
+            wd = self._libc.inotify_add_watch(self._fd, os.fsencode(dirpath), WATCH_MASK)
+            if wd >= 0:
+                self._dirs[wd] = Path(dirpath)
+            found.extend(Path(dirpath) / name for name in filenames)
+        return found
+
+    def _drain(self) -> Set[Path]:
+        changed: Set[Path] = set()
+        while True:
+            try:
+                buffer = os.read(self._fd, 64 * 1024)
+            except BlockingIOError:
+                return changed
+            offset = 0
+            while offset + EVENT_HEADER.size <= len(buffer):
+                wd, mask, _, length = EVENT_HEADER.unpack_from(buffer, offset)
+                offset += EVENT_HEADER.size
+                name = buffer[offset:offset + length].rstrip(b'\0')
+                offset += length
+                if mask & IN_Q_OVERFLOW:
+                    self.overflowed = True
+                    continue
+                directory = self._dirs.get(wd)
+                if directory is None:
+                    continue
+                if mask & IN_DELETE_SELF:
+                    self._dirs.pop(wd, None)
+                    continue
+                path = directory / os.fsdecode(name)
+                if mask & IN_ISDIR:
+                    if mask & (IN_CREATE | IN_MOVED_TO):
+                        changed.update(self._add_tree(path))
+                    continue
+                changed.add(path)
+
+    def wait(self, timeout: Optional[float]) -> Set[Path]:
+        """Block up to timeout seconds and return paths that changed"""
+        ready, _, _ = select.select([self._fd], [], [], timeout)
+        if not ready:
+            return set()
+        return {p for p in self._drain() if _wanted(p, self.roots)}
+
+    def close(self):
+        os.close(self._fd)
+
+
+def make_watcher(roots: Sequence[Tuple[Path, Tuple[str, ...]]], polling: bool = False,
+                 interval: float = 0.25):
+    """inotify on Linux, stat polling otherwise (or when forced)"""
+    if not polling and sys.platform.startswith('linux'):
+        try:
+            return InotifyWatcher(roots)
+        except (OSError, AttributeError):
+            pass
+    return PollingWatcher(roots, interval)
+
+
+def debounced(watcher, quiet: float = 0.05, max_wait: float = 1.0) -> Iterator[Set[Path]]:
+    """
+    Yield batches of changed paths
+
+    A batch closes once no event arrived for `quiet` seconds, or after
+    `max_wait` seconds of continuous activity.
+    """
+    while True:
+        batch = watcher.wait(None)
+        if not batch and not watcher.overflowed:
+            continue
+        started = time.monotonic()
+        while time.monotonic() - started < max_wait:
+            more = watcher.wait(quiet)
+            if not more:
+                break
+            batch |= more
+        yield batch
+
+
+def format_delta(delta: Delta) -> List[str]:
+    lines = []
+    for lang, file, line, column, key in delta.new_missing:
+        lines.append(f"  + missing [{lang}] {key}  ({file}:{line}:{column})")
+    for lang, file, line, column, key in delta.fixed_missing:
+        lines.append(f"  - fixed   [{lang}] {key}  ({file}:{line}:{column})")
+    for lang, namespace, key in delta.new_unused:
+        lines.append(f"  + unused  [{lang}] {namespace}:{key}")
+    for lang, namespace, key in delta.now_used:
+        lines.append(f"  - used    [{lang}] {namespace}:{key}")
+    return lines
+
+
+class TranslationWatch:
+    """Holds the hot state and applies batches of file changes to it"""
+
+    def __init__(self, src_dir: Path = SRC_DIR, locales_dir: Path = LOCALES_DIR,
+                 languages: Optional[List[str]] = None):
+        self.src_dir = src_dir
+        self.locales_dir = locales_dir
+        self.languages = languages
+        self.roots = ((src_dir, SOURCE_SUFFIXES), (locales_dir, ('.json',)))
+        self.rebuild()
+
+    def rebuild(self):
+        index = FlatIndex(self.locales_dir)
+        self.usage = UsageIndex(index, self.languages, ExtractionCache())
+        self.usage.build(find_source_files(self.src_dir))
+
+    def apply(self, paths: Set[Path], full: bool = False) -> Delta:
+        """Apply one batch of changes; locale files first so components see fresh data"""
+        delta = Delta()
+        if full or len(paths) > FULL_REBUILD_THRESHOLD:
+            before_missing = self.usage.missing()
+            self.rebuild()
+            after_missing = self.usage.missing()
+            delta.new_missing = sorted(after_missing - before_missing)
+            delta.fixed_missing = sorted(before_missing - after_missing)
+            return delta
+        for path in sorted(p for p in paths if p.suffix == '.json'):
+            delta.extend(self.usage.update_locale(path))
+        for path in sorted(p for p in paths if p.suffix != '.json'):
+            if '__tests__' in path.parts or '.test.' in path.name:
+                continue
+            delta.extend(self.usage.update_source(path))
+        return delta
+
+    def run(self, polling: bool = False, quiet: float = 0.05,
+            out: Callable[[str], None] = print):
+        watcher = make_watcher(self.roots, polling)
+        mode = 'polling' if isinstance(watcher, PollingWatcher) else 'inotify'
+        missing = len(self.usage.missing())
+        out(f"Watching {relative_to_base(self.src_dir)} and {relative_to_base(self.locales_dir)} "
+            f"({mode}); {len(self.usage.files())} sources, {missing} missing. Ctrl+C to stop.")
+        try:
+            for batch in debounced(watcher, quiet):
+                started = time.perf_counter()
+                overflowed, watcher.overflowed = watcher.overflowed, False
+                delta = self.apply(batch, full=overflowed)
+                elapsed = (time.perf_counter() - started) * 1000
+                names = ', '.join(sorted(relative_to_base(p) for p in batch)[:3])
+                more = f" (+{len(batch) - 3} more)" if len(batch) > 3 else ''
+                out(f"[{time.strftime('%H:%M:%S')}] {names}{more} - {elapsed:.0f} ms")
+                for line in format_delta(delta) or ['  no translation changes']:
+                    out(line)
+        except KeyboardInterrupt:
+            pass
+        finally:
+            watcher.close()
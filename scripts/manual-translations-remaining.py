@@ -4,19 +4,24 @@ Manually add remaining translations for calculators that were skipped
 This includes proper, meaningful translations based on component analysis
 """
 
-import json
 from pathlib import Path
 
+from i18n_tools.overlay import LocaleWriter
+from i18n_tools.serialize import write_locale
+
+# --dry-run reports what would change instead of writing
+WRITER = LocaleWriter()
+
 BASE_DIR = Path("/Users/raedtayyem/Desktop/work/alathasiba-claudecode")
 
 def load_json(filepath):
-    with open(filepath, 'r', encoding='utf-8') as f:
-        return json.load(f)
+    return WRITER.load(filepath)
 
 def save_json(filepath, data):
-    with open(filepath, 'w', encoding='utf-8') as f:
-        json.dump(data, f, ensure_ascii=False, indent=2)
-        f.write('\n')
+    WRITER.save(filepath, data, write_json)
+
+def write_json(filepath, data):
+    write_locale(filepath, data)
 
 # Comprehensive translations for remaining calculators
 TRANSLATIONS = {
@@ -355,3 +360,4 @@ def main():
 
 if __name__ == "__main__":
     main()
+    WRITER.report()
@@ -0,0 +1,14 @@
+#!/usr/bin/env python3
+"""
+Translation Tools
+Analyzers and maintenance commands for public/locales
+
+Usage: python3 scripts/translation-tools.py <command> --help
+"""
+
+import sys
+
+from i18n_tools.cli import main
+
+if __name__ == "__main__":
+    sys.exit(main())
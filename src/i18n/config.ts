@@ -33,6 +33,25 @@ function deepMerge(target: Record<string, unknown>, source: Record<string, unkno
   return result;
 }
 
+// Namespaces pre-merged at build time (scripts/translation-tools.py bundle), by language.
+// `file` is the bundle's content-hashed name, which can be cached for good.
+// The manifest only exists in the build output; without it split files are merged here.
+interface BundleEntry {
+  file?: string;
+}
+
+let bundleManifest: Promise<Record<string, Record<string, BundleEntry>>> | null = null;
+
+function loadBundleManifest(): Promise<Record<string, Record<string, BundleEntry>>> {
+  if (!bundleManifest) {
+    bundleManifest = fetch('/locales/manifest.json')
+      .then(response => (response.ok ? response.json() : {}))
+      .then(manifest => (manifest && manifest.bundles) || {})
+      .catch(() => ({}));
+  }
+  return bundleManifest;
+}
+
 // Custom request function that handles split translation files
 async function customRequest(
   _options: { url: string },
@@ -62,8 +81,11 @@ async function customRequest(
 
   const [, lng, ns] = urlMatch;
 
+  // A bundled namespace is already merged: fetch it like any other, from its hashed name
+  const bundle = (await loadBundleManifest())[lng]?.[ns];
+
   // Check if this namespace has split files
-  if (splitNamespaces[ns]) {
+  if (splitNamespaces[ns] && !bundle) {
     const splitFiles = splitNamespaces[ns];
     const basePath = `/locales/${lng}/${ns}`;
 
@@ -113,10 +135,11 @@ async function customRequest(
     }
   } else {
     // Standard fetch for non-split namespaces
+    const fileUrl = bundle?.file ? `/locales/${lng}/${bundle.file}` : url;
     try {
-      const response = await fetch(url);
+      const response = await fetch(fileUrl);
       if (!response.ok) {
-        callback(new Error(`Failed to load ${url}`), null);
+        callback(new Error(`Failed to load ${fileUrl}`), null);
         return;
       }
       const data = await response.text();